@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Crash-safe file writes for monitor.py and its side files
+
+- Write to a temp file in the same directory, fsync, then rename over the
+  target: readers see the old file or the new one, never half of either
+- Unchanged content is not rewritten (size check first, then SHA-256)
+- JSON for machine-only files is serialized compactly
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+def _same_content(path: Path, data: bytes) -> bool:
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return hashlib.sha256(path.read_bytes()).digest() == hashlib.sha256(data).digest()
+    except OSError:
+        return False
+
+
+def atomic_write_bytes(path: Path, data: bytes, skip_unchanged: bool = True) -> bool:
+    """Atomically replace `path` with `data`. Returns False if the write was skipped."""
+    if skip_unchanged and _same_content(path, data):
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    # Persist the rename itself.
+    dir_fd = os.open(str(path.parent), os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+    return True
+
+
+def atomic_write_text(path: Path, text: str, skip_unchanged: bool = True) -> bool:
+    return atomic_write_bytes(path, text.encode("utf-8"), skip_unchanged)
+
+
+def atomic_write_json(path: Path, data: Any, pretty: bool = False, skip_unchanged: bool = True) -> bool:
+    """Compact by default; `pretty` only for files people read."""
+    if pretty:
+        text = json.dumps(data, ensure_ascii=False, indent=2)
+    else:
+        text = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return atomic_write_text(path, text, skip_unchanged)
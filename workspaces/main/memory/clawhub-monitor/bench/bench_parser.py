@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Micro-benchmark for the explore line parser.
+
+Generates a synthetic `clawhub explore` listing (default 100k lines) and times
+parse_explore_output over it.
+
+Usage: python3 bench/bench_parser.py [--lines 100000] [--repeat 5] [--json]
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import monitor  # noqa: E402
+from bench.synthetic import synthetic_explore_output  # noqa: E402
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--lines", type=int, default=100_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--json", action="store_true", help="print machine-readable results")
+    args = ap.parse_args()
+
+    output = synthetic_explore_output(args.lines)
+    timings = []
+    parsed = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        parsed = monitor.parse_explore_output(output)
+        timings.append(time.perf_counter() - started)
+
+    best = min(timings)
+    result = {
+        "lines": args.lines,
+        "parsed": len(parsed),
+        "with_downloads": sum(1 for s in parsed if s["downloads"]),
+        "best_s": round(best, 4),
+        "median_s": round(statistics.median(timings), 4),
+        "us_per_line": round(best / max(1, args.lines) * 1e6, 3),
+        "lines_per_s": int(args.lines / best) if best else 0,
+    }
+    if args.json:
+        print(json.dumps(result))
+    else:
+        for k, v in result.items():
+            print(f"{k:>15}: {v}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
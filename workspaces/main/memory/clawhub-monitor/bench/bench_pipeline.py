@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""Benchmark suite for the monitor.py pipeline on synthetic ClawHub data.
+
+For each scale (known skills in state; the explore listing is 10% new skills
+on top of the known ones) it times every stage and records its peak Python
+memory (tracemalloc):
+
+  parse        parse_explore_output over the listing
+  state_load   open_state_store (first run imports a legacy JSON of that size)
+  find_new     StateStore.known_names + find_new_skills
+  state_save   StateStore.upsert of the listing
+  extract      tags/type/opportunities/deps over a SKILL.md corpus
+  render       generate_report for the new skills (enrichment served locally)
+
+Results are written as JSON (one file per run, tagged with the git commit) so
+two commits can be compared with --compare.
+
+Usage:
+  python3 bench/bench_pipeline.py [--scales 1000,10000,100000] [--out results.json]
+  python3 bench/bench_pipeline.py --compare old.json new.json
+"""
+
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE.parent))
+
+import monitor  # noqa: E402
+from bench.synthetic import (  # noqa: E402
+    synthetic_explore_output,
+    synthetic_known_state,
+    synthetic_skill_md,
+    synthetic_skill_md_corpus,
+)
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+# SKILL.md extraction is per enriched skill; cap the corpus so 100k stays quick.
+MAX_CORPUS = 10_000
+RESULTS_DIR = HERE / "results"
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=str(HERE), timeout=5
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _point_monitor_at(work_dir: Path) -> None:
+    """Redirect every monitor.py path into a scratch dir and silence logging."""
+    monitor.WORK_DIR = work_dir
+    monitor.STATE_DB = work_dir / "known_skills.sqlite3"
+    monitor.STATE_FILE = work_dir / "known_skills.json"
+    monitor.REPORT_FILE = work_dir / "daily_report.md"
+    monitor.REPORT_MODEL_FILE = work_dir / "daily_report.json"
+    monitor.LOG_FILE = work_dir / "monitor.log"
+    monitor.LOCK_FILE = work_dir / "monitor.lock"
+    monitor.FALLBACK_FILE = work_dir / "fallback_skills.json"
+    monitor.EVENTS_FILE = work_dir / "events.jsonl"
+    monitor.SNAPSHOT_ARCHIVE_FILE = work_dir / "snapshots.bin"
+    monitor.SERIES_DB = work_dir / "download_series.sqlite3"
+    monitor.ENRICH_CACHE_FILE = work_dir / "enrich_cache.sqlite3"
+    monitor.LATENCY_FILE = work_dir / "latency_history.json"
+    monitor.BREAKER_FILE = work_dir / "rate_limit_breaker.json"
+    monitor.METRICS_FILE = work_dir / "run_metrics.json"
+    monitor.METRICS_PROM_FILE = work_dir / "clawhub_monitor.prom"
+    monitor._ENRICH_CACHE = None
+    monitor._SERIES = None
+    monitor._FEATURES = None
+    monitor._RETRY_POLICY = None
+    monitor._BREAKER = None
+    monitor.log = lambda msg, *args, **fields: None
+
+
+def _serve_enrichment_locally() -> None:
+    """Answer inspect calls from synthetic data so `render` measures CPU only."""
+
+    def inspect_json(slug: str):
+        return {
+            "skill": {"slug": slug, "displayName": slug, "summary": f"{slug} trading agent", "stats": {"downloads": 7, "stars": 1}},
+            "owner": {"handle": "bench"},
+        }, None
+
+    def inspect_file(slug: str, path: str):
+        return synthetic_skill_md(int(slug.rsplit("-", 1)[-1])), None
+
+    monitor.clawhub_inspect_json = inspect_json
+    monitor.clawhub_inspect_file = inspect_file
+    monitor.INSPECT_LIMITER.rate = 0
+
+
+@contextmanager
+def stage(results: Dict[str, Any], name: str) -> Iterator[None]:
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {"seconds": round(elapsed, 6), "peak_kb": round(peak / 1024, 1)}
+
+
+def run_scale(known: int) -> Dict[str, Any]:
+    new = max(1, known // 10)
+    stages: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="clawhub-bench-") as tmp:
+        work_dir = Path(tmp)
+        _point_monitor_at(work_dir)
+        _serve_enrichment_locally()
+        monitor.STATE_FILE.write_text(json.dumps(synthetic_known_state(known, start=new)), encoding="utf-8")
+        listing = synthetic_explore_output(known + new)
+        corpus = synthetic_skill_md_corpus(min(known, MAX_CORPUS))
+
+        with stage(stages, "parse"):
+            parsed = monitor.parse_explore_output(listing)
+
+        with stage(stages, "state_load"):
+            store = monitor.open_state_store()
+
+        with stage(stages, "find_new"):
+            known_names = store.known_names(s["name"] for s in parsed)
+            new_skills = monitor.find_new_skills(parsed, known_names)
+
+        with stage(stages, "state_save"):
+            store.upsert(parsed)
+
+        with stage(stages, "extract"):
+            for i, md in enumerate(corpus):
+                summary = parsed[i]["summary"]
+                tags = monitor._guess_type_tags(parsed[i]["name"], summary, monitor._parse_tags_from_skill_md(md))
+                monitor._suggest_opportunities(parsed[i]["name"], summary, tags)
+                monitor._build_dependency_line(md, summary)
+
+        with stage(stages, "render"):
+            monitor.generate_report(new_skills, status="success_with_new", source="bench")
+
+        store.close()
+
+    return {
+        "known": known,
+        "listing": len(parsed),
+        "new": len(new_skills),
+        "corpus": len(corpus),
+        "stages": stages,
+        "total_s": round(sum(v["seconds"] for v in stages.values()), 6),
+    }
+
+
+def compare(old_path: Path, new_path: Path) -> int:
+    old = {r["known"]: r for r in json.loads(old_path.read_text(encoding="utf-8"))["scales"]}
+    new = json.loads(new_path.read_text(encoding="utf-8"))
+    print(f"{'scale':>8} {'stage':<11} {'old s':>10} {'new s':>10} {'change':>8}")
+    for r in new["scales"]:
+        base = old.get(r["known"])
+        if not base:
+            continue
+        for name, cur in r["stages"].items():
+            prev = base["stages"].get(name)
+            if not prev:
+                continue
+            delta = (cur["seconds"] - prev["seconds"]) / prev["seconds"] * 100 if prev["seconds"] else 0.0
+            print(f"{r['known']:>8} {name:<11} {prev['seconds']:>10.4f} {cur['seconds']:>10.4f} {delta:>+7.1f}%")
+    return 0
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES))
+    ap.add_argument("--out", type=Path, help="results file (default: bench/results/<time>-<commit>.json)")
+    ap.add_argument("--compare", nargs=2, type=Path, metavar=("OLD", "NEW"))
+    args = ap.parse_args()
+
+    if args.compare:
+        return compare(*args.compare)
+
+    scales: List[Dict[str, Any]] = []
+    for known in (int(s) for s in args.scales.split(",") if s.strip()):
+        result = run_scale(known)
+        scales.append(result)
+        line = "  ".join(f"{k}={v['seconds']:.3f}s/{v['peak_kb']:.0f}KB" for k, v in result["stages"].items())
+        print(f"[{known:>7}] {line}")
+
+    commit = _git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        "scales": scales,
+    }
+    out = args.out or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'nogit'}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Results written to {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
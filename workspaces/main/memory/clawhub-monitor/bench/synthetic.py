@@ -0,0 +1,67 @@
+"""Synthetic ClawHub data for the benchmarks (deterministic per seed)."""
+
+import random
+from datetime import datetime
+from typing import Any, Dict, List
+
+AGES = ["just now", "1m ago", "3m ago", "2h ago", "5d ago", "1w ago", "2mo ago", "1y ago"]
+WORDS = "agent search trading polymarket ecommerce video transcript mcp solana node python memory".split()
+ENV_VARS = ["OPENAI_API_KEY", "SOLANA_RPC_URL", "TELEGRAM_BOT_TOKEN", "POLYMARKET_KEY", "X402_WALLET"]
+STACK_HINTS = ["pip install requests", "npx some-tool", "npm install sdk", "Uses MCP tools", "Solana devnet", "EVM / x402 payments"]
+
+
+def slug(i: int) -> str:
+    return f"skill-{i:06d}"
+
+
+def synthetic_explore_output(lines: int, seed: int = 42, start: int = 0) -> str:
+    """A `clawhub explore` text listing with `lines` skills, newest first."""
+    rnd = random.Random(seed)
+    out = ["- Fetching latest skills"]
+    for i in range(start, start + lines):
+        version = f"v{rnd.randint(0, 3)}.{rnd.randint(0, 20)}.{rnd.randint(0, 40)}"
+        summary = " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(4, 9))).capitalize()
+        line = f"{slug(i)}  {version}  {rnd.choice(AGES)}  {summary[:48]}…"
+        if i % 10 == 0:
+            line += f"  {rnd.randint(0, 50000):,} downloads"
+        out.append(line)
+    return "\n".join(out)
+
+
+def synthetic_known_state(count: int, start: int = 0) -> Dict[str, Dict[str, Any]]:
+    """A legacy known_skills.json mapping with `count` skills."""
+    now = datetime.now().isoformat()
+    return {
+        slug(i): {
+            "name": slug(i),
+            "downloads": i % 97,
+            "raw": f"{slug(i)}  v1.0.0  3m ago  Synthetic skill {i}",
+            "discovered_at": now,
+        }
+        for i in range(start, start + count)
+    }
+
+
+def synthetic_skill_md(i: int, seed: int = 42) -> str:
+    rnd = random.Random(seed * 1_000_003 + i)
+    tags = rnd.sample(WORDS, 3)
+    body = [
+        "---",
+        f"name: {slug(i)}",
+        f"tags: [{', '.join(tags)}]",
+        "---",
+        f"# {slug(i)}",
+        "",
+        " ".join(rnd.choice(WORDS) for _ in range(60)),
+        "",
+        "## Setup",
+        "",
+        f"Set `{rnd.choice(ENV_VARS)}` and `{rnd.choice(ENV_VARS)}`.",
+        rnd.choice(STACK_HINTS),
+        "No API keys required for read-only mode." if i % 4 == 0 else "",
+    ]
+    return "\n".join(body)
+
+
+def synthetic_skill_md_corpus(count: int, seed: int = 42) -> List[str]:
+    return [synthetic_skill_md(i, seed) for i in range(count)]
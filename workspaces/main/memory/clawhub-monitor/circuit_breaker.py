@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Rate-limit circuit breaker for ClawHub calls
+
+- closed: calls go through; a rate-limit response opens the breaker
+- open: every call is refused until the cool-down ends (the server's
+  retry-after hint when there is one, else exponential in the trip count)
+- half_open: one probe call is let through; success closes the breaker,
+  another rate limit re-opens it with a longer cool-down
+- State is persisted as compact JSON, so the next cron run still knows it was
+  throttled
+"""
+
+import json
+import re
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from atomic_io import atomic_write_json
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Banner/error text the CLI or API prints when throttled.
+RATE_LIMIT_RE = re.compile(r"rate[\s_-]?limit|too many requests|\b429\b", re.I)
+# "retry after 30s", "try again in 2 minutes", "Retry-After: 120"
+RETRY_AFTER_RE = re.compile(
+    r"(?:retry|try again)[\s-]*(?:after|in)?:?\s*(?P<n>\d+(?:\.\d+)?)\s*(?P<unit>ms|s|sec|seconds?|m|min|minutes?|h|hours?)?\b",
+    re.I,
+)
+RETRY_AFTER_UNITS = {"ms": 0.001, "m": 60.0, "min": 60.0, "h": 3600.0}
+
+
+def is_rate_limited(text: Optional[str], status: int = 0) -> bool:
+    return status == 429 or bool(text and RATE_LIMIT_RE.search(text))
+
+
+def parse_retry_after(text: Optional[str]) -> Optional[float]:
+    """Seconds from a retry-after hint in free text, or None."""
+    m = RETRY_AFTER_RE.search(text or "")
+    if not m:
+        return None
+    unit = (m.group("unit") or "s").lower()
+    scale = RETRY_AFTER_UNITS.get(unit) or RETRY_AFTER_UNITS.get(unit[:3]) or RETRY_AFTER_UNITS.get(unit[:1], 1.0)
+    return float(m.group("n")) * scale
+
+
+class RateLimitBreaker:
+    def __init__(self, path: Path, base_cooldown_s: float = 300.0, max_cooldown_s: float = 6 * 3600.0) -> None:
+        self.path = path
+        self.base_cooldown_s = base_cooldown_s
+        self.max_cooldown_s = max_cooldown_s
+        self.state = CLOSED
+        self.trips = 0
+        self.until = 0.0
+        self.reason = ""
+        self._probing = False
+        self._lock = threading.Lock()
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                self.state = data.get("state") if data.get("state") in (OPEN, HALF_OPEN) else CLOSED
+                self.trips = int(data.get("trips") or 0)
+                self.until = float(data.get("until") or 0.0)
+                self.reason = str(data.get("reason") or "")
+            except (ValueError, AttributeError, TypeError):
+                pass
+
+    def allow(self) -> bool:
+        """True if a call may go out now (at most one probe while half-open)."""
+        with self._lock:
+            if self.state == OPEN and time.time() >= self.until:
+                self.state = HALF_OPEN
+                self._save()
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def blocked(self) -> bool:
+        """True while calls would be refused; unlike allow() it takes no probe."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.time() < self.until
+            return self.state == HALF_OPEN and self._probing
+
+    def release(self) -> None:
+        """End a probe that was neither a success nor a rate limit (timeout, error)."""
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._probing = False
+            if self.state != CLOSED:
+                self.state, self.trips, self.until, self.reason = CLOSED, 0, 0.0, ""
+                self._save()
+
+    def record_rate_limit(self, retry_after_s: Optional[float] = None, reason: str = "") -> float:
+        """Open the breaker; returns the cool-down in seconds."""
+        with self._lock:
+            self._probing = False
+            if self.state == OPEN and time.time() < self.until:
+                return self.until - time.time()  # concurrent calls hit the same limit
+            self.trips += 1
+            cooldown = retry_after_s if retry_after_s else self.base_cooldown_s * 2 ** (self.trips - 1)
+            cooldown = min(self.max_cooldown_s, max(1.0, cooldown))
+            self.state = OPEN
+            self.until = time.time() + cooldown
+            self.reason = reason[:200]
+            self._save()
+            return cooldown
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"state": self.state, "trips": self.trips, "until": round(self.until, 1), "reason": self.reason}
+
+    def _save(self) -> None:
+        data = {"state": self.state, "trips": self.trips, "until": round(self.until, 1), "reason": self.reason}
+        atomic_write_json(self.path, data)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""Record/replay for ClawHub transports (deterministic offline runs)
+
+- RecordingTransport wraps a live transport and appends every call (request,
+  response, status, error, timeout flag, latency) to a JSON-lines cassette
+- ReplayTransport serves a cassette back without touching the network, either
+  instantly, with the recorded latency, or with a fixed delay
+- FaultInjection adds seeded delays, timeouts and rate-limit banners on top of
+  the replay so retry/fallback paths can be exercised and load-tested
+
+Explore calls are matched by the nearest recorded limit (>= requested) and
+truncated, so incremental paging replays from one large recording.
+"""
+
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from clawhub_client import CallObserver, ClawHubResponse, ClawHubTimeout, ClawHubTransport, ExploreStream, ListStream
+
+RATE_LIMIT_BANNER = "Rate limit exceeded. Please retry later."
+
+
+class FaultInjection(NamedTuple):
+    timeout_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    extra_delay_s: float = 0.0
+    seed: int = 0
+
+    @classmethod
+    def parse(cls, spec: str) -> "FaultInjection":
+        """Parse "timeout=0.2,rate_limit=0.1,delay=0.5,seed=1" (all optional)."""
+        values: Dict[str, float] = {}
+        for part in (spec or "").split(","):
+            if "=" in part:
+                k, v = part.split("=", 1)
+                values[k.strip()] = float(v)
+        return cls(
+            timeout_rate=values.get("timeout", 0.0),
+            rate_limit_rate=values.get("rate_limit", 0.0),
+            extra_delay_s=values.get("delay", 0.0),
+            seed=int(values.get("seed", 0)),
+        )
+
+
+def _entry_lines(items: List[Any]) -> int:
+    return sum(1 for x in items if not isinstance(x, str) or (x.strip() and not x.lstrip().startswith("-")))
+
+
+def _truncate_listing(items: List[Any], limit: int) -> List[Any]:
+    """Keep header lines plus the first `limit` entries of a recorded listing."""
+    out: List[Any] = []
+    seen = 0
+    for x in items:
+        is_entry = not isinstance(x, str) or (x.strip() and not x.lstrip().startswith("-"))
+        if is_entry:
+            if seen >= limit:
+                break
+            seen += 1
+        out.append(x)
+    return out
+
+
+class RecordingTransport(ClawHubTransport):
+    def __init__(self, inner: ClawHubTransport, path: Path) -> None:
+        self.inner = inner
+        self.path = path
+        self.name = f"{inner.name}+record"
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        line = json.dumps(entry, ensure_ascii=False, separators=(",", ":"))
+        with self._lock, open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+    def _record(self, op: str, key: Dict[str, Any], call) -> ClawHubResponse:
+        started = time.monotonic()
+        try:
+            r = call()
+        except ClawHubTimeout as e:
+            self._write({"op": op, "key": key, "timed_out": True, "error": str(e), "latency_s": round(time.monotonic() - started, 4)})
+            raise
+        entry = {"op": op, "key": key, "status": r.status, "error": r.error, "latency_s": round(time.monotonic() - started, 4)}
+        if op == "explore":
+            entry.update(items=r.data.splitlines() if isinstance(r.data, str) else r.data, text=isinstance(r.data, str))
+        else:
+            entry["data"] = r.data
+        self._write(entry)
+        return r
+
+    def set_observer(self, observer: Optional[CallObserver]) -> None:
+        self.inner.set_observer(observer)
+
+    def warmup(self) -> str:
+        return self.inner.warmup()
+
+    def explore(self, limit: int, timeout: float) -> ClawHubResponse:
+        return self._record("explore", {"limit": limit}, lambda: self.inner.explore(limit, timeout))
+
+    def explore_stream(self, limit: int, timeout: float) -> ExploreStream:
+        return _RecordingStream(self, limit, self.inner.explore_stream(limit, timeout))
+
+    def inspect(self, slug: str, timeout: float) -> ClawHubResponse:
+        return self._record("inspect", {"slug": slug}, lambda: self.inner.inspect(slug, timeout))
+
+    def inspect_file(self, slug: str, path: str, timeout: float) -> ClawHubResponse:
+        return self._record("inspect_file", {"slug": slug, "path": path}, lambda: self.inner.inspect_file(slug, path, timeout))
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+class _RecordingStream(ExploreStream):
+    def __init__(self, owner: RecordingTransport, limit: int, inner: ExploreStream) -> None:
+        super().__init__()
+        self._owner = owner
+        self._limit = limit
+        self._inner = inner
+        self._items: List[Any] = []
+        self._started = time.monotonic()
+        self._written = False
+
+    def __iter__(self):
+        for item in self._inner:
+            self._items.append(item)
+            yield item
+        self._flush()
+
+    def _flush(self) -> None:
+        self.error, self.timed_out, self.status = self._inner.error, self._inner.timed_out, self._inner.status
+        if self._written:
+            return
+        self._written = True
+        self._owner._write(
+            {
+                "op": "explore",
+                "key": {"limit": self._limit},
+                "status": self.status,
+                "error": self.error,
+                "timed_out": self.timed_out,
+                # A stream closed early is still a valid (truncated) listing.
+                "items": self._items,
+                "text": bool(self._items) and isinstance(self._items[0], str),
+                "latency_s": round(time.monotonic() - self._started, 4),
+            }
+        )
+
+    def close(self) -> None:
+        self._inner.close()
+        self._flush()
+
+
+class ReplayTransport(ClawHubTransport):
+    """Serve a cassette. `latency` is "none", "recorded", or a fixed number of seconds."""
+
+    def __init__(self, path: Path, latency: str = "none", faults: Optional[FaultInjection] = None) -> None:
+        self.path = path
+        self.name = "replay"
+        self.latency = latency
+        self.faults = faults or FaultInjection()
+        self._rng = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        if path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                if line.strip():
+                    entry = json.loads(line)
+                    self._entries.setdefault(self._key(entry["op"], entry.get("key") or {}), []).append(entry)
+
+    @staticmethod
+    def _key(op: str, key: Dict[str, Any]) -> str:
+        if op == "explore":
+            return "explore"
+        return op + ":" + json.dumps(key, sort_keys=True)
+
+    def _next(self, op: str, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Recorded entries for a key are served in order; the last one repeats."""
+        k = self._key(op, key)
+        entries = self._entries.get(k)
+        if not entries:
+            return None
+        if op == "explore":
+            limit = key["limit"]
+            ok = [e for e in entries if not e.get("timed_out") and not e.get("error")] or entries
+            bigger = [e for e in ok if _entry_lines(e.get("items") or []) >= limit]
+            return min(bigger, key=lambda e: e["key"]["limit"]) if bigger else max(ok, key=lambda e: e["key"]["limit"])
+        with self._lock:
+            i = self._cursor.get(k, 0)
+            self._cursor[k] = i + 1
+        return entries[min(i, len(entries) - 1)]
+
+    def _delay(self, entry: Optional[Dict[str, Any]], timeout: float) -> None:
+        if self.latency == "recorded":
+            delay = float((entry or {}).get("latency_s") or 0.0)
+        elif self.latency in ("", "none"):
+            delay = 0.0
+        else:
+            delay = float(self.latency)
+        delay += self.faults.extra_delay_s
+        if delay > timeout:
+            time.sleep(timeout)
+            raise ClawHubTimeout(f"replayed call exceeded {timeout}s")
+        if delay > 0:
+            time.sleep(delay)
+
+    def _roll(self, rate: float) -> bool:
+        if rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < rate
+
+    def _serve(self, op: str, key: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        if self._roll(self.faults.timeout_rate):
+            raise ClawHubTimeout(f"injected timeout ({op})")
+        entry = self._next(op, key)
+        self._delay(entry, timeout)
+        if entry is None:
+            return {"error": f"no recorded interaction for {op} {key}", "status": -1}
+        if entry.get("timed_out"):
+            raise ClawHubTimeout(entry.get("error") or f"recorded timeout ({op})")
+        if self._roll(self.faults.rate_limit_rate):
+            return {"error": RATE_LIMIT_BANNER, "status": 429, "rate_limited": True, "text": entry.get("text")}
+        return entry
+
+    def explore(self, limit: int, timeout: float) -> ClawHubResponse:
+        entry = self._serve("explore", {"limit": limit}, timeout)
+        if entry.get("rate_limited") and entry.get("text"):
+            # The CLI prints the banner instead of a listing.
+            return ClawHubResponse(RATE_LIMIT_BANNER, None, 0)
+        if entry.get("error"):
+            return ClawHubResponse(None, entry["error"], int(entry.get("status") or 0))
+        items = _truncate_listing(entry.get("items") or [], limit)
+        data = "\n".join(items) if entry.get("text") else items
+        return ClawHubResponse(data, None, int(entry.get("status") or 0))
+
+    def explore_stream(self, limit: int, timeout: float) -> ExploreStream:
+        if self._roll(self.faults.timeout_rate):
+            # Simulate a slow listing: half of it arrives before the timeout.
+            entry = self._next("explore", {"limit": limit}) or {}
+            items = _truncate_listing(entry.get("items") or [], limit)
+            stream = ListStream(items[: len(items) // 2], "explore stream timed out (injected)")
+            stream.timed_out = True
+            return stream
+        return super().explore_stream(limit, timeout)
+
+    def inspect(self, slug: str, timeout: float) -> ClawHubResponse:
+        entry = self._serve("inspect", {"slug": slug}, timeout)
+        return ClawHubResponse(entry.get("data"), entry.get("error"), int(entry.get("status") or 0))
+
+    def inspect_file(self, slug: str, path: str, timeout: float) -> ClawHubResponse:
+        entry = self._serve("inspect_file", {"slug": slug, "path": path}, timeout)
+        return ClawHubResponse(entry.get("data"), entry.get("error"), int(entry.get("status") or 0))
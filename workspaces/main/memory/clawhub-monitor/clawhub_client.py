@@ -0,0 +1,671 @@
+#!/usr/bin/env python3
+"""ClawHub client used by monitor.py
+
+Transports (pick with make_transport / CLAWHUB_TRANSPORT):
+- cli:  the clawhub CLI, run through one long-lived `node clawhub_worker.js`
+        process per run (JSON-lines over stdin/stdout with request ids,
+        per-request timeouts, automatic respawn; npx fallback without node).
+        explore_stream() yields listing lines as the CLI prints them.
+        Every CLI call is reported to an optional observer with the child's
+        wall time, CPU time and peak RSS (set_observer()).
+- http: the ClawHub HTTP API directly, over pooled keep-alive connections
+        with gzip; explore/inspect come back as structured JSON
+"""
+
+import atexit
+import gzip
+import http.client
+import itertools
+import json
+import os
+import queue
+import resource
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+from urllib.parse import quote, urlencode, urlsplit
+
+WORKER_SCRIPT = Path(__file__).with_name("clawhub_worker.js")
+# Extra seconds to wait for the worker's own timeout reply before giving up.
+WORKER_TIMEOUT_GRACE_S = 5.0
+WORKER_START_TIMEOUT_S = 120
+
+
+class CommandResult(NamedTuple):
+    returncode: int
+    stdout: str
+    stderr: str
+
+
+# observer(args, usage): usage has wall_ms, cpu_ms, max_rss_kb (when known),
+# code and timed_out. Called from reader threads, so it must be thread-safe.
+CallObserver = Callable[[List[str], Dict[str, Any]], None]
+
+
+class ClawHubResponse(NamedTuple):
+    """One transport call. `data` is str for CLI explore/file, JSON for HTTP and inspect."""
+
+    data: Any
+    error: Optional[str]
+    status: int  # process exit code (cli) or HTTP status (http)
+    retry_after: Optional[float] = None  # seconds, from a 429/503 Retry-After header
+
+
+class ClawHubTimeout(Exception):
+    pass
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+class ExploreStream(ABC):
+    """Explore output as it arrives: CLI lines (str) or JSON items (dict).
+
+    After iteration, `error`/`timed_out`/`status`/`stderr` describe how the request
+    ended; items yielded before a timeout are still valid. close() stops the
+    request early (the CLI process is killed).
+    """
+
+    def __init__(self) -> None:
+        self.error: Optional[str] = None
+        self.stderr = ""
+        self.timed_out = False
+        self.status = 0
+        self.retry_after: Optional[float] = None
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[Any]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class ListStream(ExploreStream):
+    """A stream over an already complete response."""
+
+    def __init__(self, items: List[Any], error: Optional[str] = None, status: int = 0) -> None:
+        super().__init__()
+        self._items = items
+        self.error = error
+        self.status = status
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+
+class _QueueStream(ExploreStream):
+    """Lines pushed by a reader thread; `cancel` stops the producer."""
+
+    def __init__(
+        self, timeout: float, cancel: Callable[[], None], on_done: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> None:
+        super().__init__()
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._deadline = time.monotonic() + timeout
+        self._cancel = cancel
+        self._on_done = on_done
+        self._finished = False
+
+    def feed_line(self, line: str) -> None:
+        self._queue.put(("line", line))
+
+    def feed_done(self, code: int, stderr: str, timed_out: bool, usage: Optional[Dict[str, Any]] = None) -> None:
+        """Also called after close(): the producer still reports how it ended."""
+        self._queue.put(("done", (code, stderr, timed_out)))
+        if self._on_done is not None:
+            self._on_done(dict(usage or {}, code=code, timed_out=timed_out))
+
+    def __iter__(self) -> Iterator[str]:
+        while not self._finished:
+            remaining = self._deadline - time.monotonic()
+            if remaining <= 0:
+                self.timed_out = True
+                self.error = "explore stream timed out"
+                self.close()
+                return
+            try:
+                kind, value = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if kind == "line":
+                yield value
+                continue
+            if kind == "closed":
+                return
+            code, stderr, timed_out = value
+            self._finished = True
+            self.status = code
+            self.stderr = stderr or ""
+            self.timed_out = bool(timed_out)
+            if timed_out:
+                self.error = "explore stream timed out"
+            elif code != 0:
+                self.error = (stderr or f"exit code {code}").strip()[:260]
+
+    def close(self) -> None:
+        """Safe from any thread; wakes an iterator blocked waiting for a line."""
+        if not self._finished:
+            self._finished = True
+            self._queue.put(("closed", None))
+            self._cancel()
+
+
+class _Pending:
+    __slots__ = ("event", "reply")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.reply: Optional[Dict[str, Any]] = None
+
+
+class ClawHubWorker:
+    """A persistent clawhub worker process, safe to share between threads."""
+
+    def __init__(self, cwd: Path, script: Path = WORKER_SCRIPT, node: str = "node") -> None:
+        self.cwd = cwd
+        self.script = script
+        self.node = node
+        self.spawn_count = 0
+        self._proc: Optional[subprocess.Popen] = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, _Pending] = {}
+        self._streams: Dict[int, _QueueStream] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self.on_call: Optional[CallObserver] = None
+
+    def _alive(self) -> bool:
+        return self._proc is not None and self._proc.poll() is None
+
+    def _ensure_started(self) -> subprocess.Popen:
+        with self._lock:
+            if self._alive():
+                return self._proc
+            self._proc = subprocess.Popen(
+                [self.node, str(self.script)],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                text=True,
+                encoding="utf-8",
+                bufsize=1,
+                cwd=str(self.cwd),
+            )
+            self.spawn_count += 1
+            threading.Thread(target=self._read_loop, args=(self._proc,), name="clawhub-worker-reader", daemon=True).start()
+            return self._proc
+
+    def _read_loop(self, proc: subprocess.Popen) -> None:
+        for line in proc.stdout:
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+            req_id = msg.get("id")
+            with self._lock:
+                stream = self._streams.get(req_id)
+                if stream is not None and msg.get("done"):
+                    del self._streams[req_id]
+                pending = self._pending.pop(req_id, None) if stream is None else None
+            if stream is not None:
+                if msg.get("done"):
+                    stream.feed_done(
+                        int(msg.get("code", -1)), msg.get("stderr") or "", bool(msg.get("timed_out")), msg.get("usage")
+                    )
+                else:
+                    stream.feed_line(msg.get("line") or "")
+            elif pending is not None:
+                pending.reply = msg
+                pending.event.set()
+        # EOF: the worker is gone; wake every waiter so it can respawn/retry.
+        with self._lock:
+            if self._proc is proc:
+                self._proc = None
+            orphans = list(self._pending.values())
+            self._pending.clear()
+            orphan_streams = list(self._streams.values())
+            self._streams.clear()
+        for pending in orphans:
+            pending.event.set()
+        for stream in orphan_streams:
+            stream.feed_done(-1, "clawhub worker exited", False)
+
+    def _send(self, proc: subprocess.Popen, payload: Dict[str, Any]) -> None:
+        with self._write_lock:
+            proc.stdin.write(json.dumps(payload) + "\n")
+            proc.stdin.flush()
+
+    def _request(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        proc = self._ensure_started()
+        req_id = next(self._ids)
+        pending = _Pending()
+        with self._lock:
+            self._pending[req_id] = pending
+        payload = dict(payload, id=req_id, timeout_ms=int(timeout * 1000))
+        try:
+            self._send(proc, payload)
+        except (BrokenPipeError, OSError) as e:
+            with self._lock:
+                self._pending.pop(req_id, None)
+            raise WorkerCrashed(f"clawhub worker write failed: {e}") from e
+
+        if not pending.event.wait(timeout + WORKER_TIMEOUT_GRACE_S):
+            with self._lock:
+                self._pending.pop(req_id, None)
+            raise subprocess.TimeoutExpired(payload.get("args") or ["ping"], timeout)
+        if pending.reply is None:
+            raise WorkerCrashed("clawhub worker exited")
+        return pending.reply
+
+    def run(self, args: List[str], timeout: float) -> CommandResult:
+        """Run `clawhub <args>` in the worker. Retries once if the worker crashed."""
+        for attempt in (1, 2):
+            try:
+                reply = self._request({"args": args}, timeout)
+                break
+            except WorkerCrashed:
+                if attempt == 2:
+                    raise
+        if self.on_call is not None:
+            self.on_call(args, dict(reply.get("usage") or {}, code=reply.get("code"), timed_out=bool(reply.get("timed_out"))))
+        if reply.get("timed_out"):
+            raise subprocess.TimeoutExpired(["clawhub"] + args, timeout, output=reply.get("stdout"))
+        return CommandResult(int(reply.get("code", -1)), reply.get("stdout") or "", reply.get("stderr") or "")
+
+    def stream(self, args: List[str], timeout: float) -> ExploreStream:
+        """Run `clawhub <args>` and yield stdout lines as the worker forwards them."""
+        proc = self._ensure_started()
+        req_id = next(self._ids)
+
+        def cancel() -> None:
+            # The stream stays registered: the worker's final reply (with
+            # usage) still arrives after the kill and unregisters it.
+            try:
+                self._send(proc, {"op": "cancel", "target": req_id})
+            except (BrokenPipeError, OSError):
+                with self._lock:
+                    self._streams.pop(req_id, None)
+
+        on_done = (lambda usage: self.on_call(args, usage)) if self.on_call is not None else None
+        stream = _QueueStream(timeout + WORKER_TIMEOUT_GRACE_S, cancel, on_done)
+        with self._lock:
+            self._streams[req_id] = stream
+        try:
+            self._send(proc, {"id": req_id, "args": args, "timeout_ms": int(timeout * 1000), "stream": True})
+        except (BrokenPipeError, OSError) as e:
+            with self._lock:
+                self._streams.pop(req_id, None)
+            return ListStream([], f"clawhub worker write failed: {e}", -1)
+        return stream
+
+    def ping(self, timeout: float = WORKER_START_TIMEOUT_S) -> str:
+        """Start the worker and resolve the clawhub CLI; returns the resolved command."""
+        return self._request({"op": "ping"}, timeout).get("stdout") or ""
+
+    def close(self) -> None:
+        with self._lock:
+            proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            proc.stdin.close()
+            proc.wait(timeout=5)
+        except Exception:
+            proc.kill()
+
+
+class ClawHubClient:
+    """Runs clawhub CLI commands, through the persistent worker when possible."""
+
+    def __init__(self, cwd: Path, use_worker: bool = True) -> None:
+        self.cwd = cwd
+        self.worker: Optional[ClawHubWorker] = None
+        self._on_call: Optional[CallObserver] = None
+        if use_worker and shutil.which("node") and WORKER_SCRIPT.exists():
+            self.worker = ClawHubWorker(cwd)
+            atexit.register(self.close)
+
+    @property
+    def on_call(self) -> Optional[CallObserver]:
+        return self._on_call
+
+    @on_call.setter
+    def on_call(self, observer: Optional[CallObserver]) -> None:
+        self._on_call = observer
+        if self.worker is not None:
+            self.worker.on_call = observer
+
+    def _observe_npx(self, args: List[str], started: float, before: resource.struct_rusage, code: int, timed_out: bool) -> None:
+        # Without the worker each call is a direct child; RUSAGE_CHILDREN is
+        # process-wide, so concurrent calls blur into each other.
+        if self._on_call is None:
+            return
+        after = resource.getrusage(resource.RUSAGE_CHILDREN)
+        cpu_s = (after.ru_utime + after.ru_stime) - (before.ru_utime + before.ru_stime)
+        usage = {
+            "wall_ms": round((time.monotonic() - started) * 1000),
+            "cpu_ms": round(cpu_s * 1000),
+            "max_rss_kb": after.ru_maxrss,
+            "code": code,
+            "timed_out": timed_out,
+        }
+        self._on_call(args, usage)
+
+    def warmup(self) -> str:
+        if self.worker is not None:
+            return self.worker.ping()
+        subprocess.run(["npx", "clawhub", "--help"], capture_output=True, text=True, timeout=20, cwd=str(self.cwd))
+        return "npx clawhub"
+
+    def run(self, args: List[str], timeout: float) -> CommandResult:
+        if self.worker is not None:
+            return self.worker.run(args, timeout)
+        started, before = time.monotonic(), resource.getrusage(resource.RUSAGE_CHILDREN)
+        try:
+            p = subprocess.run(["npx", "clawhub"] + args, capture_output=True, text=True, timeout=timeout, cwd=str(self.cwd))
+        except subprocess.TimeoutExpired:
+            self._observe_npx(args, started, before, -1, True)
+            raise
+        self._observe_npx(args, started, before, p.returncode, False)
+        return CommandResult(p.returncode, p.stdout or "", p.stderr or "")
+
+    def stream(self, args: List[str], timeout: float) -> ExploreStream:
+        if self.worker is not None:
+            return self.worker.stream(args, timeout)
+        started, before = time.monotonic(), resource.getrusage(resource.RUSAGE_CHILDREN)
+        # stderr goes to a file, not a pipe: npm warnings or a stack trace
+        # larger than the pipe buffer would block the child before stdout closes.
+        errf = tempfile.TemporaryFile("w+", encoding="utf-8", errors="replace")
+        try:
+            proc = subprocess.Popen(
+                ["npx", "clawhub"] + args,
+                stdout=subprocess.PIPE,
+                stderr=errf,
+                text=True,
+                encoding="utf-8",
+                errors="replace",
+                cwd=str(self.cwd),
+            )
+        except BaseException:
+            errf.close()
+            raise
+        stream = _QueueStream(timeout, proc.kill)
+
+        def pump() -> None:
+            with errf:
+                for line in proc.stdout:
+                    stream.feed_line(line.rstrip("\n"))
+                code = proc.wait()
+                errf.seek(0)
+                stream.feed_done(code, errf.read(), False)
+            self._observe_npx(args, started, before, code, False)
+
+        threading.Thread(target=pump, name="clawhub-stream", daemon=True).start()
+        return stream
+
+    def close(self) -> None:
+        if self.worker is not None:
+            self.worker.close()
+
+
+def _strip_cli_prefix_lines(text: str) -> str:
+    lines = []
+    for ln in (text or "").splitlines():
+        if ln.strip().startswith("- Fetching"):
+            continue
+        if ln.strip().startswith("- Downloading"):
+            continue
+        lines.append(ln)
+    return "\n".join(lines).strip()
+
+
+class ClawHubTransport(ABC):
+    """Backend interface for explore/inspect. Timeouts raise ClawHubTimeout."""
+
+    name = "base"
+
+    def set_observer(self, observer: Optional[CallObserver]) -> None:
+        """Report every subprocess call (CLI transports only)."""
+
+    def warmup(self) -> str:
+        return self.name
+
+    @abstractmethod
+    def explore(self, limit: int, timeout: float) -> ClawHubResponse:
+        ...
+
+    def explore_stream(self, limit: int, timeout: float) -> ExploreStream:
+        """Default: one buffered explore() call presented as a stream."""
+        try:
+            r = self.explore(limit, timeout)
+        except ClawHubTimeout as e:
+            stream = ListStream([], str(e))
+            stream.timed_out = True
+            return stream
+        if r.error:
+            stream = ListStream([], r.error, r.status)
+            stream.retry_after = r.retry_after
+            return stream
+        items = r.data.splitlines() if isinstance(r.data, str) else list(r.data)
+        return ListStream(items, None, r.status)
+
+    @abstractmethod
+    def inspect(self, slug: str, timeout: float) -> ClawHubResponse:
+        ...
+
+    @abstractmethod
+    def inspect_file(self, slug: str, path: str, timeout: float) -> ClawHubResponse:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class CliTransport(ClawHubTransport):
+    """clawhub CLI backend; explore returns the raw text listing."""
+
+    name = "cli"
+
+    def __init__(self, cwd: Path, use_worker: bool = True) -> None:
+        self.client = ClawHubClient(cwd, use_worker=use_worker)
+
+    def set_observer(self, observer: Optional[CallObserver]) -> None:
+        self.client.on_call = observer
+
+    def _run(self, args: List[str], timeout: float) -> CommandResult:
+        try:
+            return self.client.run(args, timeout)
+        except subprocess.TimeoutExpired as e:
+            raise ClawHubTimeout(f"clawhub {args[0]} timed out after {timeout}s") from e
+
+    def warmup(self) -> str:
+        return self.client.warmup()
+
+    def explore(self, limit: int, timeout: float) -> ClawHubResponse:
+        p = self._run(["explore", "--limit", str(limit)], timeout)
+        if p.returncode == 0 and p.stdout.strip():
+            return ClawHubResponse(p.stdout, None, p.returncode)
+        return ClawHubResponse(None, (p.stderr or p.stdout or "unknown error").strip()[:260], p.returncode)
+
+    def explore_stream(self, limit: int, timeout: float) -> ExploreStream:
+        return self.client.stream(["explore", "--limit", str(limit)], timeout)
+
+    def inspect(self, slug: str, timeout: float) -> ClawHubResponse:
+        p = self._run(["inspect", slug, "--json"], timeout)
+        if p.returncode != 0:
+            return ClawHubResponse(None, (p.stderr or p.stdout or "inspect failed").strip()[:260], p.returncode)
+        try:
+            return ClawHubResponse(json.loads(_strip_cli_prefix_lines(p.stdout)), None, p.returncode)
+        except ValueError as e:
+            return ClawHubResponse(None, f"inspect error: {e}", p.returncode)
+
+    def inspect_file(self, slug: str, path: str, timeout: float) -> ClawHubResponse:
+        p = self._run(["inspect", slug, "--file", path], timeout)
+        if p.returncode != 0:
+            return ClawHubResponse(None, (p.stderr or p.stdout or "inspect file failed").strip()[:260], p.returncode)
+        return ClawHubResponse(_strip_cli_prefix_lines(p.stdout), None, p.returncode)
+
+    def close(self) -> None:
+        self.client.close()
+
+
+CLAWHUB_API_BASE = "https://clawhub.ai/api/v1"
+HTTP_POOL_SIZE = 8
+HTTP_USER_AGENT = "clawhub-monitor/1.0"
+
+
+def _parse_retry_after_header(value: Optional[str]) -> Optional[float]:
+    """Retry-After is either delay-seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpTransport(ClawHubTransport):
+    """Direct ClawHub HTTP API backend with a pool of keep-alive connections.
+
+    `base_url` may be http:// so tests can point it at a local stand-in server.
+    """
+
+    name = "http"
+
+    def __init__(self, base_url: str = CLAWHUB_API_BASE, token: Optional[str] = None, pool_size: int = HTTP_POOL_SIZE) -> None:
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port
+        self.netloc = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.token = token
+        self.connections_opened = 0
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+
+    def _new_connection(self, timeout: float) -> http.client.HTTPConnection:
+        self.connections_opened += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=timeout)
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]], timeout: float) -> ClawHubResponse:
+        """GET prefix+path; returns raw (decoded) body bytes in `data`."""
+        url = self.prefix + path + ("?" + urlencode(params) if params else "")
+        headers = {
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip",
+            "Connection": "keep-alive",
+            "User-Agent": HTTP_USER_AGENT,
+        }
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+
+        # A pooled connection may have been closed by the server while idle;
+        # retry exactly once on a fresh connection in that case.
+        for attempt in (1, 2):
+            try:
+                conn = self._pool.get_nowait() if attempt == 1 else self._new_connection(timeout)
+            except queue.Empty:
+                conn = self._new_connection(timeout)
+            reused = conn.sock is not None
+            try:
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                conn.timeout = timeout
+                conn.request("GET", url, headers=headers)
+                resp = conn.getresponse()
+                body = resp.read()
+                if resp.getheader("Content-Encoding", "").lower() == "gzip":
+                    body = gzip.decompress(body)
+            except (socket.timeout, TimeoutError) as e:
+                conn.close()
+                raise ClawHubTimeout(f"GET {path} timed out after {timeout}s") from e
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.BadStatusLine) as e:
+                conn.close()
+                if reused and attempt == 1:
+                    continue
+                return ClawHubResponse(None, f"http error: {e}", 0)
+            except (OSError, EOFError, zlib.error, http.client.HTTPException) as e:
+                # OSError includes gzip.BadGzipFile; EOFError is a truncated gzip body.
+                conn.close()
+                return ClawHubResponse(None, f"http error: {e}", 0)
+
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            if resp.status >= 400:
+                snippet = body.decode("utf-8", "replace").strip()[:200]
+                retry_after = _parse_retry_after_header(resp.getheader("Retry-After"))
+                return ClawHubResponse(None, f"HTTP {resp.status}: {snippet}", resp.status, retry_after)
+            return ClawHubResponse(body, None, resp.status)
+        return ClawHubResponse(None, "http error: connection retry exhausted", 0)
+
+    def _get_json(self, path: str, params: Optional[Dict[str, Any]], timeout: float) -> ClawHubResponse:
+        r = self._get(path, params, timeout)
+        if r.error:
+            return r
+        try:
+            return ClawHubResponse(json.loads(r.data.decode("utf-8")), None, r.status)
+        except ValueError as e:
+            return ClawHubResponse(None, f"invalid JSON from {path}: {e}", r.status)
+
+    def warmup(self) -> str:
+        return f"{self.scheme}://{self.netloc}{self.prefix}"
+
+    def explore(self, limit: int, timeout: float) -> ClawHubResponse:
+        r = self._get_json("/skills", {"limit": limit, "sort": "newest"}, timeout)
+        if r.error:
+            return r
+        items = r.data.get("items") if isinstance(r.data, dict) else r.data
+        if not isinstance(items, list):
+            return ClawHubResponse(None, "explore: unexpected response shape", r.status)
+        return ClawHubResponse(items, None, r.status)
+
+    def inspect(self, slug: str, timeout: float) -> ClawHubResponse:
+        return self._get_json(f"/skills/{quote(slug, safe='')}", None, timeout)
+
+    def inspect_file(self, slug: str, path: str, timeout: float) -> ClawHubResponse:
+        r = self._get(f"/skills/{quote(slug, safe='')}/file", {"path": path}, timeout)
+        if r.error:
+            return r
+        return ClawHubResponse(r.data.decode("utf-8", "replace"), None, r.status)
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def make_transport(kind: str, cwd: Path) -> ClawHubTransport:
+    """Build a transport by name ("cli" or "http")."""
+    if kind == "http":
+        return HttpTransport(
+            base_url=os.environ.get("CLAWHUB_API_BASE", CLAWHUB_API_BASE),
+            token=os.environ.get("CLAWHUB_TOKEN") or None,
+        )
+    if kind == "cli":
+        return CliTransport(cwd)
+    raise ValueError(f"unknown ClawHub transport: {kind}")
@@ -0,0 +1,182 @@
+#!/usr/bin/env node
+// Long-lived ClawHub worker for monitor.py.
+//
+// Resolves the clawhub CLI entry point once (npx package resolution is the
+// slow part of every `npx clawhub ...` call) and then serves requests from
+// stdin, one JSON object per line:
+//
+//   -> {"id": 1, "args": ["inspect", "foo", "--json"], "timeout_ms": 40000}
+//   <- {"id": 1, "code": 0, "stdout": "...", "stderr": "", "timed_out": false}
+//
+// {"id": N, "op": "ping"} resolves the CLI (if not done yet) and answers with
+// the resolved path in stdout. Requests run concurrently; responses carry the
+// request id so the client can match them.
+//
+// With "stream": true, stdout is sent line by line as {"id", "line"} events,
+// followed by a final {"id", "done": true, "code", "stderr", "timed_out"}.
+// {"op": "cancel", "target": N} kills the child process of request N.
+//
+// Every final reply carries "usage": {"wall_ms", "cpu_ms", "max_rss_kb"} for
+// the child. CPU and peak RSS are sampled from /proc while it runs (Linux
+// only; absent elsewhere), so the last few ms before exit may be missed.
+
+"use strict";
+
+const { spawn, spawnSync } = require("child_process");
+const fs = require("fs");
+const path = require("path");
+const readline = require("readline");
+const { StringDecoder } = require("string_decoder");
+
+let cliCommand = null; // [command, ...prefixArgs]
+const running = new Map(); // request id -> child process
+const USAGE_SAMPLE_MS = 100;
+const CLK_TCK = 100; // USER_HZ on every Linux we run on
+
+function sampleUsage(pid, usage) {
+  try {
+    const stat = fs.readFileSync(`/proc/${pid}/stat`, "utf8");
+    const fields = stat.slice(stat.lastIndexOf(")") + 2).split(" ");
+    usage.cpu_ms = ((Number(fields[11]) + Number(fields[12])) * 1000) / CLK_TCK;
+    const hwm = /VmHWM:\s+(\d+)/.exec(fs.readFileSync(`/proc/${pid}/status`, "utf8"));
+    if (hwm) usage.max_rss_kb = Math.max(usage.max_rss_kb || 0, Number(hwm[1]));
+  } catch (e) {
+    // process already gone or no /proc
+  }
+}
+
+function binFromPackageJson(pkgPath) {
+  const pkg = JSON.parse(fs.readFileSync(pkgPath, "utf8"));
+  const bin = typeof pkg.bin === "string" ? pkg.bin : (pkg.bin || {}).clawhub;
+  if (!bin) return null;
+  return path.resolve(path.dirname(pkgPath), bin);
+}
+
+function commandForEntry(entry) {
+  const head = fs.readFileSync(entry, "utf8").slice(0, 120);
+  if (head.startsWith("#!") && !head.split("\n")[0].includes("node")) {
+    return [entry];
+  }
+  return [process.execPath, entry];
+}
+
+function resolveCli() {
+  if (cliCommand) return cliCommand;
+
+  // 1) clawhub installed next to the monitor
+  try {
+    const pkgPath = require.resolve("clawhub/package.json", { paths: [process.cwd()] });
+    const entry = binFromPackageJson(pkgPath);
+    if (entry && fs.existsSync(entry)) {
+      cliCommand = commandForEntry(entry);
+      return cliCommand;
+    }
+  } catch (e) {
+    // not installed locally
+  }
+
+  // 2) ask npx once where it cached the package
+  const r = spawnSync("npx", ["--yes", "-p", "clawhub", "-c", "command -v clawhub"], {
+    cwd: process.cwd(),
+    encoding: "utf8",
+    timeout: 120000,
+  });
+  const lines = (r.stdout || "").trim().split("\n");
+  const bin = lines[lines.length - 1];
+  if (r.status === 0 && bin && fs.existsSync(bin)) {
+    cliCommand = commandForEntry(fs.realpathSync(bin));
+    return cliCommand;
+  }
+
+  // 3) give up on caching and pay the npx cost per call
+  cliCommand = ["npx", "clawhub"];
+  return cliCommand;
+}
+
+function reply(msg) {
+  process.stdout.write(JSON.stringify(msg) + "\n");
+}
+
+function handle(req) {
+  const id = req.id;
+  if (req.op === "ping") {
+    reply({ id, code: 0, stdout: resolveCli().join(" "), stderr: "", timed_out: false });
+    return;
+  }
+  if (req.op === "cancel") {
+    const target = running.get(req.target);
+    if (target) target.kill("SIGKILL");
+    return;
+  }
+
+  const [cmd, ...prefix] = resolveCli();
+  let child;
+  try {
+    child = spawn(cmd, prefix.concat(req.args || []), { cwd: process.cwd() });
+  } catch (e) {
+    reply({ id, code: -1, stdout: "", stderr: String(e), timed_out: false, done: true });
+    return;
+  }
+  running.set(id, child);
+
+  const started = Date.now();
+  const usage = {};
+  sampleUsage(child.pid, usage);
+  const sampler = setInterval(() => sampleUsage(child.pid, usage), USAGE_SAMPLE_MS);
+
+  const out = [];
+  const err = [];
+  let timedOut = false;
+  let done = false;
+  const timer = setTimeout(() => {
+    timedOut = true;
+    child.kill("SIGKILL");
+  }, req.timeout_ms || 60000);
+
+  let partial = "";
+  const decoder = new StringDecoder("utf8");
+  child.stdout.on("data", (d) => {
+    if (!req.stream) {
+      out.push(d);
+      return;
+    }
+    const lines = (partial + decoder.write(d)).split("\n");
+    partial = lines.pop();
+    for (const line of lines) reply({ id, line });
+  });
+  child.stderr.on("data", (d) => err.push(d));
+  const finish = (code, error) => {
+    if (done) return;
+    done = true;
+    clearTimeout(timer);
+    clearInterval(sampler);
+    usage.wall_ms = Date.now() - started;
+    running.delete(id);
+    partial += req.stream ? decoder.end() : "";
+    if (req.stream && partial) reply({ id, line: partial });
+    reply({
+      id,
+      done: true,
+      code: code === null ? -1 : code,
+      stdout: req.stream ? "" : Buffer.concat(out).toString("utf8"),
+      stderr: error ? String(error) : Buffer.concat(err).toString("utf8"),
+      timed_out: timedOut,
+      usage,
+    });
+  };
+  child.on("error", (e) => finish(-1, e));
+  child.on("close", (code) => finish(code, null));
+}
+
+const rl = readline.createInterface({ input: process.stdin });
+rl.on("line", (line) => {
+  if (!line.trim()) return;
+  let req;
+  try {
+    req = JSON.parse(line);
+  } catch (e) {
+    return;
+  }
+  handle(req);
+});
+rl.on("close", () => process.exit(0));
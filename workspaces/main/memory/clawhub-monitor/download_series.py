@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""Downloads/stars time series per skill, and growth ranking on top of it
+
+- One SQLite row per skill; samples live in three columns (time, downloads,
+  stars), each an int32 array of deltas from the previous sample, zlib
+  compressed. Steady counters compress to a few bytes per sample
+- The latest sample is also kept as plain columns, so the current value and
+  "did anything change?" never need the arrays decoded
+- A sample equal to the latest one is not stored: series are step functions,
+  the value at time t is the last sample at or before t
+- growth() decodes only the samples inside the window(s) (walking back from
+  the end) and returns velocity (per day) and acceleration (change of velocity
+  between the last window and the one before it)
+"""
+
+import sqlite3
+import time
+import zlib
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS series (
+    name TEXT PRIMARY KEY,
+    n INTEGER NOT NULL,
+    first_t INTEGER NOT NULL,
+    last_t INTEGER NOT NULL,
+    last_downloads INTEGER NOT NULL,
+    last_stars INTEGER NOT NULL,
+    dt BLOB NOT NULL,
+    d_downloads BLOB NOT NULL,
+    d_stars BLOB NOT NULL
+);
+"""
+
+DAY_S = 86400.0
+QUERY_CHUNK = 500
+
+
+class Growth(NamedTuple):
+    downloads: int
+    stars: int
+    velocity: float  # downloads per day over the last window
+    acceleration: float  # velocity change vs. the window before (per day)
+    score: float
+
+
+def _pack(values: array) -> bytes:
+    return zlib.compress(values.tobytes(), 6)
+
+
+def _unpack(blob: bytes) -> array:
+    values = array("i")
+    values.frombytes(zlib.decompress(blob))
+    return values
+
+
+def _value_at(times: List[int], values: List[int], t: int) -> Optional[int]:
+    """Step-function value at `t` from (ascending times, values); None before the first sample."""
+    found = None
+    for when, value in zip(times, values):
+        if when > t:
+            break
+        found = value
+    return found
+
+
+class DownloadSeries:
+    def __init__(self, path: Path, resolution_s: int = 60) -> None:
+        self.path = path
+        self.resolution_s = resolution_s
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path))
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(SCHEMA)
+
+    def _tick(self, ts: Optional[float]) -> int:
+        return int((time.time() if ts is None else ts) // self.resolution_s)
+
+    def record(self, samples: Iterable[Tuple[str, int, int]], ts: Optional[float] = None) -> int:
+        """Append (name, downloads, stars) samples taken at `ts`; returns how many were stored."""
+        t = self._tick(ts)
+        latest: Dict[str, Tuple[int, int]] = {}
+        for name, downloads, stars in samples:
+            if name:
+                latest[name] = (int(downloads or 0), int(stars or 0))
+        if not latest:
+            return 0
+        names = list(latest)
+        rows = {}
+        for i in range(0, len(names), QUERY_CHUNK):
+            chunk = names[i : i + QUERY_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            for row in self._db.execute(
+                f"SELECT name, n, first_t, last_t, last_downloads, last_stars, dt, d_downloads, d_stars "
+                f"FROM series WHERE name IN ({marks})",
+                chunk,
+            ):
+                rows[row[0]] = row
+        writes = []
+        for name, (downloads, stars) in latest.items():
+            row = rows.get(name)
+            if row is None:
+                writes.append(
+                    (name, 1, t, t, downloads, stars, _pack(array("i", [0])), _pack(array("i", [downloads])), _pack(array("i", [stars])))
+                )
+                continue
+            _, n, first_t, last_t, last_downloads, last_stars, dt, d_dl, d_st = row
+            if (downloads, stars) == (last_downloads, last_stars) or t <= last_t:
+                continue
+            dt_a, dl_a, st_a = _unpack(dt), _unpack(d_dl), _unpack(d_st)
+            dt_a.append(t - last_t)
+            dl_a.append(downloads - last_downloads)
+            st_a.append(stars - last_stars)
+            writes.append((name, n + 1, first_t, t, downloads, stars, _pack(dt_a), _pack(dl_a), _pack(st_a)))
+        if writes:
+            with self._db:
+                self._db.executemany("INSERT OR REPLACE INTO series VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", writes)
+        return len(writes)
+
+    def series(self, name: str) -> Optional[List[Tuple[float, int, int]]]:
+        """All samples of one skill as (unix time, downloads, stars)."""
+        row = self._db.execute("SELECT first_t, dt, d_downloads, d_stars FROM series WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        t, downloads, stars = row[0], 0, 0
+        out = []
+        for i, (dt, dd, ds) in enumerate(zip(_unpack(row[1]), _unpack(row[2]), _unpack(row[3]))):
+            t = t + dt if i else t
+            downloads += dd
+            stars += ds
+            out.append((float(t * self.resolution_s), downloads, stars))
+        return out
+
+    def _tail(self, last_t: int, last_downloads: int, dt: bytes, d_dl: bytes, since_t: int) -> Tuple[List[int], List[int]]:
+        """Samples with time >= since_t plus the one before (ascending), rebuilt backwards from the latest."""
+        dt_a, dl_a = _unpack(dt), _unpack(d_dl)
+        times, values = [last_t], [last_downloads]
+        for i in range(len(dt_a) - 1, 0, -1):
+            if times[-1] < since_t:
+                break
+            times.append(times[-1] - dt_a[i])
+            values.append(values[-1] - dl_a[i])
+        times.reverse()
+        values.reverse()
+        return times, values
+
+    def growth(
+        self,
+        window_s: float,
+        names: Optional[Iterable[str]] = None,
+        accel_weight: float = 0.5,
+        now: Optional[float] = None,
+    ) -> Dict[str, Growth]:
+        """Velocity/acceleration per skill over `window_s`; skills with too short a history are left out.
+
+        A series that does not reach back a full window is measured over the
+        span it has, if that is at least a quarter window.
+        """
+        t_now = self._tick(now)
+        window = max(1, int(window_s // self.resolution_s))
+        query = "SELECT name, first_t, last_t, last_downloads, last_stars, dt, d_downloads FROM series WHERE n > 1"
+        if names is None:
+            rows = self._db.execute(query).fetchall()
+        else:
+            wanted = list(dict.fromkeys(n for n in names if n))
+            rows = []
+            for i in range(0, len(wanted), QUERY_CHUNK):
+                chunk = wanted[i : i + QUERY_CHUNK]
+                rows += self._db.execute(f"{query} AND name IN ({','.join('?' * len(chunk))})", chunk).fetchall()
+        out: Dict[str, Growth] = {}
+        for name, first_t, last_t, last_downloads, last_stars, dt, d_dl in rows:
+            start = max(t_now - window, first_t)
+            if t_now - start < window / 4:
+                continue
+            times, values = self._tail(last_t, last_downloads, dt, d_dl, t_now - 2 * window)
+            v_now = _value_at(times, values, t_now)
+            v_start = _value_at(times, values, start)
+            if v_now is None or v_start is None:
+                continue
+            days = (t_now - start) * self.resolution_s / DAY_S
+            velocity = (v_now - v_start) / days
+            acceleration = 0.0
+            prev_start = t_now - 2 * window
+            if prev_start >= first_t:
+                v_prev = _value_at(times, values, prev_start)
+                if v_prev is not None:
+                    acceleration = velocity - (v_start - v_prev) / (window * self.resolution_s / DAY_S)
+            out[name] = Growth(last_downloads, last_stars, velocity, acceleration, velocity + accel_weight * acceleration)
+        return out
+
+    def rank(
+        self,
+        window_s: float,
+        top_n: int,
+        names: Optional[Iterable[str]] = None,
+        accel_weight: float = 0.5,
+        now: Optional[float] = None,
+    ) -> List[Tuple[str, Growth]]:
+        """Skills with the highest positive growth score, best first."""
+        scored = [(n, g) for n, g in self.growth(window_s, names, accel_weight, now).items() if g.score > 0]
+        scored.sort(key=lambda item: (item[1].score, item[1].downloads), reverse=True)
+        return scored[:top_n]
+
+    def count(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM series").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""On-disk enrichment cache for monitor.py
+
+- Keyed by (slug, version): a new version invalidates the entry
+- Stores the inspect payload, SKILL.md body and derived report fields
+- Mutable stats (downloads/stars) are only trusted for `stats_ttl_s`
+- Size-bounded: least recently used entries are evicted past `max_bytes`
+- A second table memoizes SKILL.md features by content key (skill_md.py);
+  only the newest `max_features` rows are kept
+"""
+
+import json
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS enrich_cache (
+    slug TEXT NOT NULL,
+    version TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    skill_md TEXT NOT NULL,
+    derived TEXT NOT NULL,
+    stats_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL,
+    PRIMARY KEY (slug, version)
+);
+CREATE INDEX IF NOT EXISTS enrich_cache_lru ON enrich_cache (last_access);
+CREATE TABLE IF NOT EXISTS md_features (
+    key TEXT PRIMARY KEY,
+    features TEXT NOT NULL,
+    created REAL NOT NULL
+);
+"""
+
+
+class CacheEntry(NamedTuple):
+    payload: Dict[str, Any]
+    skill_md: str
+    derived: Dict[str, Any]
+    stats_at: float
+
+    def stats_fresh(self, ttl_s: float, now: Optional[float] = None) -> bool:
+        return ((now or time.time()) - self.stats_at) < ttl_s
+
+
+class EnrichCache:
+    def __init__(self, path: Path, stats_ttl_s: float, max_bytes: int, max_features: int = 20000) -> None:
+        self.path = path
+        self.stats_ttl_s = stats_ttl_s
+        self.max_bytes = max_bytes
+        self.max_features = max_features
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path))
+        self._db.executescript(SCHEMA)
+
+    def get(self, slug: str, version: str) -> Optional[CacheEntry]:
+        row = self._db.execute(
+            "SELECT payload, skill_md, derived, stats_at FROM enrich_cache WHERE slug = ? AND version = ?",
+            (slug, version),
+        ).fetchone()
+        if row is None:
+            return None
+        with self._db:
+            self._db.execute(
+                "UPDATE enrich_cache SET last_access = ? WHERE slug = ? AND version = ?",
+                (time.time(), slug, version),
+            )
+        try:
+            return CacheEntry(json.loads(row[0]), row[1], json.loads(row[2]), row[3])
+        except ValueError:
+            return None
+
+    def put(self, slug: str, version: str, payload: Dict[str, Any], skill_md: str, derived: Dict[str, Any]) -> None:
+        payload_s = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        derived_s = json.dumps(derived, ensure_ascii=False, separators=(",", ":"))
+        size = len(payload_s) + len(skill_md) + len(derived_s)
+        now = time.time()
+        with self._db:
+            # Older versions of the same skill can never be hit again.
+            self._db.execute("DELETE FROM enrich_cache WHERE slug = ? AND version != ?", (slug, version))
+            self._db.execute(
+                "INSERT OR REPLACE INTO enrich_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (slug, version, payload_s, skill_md, derived_s, now, now, size),
+            )
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache fits max_bytes."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM enrich_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        dropped = 0
+        with self._db:
+            for slug, version, size in self._db.execute(
+                "SELECT slug, version, size FROM enrich_cache ORDER BY last_access"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM enrich_cache WHERE slug = ? AND version = ?", (slug, version))
+                total -= size
+                dropped += 1
+        return dropped
+
+    def get_features(self, key: str) -> Optional[Dict[str, Any]]:
+        row = self._db.execute("SELECT features FROM md_features WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def put_features(self, items: Iterable[Tuple[str, Dict[str, Any]]]) -> None:
+        """Store (key, features) pairs in one transaction, keeping the newest max_features."""
+        now = time.time()
+        rows = [(key, json.dumps(f, ensure_ascii=False, separators=(",", ":")), now) for key, f in items]
+        if not rows:
+            return
+        with self._db:
+            self._db.executemany("INSERT OR REPLACE INTO md_features VALUES (?, ?, ?)", rows)
+            self._db.execute(
+                "DELETE FROM md_features WHERE key IN "
+                "(SELECT key FROM md_features ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                (self.max_features,),
+            )
+
+    def close(self) -> None:
+        self._db.close()
@@ -4,94 +4,685 @@
 - Single-instance lock
 - Exponential backoff + jitter retries
 - 3-state daily report: success_with_new / success_no_new / fetch_failed
+- The report is built as a typed model (report_model.py, saved as
+  daily_report.json) and rendered from it (report_render.py: Telegram
+  Markdown via templates/CLAW_HUB_DAILY_TOP5_TEMPLATE.md, text, JSON, HTML)
 - Optional fallback source: fallback_skills.json
+- Concurrent Top-N enrichment under a shared token-bucket rate limit
+- On-disk enrichment cache keyed by (slug, version) (enrich_cache.py)
+- Report deadline: enrichment is collected in rank order until
+  CLAWHUB_REPORT_DEADLINE_S, late slugs show their explore line, and the
+  report is re-rendered once their calls finish; CLAWHUB_REPORT_READY_CMD
+  runs on the deadline report, so it can be sent without that wait
+- Known skills in an indexed SQLite store (state_store.py); the legacy
+  known_skills.json is imported once
+- Incremental explore: page size grows until the listing reaches skills we
+  already know (or the last high-water mark), bounded by EXPLORE_MAX_LIMIT
+- Streaming explore: lines are parsed as the CLI prints them; a timeout keeps
+  what arrived, and the request is stopped once known skills are reached
+- Pluggable ClawHub transport (clawhub_client.py): CLI via one persistent
+  worker process, or the HTTP API directly (CLAWHUB_TRANSPORT=http)
+- Record/replay of ClawHub calls for offline runs (clawhub_cassette.py,
+  CLAWHUB_CASSETTE_MODE=record|replay)
+- Adaptive timeouts learned from past explore/inspect latencies, with a
+  hedged second explore once the first is slower than p95 (retry_policy.py)
+- Rate-limit circuit breaker shared by all ClawHub calls (circuit_breaker.py):
+  while it is open the run goes straight to the fallback snapshot
+- Per-stage timing spans and per-CLI-call child wall/CPU/RSS, written as a
+  JSON summary and a node-exporter textfile after every run (run_metrics.py)
+- monitor.log is buffered JSON lines (run id, stage, duration fields) with
+  size-based rotation (run_log.py)
+- Report, fallback snapshot and side files are written atomically (temp +
+  fsync + rename) and only when their content changed (atomic_io.py)
+- Changes to known skills (version bumps, summary rewrites, download jumps,
+  removals) are detected in one pass (skill_diff.py), listed in the report
+  and appended to events.jsonl
+- Type tags and opportunity suggestions come from the declarative
+  skill_rules.json, compiled into a single matcher (skill_rules.py)
+- SKILL.md features (front matter, env vars, stack, install commands) are
+  extracted once per distinct body and memoized by content hash, in memory
+  and in the enrichment cache (skill_md.py)
+- Stages whose inputs hash the same as last time are skipped: an unchanged
+  listing against an unchanged state skips snapshot, diff and state save, and
+  unchanged report inputs keep the previous report (stage_hashes.py)
+- Downloads/stars are sampled into a delta-encoded time series per skill
+  (download_series.py); CLAWHUB_RANK_MODE=growth ranks by growth velocity
+  and acceleration instead of a single downloads reading
+- Every successful listing is appended to a delta-compressed snapshot history
+  with periodic checkpoints (snapshot_archive.py); past listings and the
+  diffs between dates can be rebuilt from it
+- `--watch`: long-running mode that keeps the store and ClawHub client warm
+  and polls on an interval adapted to the new-skill arrival rate
+  (poll_scheduler.py); reports are written as soon as new skills appear
 
 Report format is optimized for Telegram scanning.
 """
 
+import argparse
 import fcntl
 import json
-import random
+import os
+import queue
 import re
+import signal
 import subprocess
+import threading
 import time
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import astuple
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Container, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from atomic_io import atomic_write_json, atomic_write_text
+from circuit_breaker import RateLimitBreaker, is_rate_limited, parse_retry_after
+from clawhub_cassette import FaultInjection, RecordingTransport, ReplayTransport
+from clawhub_client import ClawHubTimeout, ClawHubTransport, ExploreStream, make_transport
+from download_series import DownloadSeries
+from enrich_cache import EnrichCache
+from poll_scheduler import AdaptiveInterval
+from report_model import (
+    FETCH_FAILED,
+    SUCCESS_NO_NEW,
+    SUCCESS_WITH_NEW,
+    ChangeGroup,
+    ChangeRow,
+    DailyReport,
+    GrowthRow,
+    SkillCard,
+)
+from report_render import ItemTemplate, load_item_template, render_json, render_telegram
+from retry_policy import LatencyHistory, RetryPolicy
+from run_log import RunLog
+from run_metrics import RunMetrics
+from skill_diff import (
+    DOWNLOADS_DELTA,
+    NEW,
+    REMOVED,
+    SUMMARY_CHANGED,
+    VERSION_BUMP,
+    Change,
+    append_events,
+    diff_listing,
+)
+from skill_md import STACK_ORDER, FeatureMemo
+from skill_rules import RuleFile, RuleSet
+from snapshot_archive import SnapshotArchive
+from stage_hashes import StageHashes, content_hash
+from state_store import StateStore
 
 WORK_DIR = Path("/home/administrator/.openclaw/workspace/memory/clawhub-monitor")
-STATE_FILE = WORK_DIR / "known_skills.json"
+STATE_DB = WORK_DIR / "known_skills.sqlite3"
+STATE_FILE = WORK_DIR / "known_skills.json"  # legacy, imported into STATE_DB once
 REPORT_FILE = WORK_DIR / "daily_report.md"
+# The report model behind REPORT_FILE; report_render.py re-renders it offline.
+REPORT_MODEL_FILE = WORK_DIR / "daily_report.json"
+# Top-N item layout (report_render.py): CLAWHUB_REPORT_TEMPLATE, else the
+# first existing of the deployed workspace's templates/ (WORK_DIR is
+# <workspace>/memory/clawhub-monitor), the one beside this script's workspace
+# and the repo checkout's. The built-in copy is used (with a warning) when missing.
+REPORT_TEMPLATE_NAME = "CLAW_HUB_DAILY_TOP5_TEMPLATE.md"
+
+
+def _default_report_template() -> Path:
+    here = Path(__file__).resolve().parent
+    candidates = [
+        WORK_DIR.parent.parent / "templates" / REPORT_TEMPLATE_NAME,
+        here.parent.parent / "templates" / REPORT_TEMPLATE_NAME,
+        here.parents[3] / "templates" / REPORT_TEMPLATE_NAME if len(here.parents) > 3 else None,
+    ]
+    return next((c for c in candidates if c and c.exists()), candidates[0])
+
+
+REPORT_TEMPLATE_FILE = Path(os.environ.get("CLAWHUB_REPORT_TEMPLATE") or _default_report_template())
 LOG_FILE = WORK_DIR / "monitor.log"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUPS = 5  # monitor.log.1 .. monitor.log.5
+LOG_BUFFER_RECORDS = 50  # warnings/errors and exit flush immediately
 LOCK_FILE = WORK_DIR / "monitor.lock"
 FALLBACK_FILE = WORK_DIR / "fallback_skills.json"
-
+# Only what normalize_fallback_list reads back; run-relative fields like
+# discovered_at would defeat the unchanged-content check. A partial listing
+# (stop-early prefix, timeout) is merged in front of the previous snapshot,
+# which keeps at most FALLBACK_MAX_RECORDS skills.
+FALLBACK_FIELDS = ("name", "downloads", "version", "summary", "raw")
+FALLBACK_MAX_RECORDS = 400
+# Changes to known skills (skill_diff.py) go to EVENTS_FILE and the report.
+# A downloads change counts when it is at least both the absolute and the
+# relative threshold.
+EVENTS_FILE = WORK_DIR / "events.jsonl"
+LAST_LISTING_KEY = "last_listing"
+DIFF_DOWNLOADS_MIN_DELTA = 100
+DIFF_DOWNLOADS_MIN_RATIO = 0.5
+REPORT_CHANGES_MAX = 10
+CHANGE_TITLES = (
+    (VERSION_BUMP, "版本更新"),
+    (SUMMARY_CHANGED, "简介变更"),
+    (DOWNLOADS_DELTA, "下载量跃升"),
+    (REMOVED, "不再列出"),
+)
+# Append-only history of every successful listing (snapshot_archive.py).
+# published_at/raw are left out: relative ages would make every poll a change.
+SNAPSHOT_ARCHIVE_FILE = WORK_DIR / "snapshots.bin"
+SNAPSHOT_CHECKPOINT_EVERY = 50
+ARCHIVE_FIELDS = ("name", "downloads", "version", "summary")
+ENRICH_CACHE_FILE = WORK_DIR / "enrich_cache.sqlite3"
+LATENCY_FILE = WORK_DIR / "latency_history.json"
+BREAKER_FILE = WORK_DIR / "rate_limit_breaker.json"
+METRICS_FILE = WORK_DIR / "run_metrics.json"
+# Point this into node-exporter's --collector.textfile.directory to scrape it.
+METRICS_PROM_FILE = Path(os.environ.get("CLAWHUB_METRICS_PROM", str(WORK_DIR / "clawhub_monitor.prom")))
+
+CLAWHUB_TRANSPORT = os.environ.get("CLAWHUB_TRANSPORT", "cli")
+# Record/replay: "record" appends every ClawHub call to the cassette, "replay"
+# serves the cassette instead of ClawHub. Replay latency is "none", "recorded"
+# or seconds; faults look like "timeout=0.2,rate_limit=0.1,delay=0.5,seed=1".
+CLAWHUB_CASSETTE_MODE = os.environ.get("CLAWHUB_CASSETTE_MODE", "")
+CLAWHUB_CASSETTE = Path(os.environ.get("CLAWHUB_CASSETTE", str(WORK_DIR / "clawhub_cassette.jsonl")))
+CLAWHUB_REPLAY_LATENCY = os.environ.get("CLAWHUB_REPLAY_LATENCY", "none")
+CLAWHUB_REPLAY_FAULTS = os.environ.get("CLAWHUB_REPLAY_FAULTS", "")
+# Static timeouts until LATENCY_MIN_SAMPLES calls have been observed; after
+# that attempts use p99 × RETRY_MARGIN (doubling per retry) within the bounds.
 RETRY_TIMEOUTS = [60, 120, 240]
-EXPLORE_LIMIT = 80
-
-# Enrichment: keep small to reduce rate-limit risk
+RETRY_MARGIN = 1.5
+RETRY_MIN_TIMEOUT_S = 10
+RETRY_MAX_TIMEOUT_S = 240
+RETRY_BUDGET_S = 300  # sum of all attempt timeouts for one explore page
+LATENCY_MIN_SAMPLES = 5
+# Start a second explore when the first is slower than the recorded p95
+# (but never sooner than EXPLORE_HEDGE_MIN_S).
+EXPLORE_HEDGE = True
+EXPLORE_HEDGE_MIN_S = 5
+# A hedged page gives up this long after the shared deadline even if a stream
+# never reports back, so the run stays bounded.
+EXPLORE_HEDGE_GRACE_S = 5
+# Cool-down after a rate limit when ClawHub gives no retry-after hint; doubles
+# with every consecutive trip, up to the max.
+RATE_LIMIT_COOLDOWN_S = 15 * 60
+RATE_LIMIT_MAX_COOLDOWN_S = 6 * 3600
+RATE_LIMITED = "rate limited"
+EXPLORE_LIMIT = 80  # used when incremental explore is off or there is no state
+
+# Incremental explore: start with EXPLORE_START_LIMIT newest skills and double
+# the page until EXPLORE_KNOWN_RUN consecutive known skills (or the stored
+# high-water mark) show up, never beyond EXPLORE_MAX_LIMIT.
+EXPLORE_INCREMENTAL = True
+EXPLORE_START_LIMIT = 20
+EXPLORE_MAX_LIMIT = 400
+EXPLORE_KNOWN_RUN = 5
+EXPLORE_HWM_KEY = "explore_hwm"
+# Kill the explore request as soon as the known-skill run is seen, but never
+# before EXPLORE_DIFF_WINDOW skills have been read: change detection
+# (skill_diff) compares that window of known skills against the store.
+EXPLORE_STOP_EARLY = True
+EXPLORE_DIFF_WINDOW = EXPLORE_START_LIMIT
+# Streamed rows are checked against the store this many at a time (one query
+# per batch); the high-water mark row checks its batch at once.
+EXPLORE_KNOWN_BATCH = 20
+
+# Watch mode (--watch): poll between the bounds, aiming for about
+# WATCH_TARGET_NEW_PER_POLL new skills per poll. WATCH_NOTIFY_CMD (shell, run
+# in WORK_DIR) is called after every report with new skills.
+WATCH_MIN_INTERVAL_S = 5 * 60
+WATCH_MAX_INTERVAL_S = 2 * 3600
+WATCH_TARGET_NEW_PER_POLL = 1.0
+WATCH_RATE_KEY = "watch_arrival_rate"
+WATCH_NOTIFY_CMD = os.environ.get("CLAWHUB_WATCH_NOTIFY_CMD", "")
+# Covers notify.py waiting out a few Telegram 429s.
+NOTIFY_CMD_TIMEOUT_S = 600
+
+# Enrichment: inspect calls for all Top-N slugs run concurrently, but every
+# call takes a token from one shared bucket to stay under ClawHub rate limits.
 ENRICH_TOP_N = 5
+ENRICH_WORKERS = 6
 INSPECT_TIMEOUT_S = 40
-INSPECT_SLEEP_S = 1.1
+INSPECT_RPS = 2.0
+INSPECT_BURST = 4
+# Cached SKILL.md/derived fields live until the version changes; downloads and
+# stars are re-fetched (inspect --json only) once older than the TTL.
+ENRICH_STATS_TTL_S = 6 * 3600
+ENRICH_CACHE_MAX_BYTES = 32 * 1024 * 1024
+# The report is rendered at most REPORT_DEADLINE_S after enrichment starts
+# (0: wait for every slug). Slugs not enriched by then are shown with their
+# explore line; their inspect calls keep running and land in the cache, after
+# which the report is re-rendered complete.
+REPORT_DEADLINE_S = float(os.environ.get("CLAWHUB_REPORT_DEADLINE_S", "30"))
+# One-shot runs call REPORT_READY_CMD (shell, run in WORK_DIR) as soon as the
+# deadline report is written, before waiting for the late inspect calls;
+# run_and_notify.sh sends the report to Telegram from it.
+REPORT_READY_CMD = os.environ.get("CLAWHUB_REPORT_READY_CMD", "")
+# Type-tag/opportunity rules (skill_rules.py); reloaded on change in watch mode.
+RULES_FILE = Path(os.environ.get("CLAWHUB_RULES_FILE", str(Path(__file__).resolve().parent / "skill_rules.json")))
+
+# Downloads/stars history (download_series.py), sampled from every listing
+# and enrichment. RANK_MODE "growth" orders the Top-N by growth score
+# (velocity + GROWTH_ACCEL_WEIGHT * acceleration over GROWTH_WINDOW_S) and
+# adds a fastest-growing section drawn from all tracked skills.
+SERIES_DB = WORK_DIR / "download_series.sqlite3"
+RANK_MODE = os.environ.get("CLAWHUB_RANK_MODE", "downloads")
+GROWTH_WINDOW_S = 3 * 86400
+GROWTH_ACCEL_WEIGHT = 0.5
+
+
+_RUN_LOG: Optional[RunLog] = None
+
+
+def get_run_log() -> RunLog:
+    global _RUN_LOG
+    if _RUN_LOG is None or _RUN_LOG.path != LOG_FILE:
+        if _RUN_LOG is not None:
+            _RUN_LOG.close()
+        _RUN_LOG = RunLog(LOG_FILE, LOG_MAX_BYTES, LOG_BACKUPS, LOG_BUFFER_RECORDS, stage=lambda: METRICS.current_stage())
+        _RUN_LOG.run_id = METRICS.run_id
+    return _RUN_LOG
+
+
+def log(msg: str, level: Optional[str] = None, console: bool = True, **fields: Any) -> None:
+    """Log one message (stdout + monitor.log); extra keyword fields go into the JSON line."""
+    if level is None:
+        level = "error" if msg.startswith("ERROR") else "warning" if msg.startswith("Warning") else "info"
+    get_run_log().log(msg, level, console, **fields)
+
+
+def _log_span(span: Dict[str, Any]) -> None:
+    log(
+        f"{span['name']} {span['status']} in {span['wall_s']:.3f}s",
+        level="debug",
+        console=False,
+        stage=span["name"],
+        parent=span["parent"],
+        duration_s=span["wall_s"],
+        cpu_s=span["cpu_s"],
+    )
 
 
-def log(msg: str) -> None:
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_line = f"[{timestamp}] {msg}"
-    print(log_line)
-    WORK_DIR.mkdir(parents=True, exist_ok=True)
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_line + "\n")
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/s refill, up to `burst` stored."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.capacity = float(max(1, burst))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_s = (1 - self._tokens) / self.rate
+            time.sleep(wait_s)
+
+
+INSPECT_LIMITER = TokenBucket(INSPECT_RPS, INSPECT_BURST)
+_ENRICH_CACHE: Optional[EnrichCache] = None
+_SERIES: Optional[DownloadSeries] = None
+_RULES: Optional[RuleFile] = None
+_FEATURES: Optional[FeatureMemo] = None
+# Enrichment still in flight after a report deadline: (slug, version, inspect json future, SKILL.md future or cached body).
+_DEFERRED_ENRICHMENT: List[Tuple[str, str, Future, Any]] = []
+_RETRY_POLICY: Optional[RetryPolicy] = None
+_BREAKER: Optional[RateLimitBreaker] = None
+# Warn once (per watch process) that REPORT_TEMPLATE_FILE is missing.
+_TEMPLATE_MISSING_WARNED = False
+# (min, max) poll interval while running as --watch; None for cron runs.
+_WATCH_BOUNDS: Optional[Tuple[float, float]] = None
+
+
+def build_transport() -> ClawHubTransport:
+    if CLAWHUB_CASSETTE_MODE == "replay":
+        return ReplayTransport(CLAWHUB_CASSETTE, CLAWHUB_REPLAY_LATENCY, FaultInjection.parse(CLAWHUB_REPLAY_FAULTS))
+    transport = make_transport(CLAWHUB_TRANSPORT, WORK_DIR)
+    if CLAWHUB_CASSETTE_MODE == "record":
+        return RecordingTransport(transport, CLAWHUB_CASSETTE)
+    return transport
+
+
+CLAWHUB = build_transport()
+METRICS = RunMetrics()
+METRICS.on_span = _log_span
 
 
-def warmup_npx() -> None:
-    """Best-effort warmup to reduce npx first-call latency."""
+def _observe_clawhub_call(args: List[str], usage: Dict[str, Any]) -> None:
+    op = "inspect_file" if "--file" in args else (args[0] if args else "")
+    METRICS.record_call(op, args, usage)
+
+
+CLAWHUB.set_observer(_observe_clawhub_call)
+
+
+def warmup_clawhub() -> None:
+    """Best-effort warmup: start the CLI worker / resolve the transport once."""
     try:
-        subprocess.run(
-            ["npx", "clawhub", "--help"],
-            capture_output=True,
-            text=True,
-            timeout=20,
-            cwd=str(WORK_DIR),
-        )
-        log("npx warmup completed")
+        WORK_DIR.mkdir(parents=True, exist_ok=True)
+        with METRICS.span("warmup", transport=CLAWHUB.name):
+            resolved = CLAWHUB.warmup()
+        log(f"clawhub warmup completed ({resolved})")
     except Exception as e:
-        log(f"npx warmup skipped: {e}")
+        log(f"clawhub warmup skipped: {e}")
+
+
+def get_retry_policy() -> RetryPolicy:
+    global _RETRY_POLICY
+    if _RETRY_POLICY is None:
+        _RETRY_POLICY = RetryPolicy(
+            LatencyHistory(LATENCY_FILE),
+            RETRY_TIMEOUTS,
+            margin=RETRY_MARGIN,
+            min_timeout_s=RETRY_MIN_TIMEOUT_S,
+            max_timeout_s=RETRY_MAX_TIMEOUT_S,
+            budget_s=RETRY_BUDGET_S,
+            min_samples=LATENCY_MIN_SAMPLES,
+        )
+    return _RETRY_POLICY
 
 
-def fetch_skills_primary() -> Tuple[Optional[str], str, Optional[str]]:
-    """Fetch skills from clawhub explore with retries."""
-    log("Fetching skills from clawhub explore...")
-    warmup_npx()
+def get_breaker() -> RateLimitBreaker:
+    global _BREAKER
+    if _BREAKER is None:
+        _BREAKER = RateLimitBreaker(BREAKER_FILE, RATE_LIMIT_COOLDOWN_S, RATE_LIMIT_MAX_COOLDOWN_S)
+    return _BREAKER
 
-    for attempt, timeout_seconds in enumerate(RETRY_TIMEOUTS, start=1):
-        log(f"Attempt {attempt}/{len(RETRY_TIMEOUTS)} with {timeout_seconds}s timeout...")
-        try:
-            result = subprocess.run(
-                ["npx", "clawhub", "explore", "--limit", str(EXPLORE_LIMIT)],
-                capture_output=True,
-                text=True,
-                timeout=timeout_seconds,
-                cwd=str(WORK_DIR),
-            )
 
-            if result.returncode == 0 and result.stdout.strip():
-                log("Successfully fetched skills from primary source")
-                return result.stdout, "primary", None
+def _breaker_note() -> str:
+    status = get_breaker().status()
+    until = datetime.fromtimestamp(status["until"]).strftime("%Y-%m-%d %H:%M")
+    return f"{RATE_LIMITED}: breaker {status['state']} until {until} ({status['reason']})"
 
-            err = (result.stderr or result.stdout or "unknown error").strip()[:260]
-            log(f"clawhub error (attempt {attempt}): {err}")
-        except subprocess.TimeoutExpired:
-            log(f"Timeout on attempt {attempt}")
+
+def _check_rate_limit(what: str, error: Optional[str], status: int = 0, retry_after: Optional[float] = None) -> bool:
+    """Feed one ClawHub outcome to the breaker; True if it was a rate limit."""
+    breaker = get_breaker()
+    if is_rate_limited(error, status):
+        cooldown = breaker.record_rate_limit(retry_after or parse_retry_after(error), f"{what}: {error or status}")
+        log(f"ClawHub rate limit on {what}; breaker open for {cooldown:.0f}s")
+        return True
+    if error:
+        breaker.release()
+    else:
+        breaker.record_success()
+    return False
+
+
+def _is_rate_limit_banner(line: str) -> bool:
+    """A CLI throttle message on stdout. Listing rows ("slug vX.Y.Z …") never
+    count, even when a summary mentions rate limits."""
+    s = line.strip()
+    return bool(s) and not EXPLORE_ROW_RE.match(s) and is_rate_limited(s)
+
+
+def save_latency_history() -> None:
+    if _RETRY_POLICY is None:
+        return
+    try:
+        _RETRY_POLICY.history.save()
+    except Exception as e:
+        log(f"Warning: Could not save latency history: {e}")
+
+
+def _stream_explore_page(
+    limit: int,
+    timeout: float,
+    store: Optional[StateStore],
+    hwm_name: str,
+    on_stream: Optional[Callable[[ExploreStream], None]] = None,
+    cancelled: Optional[threading.Event] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str], bool, bool]:
+    """Stream one explore page. Returns (parsed, error, timed_out, reached_known).
+
+    Records are parsed as lines arrive. With a store, the page counts as done
+    once it shows the high-water mark or EXPLORE_KNOWN_RUN consecutive known
+    skills; with EXPLORE_STOP_EARLY the request is then cancelled as soon as
+    at least EXPLORE_DIFF_WINDOW skills were read.
+    `on_stream` receives the open stream so another thread can close it; once
+    `cancelled` is set, the outcome is not fed to the rate-limit breaker.
+    """
+    stream = CLAWHUB.explore_stream(limit, timeout=timeout)
+    if on_stream is not None:
+        on_stream(stream)
+    parsed: List[Dict[str, Any]] = []
+    pending: List[str] = []  # names not yet checked against the store
+    run = 0
+    reached = False
+    banner: List[str] = []
+    parse_s = lookup_s = 0.0
+    now = datetime.now()
+
+    def until_banner(items: Iterable[Any]) -> Iterator[Any]:
+        # The CLI prints a rate-limit banner instead of (or mid-way through) the listing.
+        for item in items:
+            if isinstance(item, str) and _is_rate_limit_banner(item):
+                banner.append(item.strip())
+                return
+            yield item
+
+    def check_pending() -> bool:
+        """Look up the pending names in one query; True once the page may stop."""
+        nonlocal run, reached, lookup_s
+        t0 = time.perf_counter()
+        known = store.known_names(pending)
+        lookup_s += time.perf_counter() - t0
+        for name in pending:
+            run = run + 1 if name in known else 0
+            if (hwm_name and name == hwm_name) or run >= EXPLORE_KNOWN_RUN:
+                reached = True
+        pending.clear()
+        return reached and EXPLORE_STOP_EARLY and len(parsed) >= EXPLORE_DIFF_WINDOW
+
+    try:
+        for item in until_banner(stream):
+            t0 = time.perf_counter()
+            skill = _parse_listing_item(item, now)
+            parse_s += time.perf_counter() - t0
+            if skill is None:
+                continue
+            parsed.append(skill)
+            if store is None:
+                continue
+            if reached:  # nothing left to look up; only the diff window to fill
+                if EXPLORE_STOP_EARLY and len(parsed) >= EXPLORE_DIFF_WINDOW:
+                    break
+                continue
+            pending.append(skill["name"])
+            if len(pending) >= EXPLORE_KNOWN_BATCH or (hwm_name and pending[-1] == hwm_name):
+                if check_pending():
+                    break
+        if pending:
+            check_pending()
+    finally:
+        stream.close()
+        METRICS.add("parse", parse_s, limit=limit, skills=len(parsed))
+        if store is not None:
+            METRICS.add("state_lookup", lookup_s, skills=len(parsed))
+    if cancelled is not None and cancelled.is_set():
+        return parsed, "explore cancelled", False, False
+    error = banner[0] if banner else stream.error
+    if not error and is_rate_limited(stream.stderr):
+        # Some CLI versions warn on stderr and still exit 0.
+        error = stream.stderr.strip()[:260]
+    if _check_rate_limit("explore", error, stream.status, stream.retry_after):
+        return parsed, f"{RATE_LIMITED}: {error or stream.status}", False, False
+    return parsed, stream.error, stream.timed_out, reached
+
+
+def _hedged_explore_page(
+    limit: int, timeout: float, store: Optional[StateStore], hwm_name: str
+) -> Tuple[List[Dict[str, Any]], Optional[str], bool, bool]:
+    """_stream_explore_page, plus a second request once the first is slower than p95.
+
+    Both requests share the original deadline; the first usable page wins and
+    the other request is cancelled. A request that has not reported back
+    EXPLORE_HEDGE_GRACE_S after the deadline counts as timed out.
+    """
+    hedge_after = get_retry_policy().hedge_after("explore")
+    if hedge_after is not None:
+        hedge_after = max(hedge_after, EXPLORE_HEDGE_MIN_S)
+    if not EXPLORE_HEDGE or hedge_after is None or hedge_after >= timeout:
+        return _stream_explore_page(limit, timeout, store, hwm_name)
+
+    results: "queue.Queue[Tuple[int, Any]]" = queue.Queue()
+    streams: List[ExploreStream] = []
+    lock = threading.Lock()
+    decided = threading.Event()
+
+    def track(stream: ExploreStream) -> None:
+        with lock:
+            streams.append(stream)
+        if decided.is_set():
+            stream.close()  # opened after a winner was picked
+
+    def run(n: int, page_timeout: float) -> None:
+        try:
+            results.put((n, _stream_explore_page(limit, page_timeout, store, hwm_name, track, decided)))
         except Exception as e:
+            results.put((n, ([], f"explore error: {e}", False, False)))
+
+    started = time.monotonic()
+    threading.Thread(target=run, args=(1, timeout), daemon=True).start()
+    try:
+        return results.get(timeout=hedge_after)[1]
+    except queue.Empty:
+        pass
+
+    remaining = max(1.0, timeout - (time.monotonic() - started))
+    log(f"Explore slower than p95 ({hedge_after}s); hedging with a second request ({remaining:.0f}s left)")
+    threading.Thread(target=run, args=(2, remaining), daemon=True).start()
+    pending = 2
+    fallback: Optional[Tuple[List[Dict[str, Any]], Optional[str], bool, bool]] = None
+    while pending:
+        wait_s = max(0.0, timeout - (time.monotonic() - started)) + EXPLORE_HEDGE_GRACE_S
+        try:
+            n, result = results.get(timeout=wait_s)
+        except queue.Empty:
+            # A stream that never finished: give up on both with what arrived.
+            log(f"Hedged explore still running {EXPLORE_HEDGE_GRACE_S}s past its {timeout}s deadline; giving up")
+            parsed = fallback[0] if fallback else []
+            result = (parsed, "explore stream timed out", True, False)
+            break
+        pending -= 1
+        parsed, error, timed_out, reached = result
+        if parsed and (reached or not (error or timed_out)):
+            if n == 2:
+                log("Hedged explore request answered first")
+            break
+        if fallback is None or len(parsed) > len(fallback[0]):
+            fallback = result
+        result = fallback
+    decided.set()
+    with lock:
+        for stream in streams:
+            stream.close()
+    return result
+
+
+def _explore_with_retries(
+    limit: int, store: Optional[StateStore] = None, hwm_name: str = ""
+) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
+    """One explore page with retries. Returns (parsed, error, reached_known).
+
+    When every attempt fails but some attempt timed out after streaming part of
+    the listing, the largest partial listing is returned with a "partial" error.
+    """
+    policy = get_retry_policy()
+    timeouts = policy.timeouts("explore")
+    partial: List[Dict[str, Any]] = []
+    for attempt, timeout_seconds in enumerate(timeouts, start=1):
+        if not get_breaker().allow():
+            # Retrying into a rate limit only burns quota.
+            log(f"Skipping explore attempt {attempt}: {_breaker_note()}")
+            return partial, _breaker_note(), False
+        log(f"Attempt {attempt}/{len(timeouts)} (limit={limit}) with {timeout_seconds}s timeout...")
+        started = time.monotonic()
+        try:
+            parsed, error, timed_out, reached = _hedged_explore_page(limit, timeout_seconds, store, hwm_name)
+            # Timeouts are recorded at their (lower-bound) duration so a slow
+            # ClawHub raises the next run's timeouts instead of being ignored.
+            if parsed or timed_out:
+                policy.history.record("explore", time.monotonic() - started)
+            if parsed and (reached or not (error or timed_out)):
+                return parsed, None, reached
+            if error and error.startswith(RATE_LIMITED):
+                log(f"clawhub {error}; not retrying")
+                return max(parsed, partial, key=len), error, False
+            if timed_out:
+                log(f"Timeout on attempt {attempt} after {len(parsed)} streamed skills")
+                if len(parsed) > len(partial):
+                    partial = parsed
+            else:
+                log(f"clawhub error (attempt {attempt}): {error or 'empty listing'}")
+        except Exception as e:
+            get_breaker().release()
             log(f"Error on attempt {attempt}: {e}")
 
-        if attempt < len(RETRY_TIMEOUTS):
-            sleep_s = round((2 ** (attempt - 1)) * random.uniform(0.6, 1.4), 2)
+        if attempt < len(timeouts):
+            sleep_s = policy.backoff("explore", attempt)
             log(f"Backoff sleeping {sleep_s}s before retry")
             time.sleep(sleep_s)
 
-    return None, "primary", "all primary retries failed"
+    if partial:
+        return partial, f"partial listing ({len(partial)} skills before timeout)", False
+    return [], "all primary retries failed", False
+
+
+def fetch_skills_primary(store: Optional[StateStore] = None) -> Tuple[List[Dict[str, Any]], str, Optional[str]]:
+    """Fetch and parse skills from clawhub explore with retries.
+
+    With a state store and EXPLORE_INCREMENTAL, pages grow from
+    EXPLORE_START_LIMIT until already-known skills are reached.
+    Returns (parsed, source, error); a partial listing comes with an error note.
+    """
+    if get_breaker().blocked():
+        log(f"Skipping clawhub explore: {_breaker_note()}")
+        return [], "primary", _breaker_note()
+    log(f"Fetching skills from clawhub explore via {CLAWHUB.name} transport...")
+    warmup_clawhub()
+
+    if not (EXPLORE_INCREMENTAL and store is not None and store.count()):
+        parsed, err, _ = _explore_with_retries(EXPLORE_LIMIT)
+        if parsed:
+            log(f"Fetched {len(parsed)} skills from primary source" + (f" ({err})" if err else ""))
+        return parsed, "primary", err
+
+    hwm = json.loads(store.get_meta(EXPLORE_HWM_KEY) or "{}")
+    hwm_name = hwm.get("name") or ""
+    limit = EXPLORE_START_LIMIT
+    best: List[Dict[str, Any]] = []
+    best_err: Optional[str] = None
+    while True:
+        parsed, err, reached = _explore_with_retries(limit, store, hwm_name)
+        if not parsed:
+            if not best:
+                return [], "primary", err
+            log(f"Explore page limit={limit} failed; keeping the previous page")
+            break
+        best, best_err = parsed, err
+        if reached:
+            log(f"Incremental explore reached known skills at limit={limit}")
+            break
+        if err:
+            log(f"Incremental explore stopped at limit={limit}: {err}")
+            break
+        if limit >= EXPLORE_MAX_LIMIT or len(parsed) < limit:
+            log(f"Incremental explore stopped at limit={limit} without reaching known skills")
+            break
+        limit = min(limit * 2, EXPLORE_MAX_LIMIT)
+
+    log(f"Fetched {len(best)} skills from primary source" + (f" ({best_err})" if best_err else ""))
+    return best, "primary", best_err
+
+
+def save_explore_hwm(store: StateStore, parsed: List[Dict[str, Any]]) -> None:
+    """Remember the newest listed skill so the next incremental explore can stop there."""
+    if parsed and parsed[0].get("name"):
+        store.set_meta(EXPLORE_HWM_KEY, json.dumps({"name": parsed[0]["name"], "seen_at": datetime.now().isoformat()}))
 
 
 def fetch_skills_fallback() -> Tuple[Optional[list], str, Optional[str]]:
@@ -110,71 +701,136 @@ def fetch_skills_fallback() -> Tuple[Optional[list], str, Optional[str]]:
         return None, "fallback", f"fallback parse error: {e}"
 
 
-def _extract_downloads(line: str) -> int:
-    """Best-effort extraction of downloads count from a single explore line.
+# One explore line: "[rank.] slug  vX.Y.Z  <age>  <summary…>", columns
+# separated by whitespace. Every column after the slug is optional.
+EXPLORE_LINE_RE = re.compile(
+    r"""
+    ^(?:\d+[.)]\s+)?                              # optional rank prefix
+    (?P<slug>[^\s]+)
+    (?:\s+v(?P<version>\d+(?:\.\d+)+[\w.+-]*))?
+    (?:\s+(?P<age>just\s+now|(?P<age_n>\d+)\s*(?P<age_unit>mo|[smhdwy])\w*\s+ago))?
+    (?:\s+(?P<rest>.*?))?\s*$
+    """,
+    re.X,
+)
+# A line that is certainly a listing row: slug followed by a version column.
+EXPLORE_ROW_RE = re.compile(r"^(?:\d+[.)]\s+)?\S+\s+v\d+(?:\.\d+)+")
+# Downloads only count when labelled as such ("12,345 downloads", "1.2k dl").
+# Never fall back to "largest number in the line": that reads version strings
+# and summary figures as downloads.
+DOWNLOADS_RE = re.compile(r"(?P<n>\d[\d,]*(?:\.\d+)?)\s*(?P<suffix>[kKmM])?\s*(?:downloads?|dls?)\b", re.I)
+AGE_UNITS = {
+    "s": timedelta(seconds=1),
+    "m": timedelta(minutes=1),
+    "h": timedelta(hours=1),
+    "d": timedelta(days=1),
+    "w": timedelta(weeks=1),
+    "mo": timedelta(days=30),
+    "y": timedelta(days=365),
+}
+SKIP_LINE_PREFIXES = ("-", "name", "fetching latest")
+
+
+def _parse_downloads(text: str) -> Tuple[int, str]:
+    """Return (downloads, text without the downloads column)."""
+    m = DOWNLOADS_RE.search(text)
+    if not m:
+        return 0, text
+    value = float(m.group("n").replace(",", ""))
+    suffix = (m.group("suffix") or "").lower()
+    value *= 1000 if suffix == "k" else 1_000_000 if suffix == "m" else 1
+    rest = (text[: m.start()] + text[m.end() :]).strip(" |·•")
+    return int(value), rest
 
-    ClawHub CLI output can change; be permissive and never throw.
+
+def _parse_explore_line(line: str, now: Optional[datetime] = None) -> Optional[Dict[str, Any]]:
+    """Split one clawhub explore line into typed columns; None for banners/headers.
+
+    Columns: slug, version, relative age (→ absolute published_at), summary and
+    an explicitly labelled downloads count (0 when the listing has none).
     """
+    s = line.strip()
+    if not s:
+        return None
+    low = s.lower()
+    if low.startswith(SKIP_LINE_PREFIXES) or _is_rate_limit_banner(s):
+        # the rate-limit banner is ignored; caller will handle empty parse
+        return None
+
+    m = EXPLORE_LINE_RE.match(s)
+    if not m or not (m.group("version") or m.group("age") or m.group("rest")):
+        return None
+
+    now = now or datetime.now()
+    published_at = ""
+    if m.group("age"):
+        if m.group("age_n"):
+            unit = AGE_UNITS.get(m.group("age_unit").lower(), timedelta(0))
+            published_at = (now - int(m.group("age_n")) * unit).isoformat(timespec="seconds")
+        else:
+            published_at = now.isoformat(timespec="seconds")
 
-    # Prefer patterns like "12,345 downloads" (require at least one digit)
-    m = re.search(r"(\d[\d,]*)\s*downloads?", line, re.IGNORECASE)
-    if m:
-        raw = (m.group(1) or "").replace(",", "").strip()
-        if raw.isdigit():
-            return int(raw)
+    downloads, summary = _parse_downloads(m.group("rest") or "")
+    return {
+        "name": m.group("slug"),
+        "downloads": downloads,
+        "version": m.group("version") or "",
+        "published_at": published_at,
+        "summary": summary,
+        "raw": s,
+        "discovered_at": now.isoformat(),
+    }
 
-    # Handle compact suffixes like 1.2k / 3M downloads
-    m2 = re.search(r"(\d+(?:\.\d+)?)\s*([kKmM])\s*downloads?", line)
-    if m2:
-        try:
-            base = float(m2.group(1))
-            mult = 1000 if m2.group(2).lower() == "k" else 1_000_000
-            return int(base * mult)
-        except Exception:
-            return 0
 
-    # Fallback: choose the largest standalone integer in line
-    nums = re.findall(r"\b\d[\d,]*\b", line)
-    if not nums:
-        return 0
-    try:
-        values = [int(n.replace(",", "")) for n in nums]
-        return max(values) if values else 0
-    except Exception:
-        return 0
+def _normalize_explore_item(item: Any) -> Optional[Dict[str, Any]]:
+    """Normalize one structured explore item (http transport) into a skill record."""
+    if not isinstance(item, dict):
+        return None
+    name = str(item.get("slug") or item.get("name") or "").strip()
+    if not name:
+        return None
+    stats = item.get("stats") or {}
+    version = (item.get("latestVersion") or {}).get("version") or item.get("version") or ""
+    summary = item.get("summary") or ""
+    raw = "  ".join(x for x in (name, f"v{version}" if version else "", summary) if x)
+    published = item.get("createdAt") or item.get("updatedAt") or ""
+    if isinstance(published, (int, float)):
+        published = datetime.fromtimestamp(published / 1000 if published > 1e11 else published).isoformat(timespec="seconds")
+    return {
+        "name": name,
+        "downloads": int(stats.get("downloads") or item.get("downloads") or 0),
+        "stars": int(stats.get("stars") or item.get("stars") or 0),
+        "version": version,
+        "published_at": str(published),
+        "summary": summary,
+        "raw": raw,
+        "discovered_at": datetime.now().isoformat(),
+    }
+
+
+def _parse_listing_item(item: Any, now: datetime) -> Optional[Dict[str, Any]]:
+    return _parse_explore_line(item, now) if isinstance(item, str) else _normalize_explore_item(item)
+
+
+def iter_listing(items: Iterable[Any]) -> Iterator[Dict[str, Any]]:
+    """Yield skill records from explore output as it arrives (text lines or JSON items)."""
+    now = datetime.now()
+    for item in items:
+        skill = _parse_listing_item(item, now)
+        if skill is not None:
+            yield skill
 
 
 def parse_explore_output(output: str) -> List[Dict[str, Any]]:
     """Parse clawhub explore text output."""
-    skills: List[Dict[str, Any]] = []
     if not output:
-        return skills
+        return []
+    return list(iter_listing(output.strip().split("\n")))
 
-    lines = output.strip().split("\n")
-    for line in lines:
-        s = line.strip()
-        if not s:
-            continue
-        if s.startswith("-") or s.lower().startswith("name") or "fetching latest" in s.lower():
-            continue
-        if "rate limit" in s.lower():
-            # ignore the banner line; caller will handle empty parse
-            continue
 
-        parts = s.split()
-        if len(parts) < 2:
-            continue
-
-        name = parts[0] if not parts[0].replace(".", "").isdigit() else parts[1]
-        skills.append(
-            {
-                "name": name,
-                "downloads": _extract_downloads(s),
-                "raw": s,
-                "discovered_at": datetime.now().isoformat(),
-            }
-        )
-    return skills
+def normalize_explore_items(items: list) -> List[Dict[str, Any]]:
+    """Normalize structured explore items (http transport) into skill records."""
+    return list(iter_listing(item for item in items if isinstance(item, dict)))
 
 
 def normalize_fallback_list(items: list) -> List[Dict[str, Any]]:
@@ -189,6 +845,8 @@ def normalize_fallback_list(items: list) -> List[Dict[str, Any]]:
             {
                 "name": name,
                 "downloads": int(item.get("downloads", 0) or 0),
+                "version": str(item.get("version") or ""),
+                "summary": str(item.get("summary") or ""),
                 "raw": item.get("raw", f"{name} | downloads={item.get('downloads', 0)}"),
                 "discovered_at": datetime.now().isoformat(),
             }
@@ -196,246 +854,207 @@ def normalize_fallback_list(items: list) -> List[Dict[str, Any]]:
     return out
 
 
-def load_known_skills() -> Dict[str, Any]:
-    if not STATE_FILE.exists():
-        return {}
+def open_state_store() -> StateStore:
+    """Open the SQLite state, importing the legacy known_skills.json on first use.
+
+    Errors propagate: an unreadable state must not make every skill look new.
+    """
+    store = StateStore(STATE_DB)
     try:
-        return json.loads(STATE_FILE.read_text(encoding="utf-8"))
+        imported = store.import_json(STATE_FILE)
     except Exception as e:
-        log(f"Warning: Could not load state: {e}")
-        return {}
-
+        store.close()
+        raise RuntimeError(f"legacy state import failed: {e}") from e
+    if imported:
+        log(f"Imported {imported} skills from {STATE_FILE.name}")
+    return store
 
-def save_known_skills(skills_dict: Dict[str, Any]) -> None:
-    WORK_DIR.mkdir(parents=True, exist_ok=True)
-    STATE_FILE.write_text(json.dumps(skills_dict, indent=2, ensure_ascii=False), encoding="utf-8")
 
+def save_fallback_snapshot(parsed: List[Dict[str, Any]], complete: bool = True) -> bool:
+    """Write a best-effort fallback snapshot whenever we have a good parse.
 
-def save_fallback_snapshot(parsed: List[Dict[str, Any]]) -> None:
-    """Write a best-effort fallback snapshot whenever we have a good parse."""
+    A partial listing only replaces the records it lists; the rest of the
+    previous snapshot is kept behind it. Returns False when the snapshot was
+    unchanged (or could not be written).
+    """
+    snapshot = [{k: s[k] for k in FALLBACK_FIELDS if k in s} for s in parsed]
     try:
-        FALLBACK_FILE.write_text(json.dumps(parsed, indent=2, ensure_ascii=False), encoding="utf-8")
+        if not complete and FALLBACK_FILE.exists():
+            previous = json.loads(FALLBACK_FILE.read_text(encoding="utf-8"))
+            listed = {s.get("name") for s in snapshot}
+            if isinstance(previous, list):
+                snapshot += [p for p in previous if isinstance(p, dict) and p.get("name") not in listed]
+        snapshot = snapshot[:FALLBACK_MAX_RECORDS]
+        return atomic_write_json(FALLBACK_FILE, snapshot)
     except Exception as e:
         log(f"Warning: Could not write fallback snapshot: {e}")
+        return False
 
 
-def find_new_skills(current_skills: List[Dict[str, Any]], known_skills: Dict[str, Any]) -> List[Dict[str, Any]]:
-    return [s for s in current_skills if s.get("name") and s["name"] not in known_skills]
+def archive_snapshot(parsed: List[Dict[str, Any]], complete: bool) -> None:
+    """Append the listing to the snapshot history (best effort, like the fallback)."""
+    records = [{k: s[k] for k in ARCHIVE_FIELDS if k in s} for s in parsed]
+    try:
+        if SnapshotArchive(SNAPSHOT_ARCHIVE_FILE, SNAPSHOT_CHECKPOINT_EVERY).append(records, complete):
+            log(f"Snapshot archived ({'full' if complete else 'partial'} listing)", console=False)
+    except Exception as e:
+        log(f"Warning: Could not archive snapshot: {e}")
 
 
-def _strip_cli_prefix_lines(text: str) -> str:
-    lines = []
-    for ln in (text or "").splitlines():
-        if ln.strip().startswith("- Fetching"):
-            continue
-        if ln.strip().startswith("- Downloading"):
-            continue
-        lines.append(ln)
-    return "\n".join(lines).strip()
+def diff_against_state(store: StateStore, parsed: List[Dict[str, Any]]) -> List[Change]:
+    """All changes of this listing vs. the stored records and the previous listing.
+
+    Only listed skills can change: incremental explore lists at least the
+    EXPLORE_DIFF_WINDOW newest skills, so changes further down are not seen.
+    """
+    stored = store.records(s.get("name") for s in parsed)
+    previous = json.loads(store.get_meta(LAST_LISTING_KEY) or "[]")
+    return diff_listing(parsed, stored, previous, DIFF_DOWNLOADS_MIN_DELTA, DIFF_DOWNLOADS_MIN_RATIO)
+
+
+def _last_listing(store: StateStore, parsed: List[Dict[str, Any]], changes: List[Change], complete: bool) -> List[str]:
+    """Names for LAST_LISTING_KEY: a partial listing is merged in front of the
+    previous one, minus the skills this diff reported as removed."""
+    names = [s["name"] for s in parsed if s.get("name")]
+    if complete:
+        return names
+    listed = set(names)
+    listed.update(c.name for c in changes if c.kind == REMOVED)
+    previous = json.loads(store.get_meta(LAST_LISTING_KEY) or "[]")
+    return (names + [n for n in previous if n not in listed])[:FALLBACK_MAX_RECORDS]
+
+
+def record_events(changes: List[Change]) -> None:
+    try:
+        append_events(EVENTS_FILE, changes, datetime.now().isoformat(timespec="seconds"), METRICS.run_id)
+    except Exception as e:
+        log(f"Warning: Could not append change events: {e}")
+
+
+def _listing_digest(parsed: List[Dict[str, Any]]) -> List[List[Any]]:
+    """The stable part of a listing (no per-run timestamps), for content_hash()."""
+    return [[s.get(k) for k in FALLBACK_FIELDS] for s in parsed]
+
+
+def write_report(report: str) -> None:
+    if not atomic_write_text(REPORT_FILE, report):
+        log("Report unchanged since the last run; not rewritten")
+
+
+def find_new_skills(current_skills: List[Dict[str, Any]], known_names: Container[str]) -> List[Dict[str, Any]]:
+    """`known_names` only needs membership, e.g. StateStore.known_names(...) for this listing."""
+    return [s for s in current_skills if s.get("name") and s["name"] not in known_names]
 
 
 def clawhub_inspect_json(slug: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     """Return (json, error)."""
+    if not get_breaker().allow():
+        return None, f"inspect skipped ({RATE_LIMITED})"
+    INSPECT_LIMITER.acquire()
+    policy = get_retry_policy()
+    timeout = policy.timeout("inspect", INSPECT_TIMEOUT_S)
+    started = time.monotonic()
     try:
-        p = subprocess.run(
-            ["npx", "clawhub", "inspect", slug, "--json"],
-            capture_output=True,
-            text=True,
-            timeout=INSPECT_TIMEOUT_S,
-            cwd=str(WORK_DIR),
-        )
-        out = _strip_cli_prefix_lines(p.stdout)
-        if p.returncode != 0:
-            return None, (p.stderr or p.stdout or "inspect failed").strip()[:260]
-        return json.loads(out), None
-    except subprocess.TimeoutExpired:
+        r = CLAWHUB.inspect(slug, timeout=timeout)
+        policy.history.record("inspect", time.monotonic() - started)
+        _check_rate_limit("inspect", r.error, r.status, r.retry_after)
+        return r.data, r.error
+    except ClawHubTimeout:
+        policy.history.record("inspect", timeout)
+        get_breaker().release()
         return None, "inspect timeout"
     except Exception as e:
+        get_breaker().release()
         return None, f"inspect error: {e}"
 
 
 def clawhub_inspect_file(slug: str, path: str) -> Tuple[Optional[str], Optional[str]]:
     """Fetch a text file from the skill (<=200KB)."""
+    if not get_breaker().allow():
+        return None, f"inspect file skipped ({RATE_LIMITED})"
+    INSPECT_LIMITER.acquire()
+    policy = get_retry_policy()
+    timeout = policy.timeout("inspect_file", INSPECT_TIMEOUT_S)
+    started = time.monotonic()
     try:
-        p = subprocess.run(
-            ["npx", "clawhub", "inspect", slug, "--file", path],
-            capture_output=True,
-            text=True,
-            timeout=INSPECT_TIMEOUT_S,
-            cwd=str(WORK_DIR),
-        )
-        out = _strip_cli_prefix_lines(p.stdout)
-        if p.returncode != 0:
-            return None, (p.stderr or p.stdout or "inspect file failed").strip()[:260]
-        return out, None
-    except subprocess.TimeoutExpired:
+        r = CLAWHUB.inspect_file(slug, path, timeout=timeout)
+        policy.history.record("inspect_file", time.monotonic() - started)
+        _check_rate_limit("inspect file", r.error, r.status, r.retry_after)
+        return r.data, r.error
+    except ClawHubTimeout:
+        policy.history.record("inspect_file", timeout)
+        get_breaker().release()
         return None, "inspect file timeout"
     except Exception as e:
+        get_breaker().release()
         return None, f"inspect file error: {e}"
 
 
+def get_skill_md_features(skill_md: str) -> Dict[str, Any]:
+    """Derived SKILL.md features, memoized by content hash (persisted in the enrichment cache)."""
+    global _FEATURES
+    if _FEATURES is None:
+        _FEATURES = FeatureMemo(store=get_enrich_cache())
+    return _FEATURES.features(skill_md)
+
+
 def _parse_tags_from_skill_md(skill_md: str) -> List[str]:
     """Extract tags from SKILL.md YAML front matter (best-effort)."""
     if not skill_md:
         return []
-
-    # Front matter
-    m = re.match(r"\s*---\n(.*?)\n---\n", skill_md, re.S)
-    if not m:
-        return []
-    fm = m.group(1)
-
-    # tags: [a, b]
-    m1 = re.search(r"^tags:\s*\[(.*?)\]\s*$", fm, re.M)
-    if m1:
-        raw = m1.group(1)
-        tags = [t.strip().strip("'\"") for t in raw.split(",") if t.strip()]
-        return [t for t in tags if t]
-
-    # tags:\n  - a\n  - b
-    m2 = re.search(r"^tags:\s*\n((?:\s*-\s*.+\n)+)", fm, re.M)
-    if m2:
-        block = m2.group(1)
-        tags = []
-        for ln in block.splitlines():
-            ln = ln.strip()
-            if ln.startswith("-"):
-                tags.append(ln[1:].strip().strip("'\""))
-        return [t for t in tags if t]
-
-    return []
+    return get_skill_md_features(skill_md)["tags"]
 
 
 def _extract_env_vars(skill_md: str) -> List[str]:
     """Extract ENV var names like FOO_BAR from SKILL.md (best-effort)."""
     if not skill_md:
         return []
-    envs = set(re.findall(r"\b[A-Z][A-Z0-9_]{2,}\b", skill_md))
-    # Filter obvious non-env tokens
-    blacklist = {
-        "HTTP",
-        "HTTPS",
-        "JSON",
-        "MIT",
-        "API",
-        "URL",
-        "CLI",
-        "MCP",
-        "USDC",
-        "EVM",
-        "SOL",
-        "ETH",
-        "BTC",
-        "README",
-        "SKILL",
-    }
-    envs = {e for e in envs if e not in blacklist and not e.endswith(".MD")}
-    # keep most likely ones
-    return sorted(envs)
-
+    return get_skill_md_features(skill_md)["env_vars"]
 
-def _guess_type_tags(slug: str, summary: str, tags_from_md: List[str]) -> List[str]:
-    s = (summary or "").lower()
-    slug_l = (slug or "").lower()
-
-    tags = [t.lower() for t in tags_from_md if t]
-
-    def add(t: str):
-        if t not in tags:
-            tags.append(t)
 
-    if "ecommerce" in slug_l or "e-commerce" in s or "taobao" in s or "jd" in s or "pdd" in s:
-        add("ecommerce")
-        add("product-research")
-        add("china")
+def get_rules() -> RuleSet:
+    global _RULES
+    if _RULES is None:
+        _RULES = RuleFile(RULES_FILE)
+        if _RULES.error:
+            log(f"Warning: {_RULES.error}")
+    return _RULES.rules
 
-    if "polymarket" in slug_l or "trade" in s or "trading" in s or "markets" in s:
-        add("trading")
-        if "polymarket" in slug_l:
-            add("polymarket")
 
-    if "sports" in slug_l or "sports" in s:
-        add("sports")
+def reload_rules() -> None:
+    """Pick up edits to RULES_FILE (watch mode calls this before every poll)."""
+    if _RULES is None:
+        get_rules()
+    elif _RULES.reload():
+        log(f"Reloaded classification rules from {RULES_FILE.name}")
+    elif _RULES.error:
+        log(f"Warning: {_RULES.error}")
 
-    if "devnet" in s or "solana devnet" in s:
-        add("devnet")
 
-    if "self-evolution" in s or "self-improvement" in s or "meta-skill" in s or "evolution" in s:
-        add("meta")
-        add("ops")
-
-    if "pay" in s or "paid" in s or "usdc" in s and "pay" in s:
-        add("paid")
-
-    # Keep 2-4 stable tags
-    return tags[:4]
+def _guess_type_tags(slug: str, summary: str, tags_from_md: List[str]) -> List[str]:
+    return get_rules().type_tags(slug, summary, tags_from_md)
 
 
 def _suggest_opportunities(slug: str, summary: str, tags: List[str]) -> List[str]:
-    s = (summary or "").lower()
-    t = set(tags or [])
-    out: List[str] = []
-
-    def push(x: str):
-        if x and x not in out:
-            out.append(x)
-
-    if "ecommerce" in t:
-        push("把选品/竞品/价格带对比自动化，提升 Brain 的机会报告含金量")
-        push("做“比价/找同款/找供应链(1688)”的小工具或报告服务，形成变现路径")
-        push("结合 XHS/抖音做内容选题+商品素材库沉淀，形成可复用增长资产")
-
-    if "meta" in t:
-        push("用于日常故障复盘：从日志/历史中产出修复建议与补丁草案（建议 review 模式）")
-        push("把重复修复经验沉淀为可复用规则/模板，降低维护成本")
-        push("为监控/脚本建立“人类在环”的安全改进流水线")
-
-    if "trading" in t:
-        push("作为“信号→下单→仓位/费用处理”的交易模板，加速策略原型验证")
-        push("可替换信号源（自有数据/舆情/新闻）做差异化策略服务")
-        push("沉淀风控模板（限额/确认/白名单），复用到其它高风险自动化工具")
-
-    if "paid" in t and "trading" not in t:
-        push("抽象“付费 API 调用”安全模板：二次确认、预算上限、禁止自动分页")
-        push("做垂直数据检索/核验服务（按次计费），为研究报告增加可核验引用")
-        push("将成本估算（preview→付费）流程产品化，减少误触发支出")
-
-    if "sports" in t and "trading" in t:
-        push("用于演示/课程素材：devnet 场景下展示 agent 自主执行闭环")
-        push("如果做 agent 竞赛/排行榜玩法，可快速搭脚手架")
-        push("抽象密钥落盘+本地签名范式，为其它链上工具提供安全参考")
-
-    # Ensure 3 lines
-    while len(out) < 3:
-        push("观察是否能并入现有工作流：节省人工步骤、提升信息密度或减少出错")
-
-    return out[:3]
+    return get_rules().opportunities(tags)
 
 
 def _build_dependency_line(skill_md: str, summary: str) -> str:
-    envs = _extract_env_vars(skill_md)
+    features = get_skill_md_features(skill_md) if skill_md else {}
+    envs = features.get("env_vars") or []
     parts = []
     if envs:
         # keep up to 4 envs to avoid long lines
         parts.append("ENV: " + ", ".join(envs[:4]) + ("..." if len(envs) > 4 else ""))
 
     s = (summary or "").lower()
-    stack = []
-    if "python" in skill_md.lower() or "pip install" in skill_md.lower():
-        stack.append("python")
-    if "node" in skill_md.lower() or "npm" in skill_md.lower() or "npx" in skill_md.lower():
-        stack.append("node")
-    if "mcp" in skill_md.lower() or "mcp" in s:
-        stack.append("mcp")
-    if "solana" in skill_md.lower() or "solana" in s:
-        stack.append("solana")
-    if "evm" in skill_md.lower() or "base" in skill_md.lower() or "x402" in skill_md.lower():
-        stack.append("evm/x402")
-
-    if stack:
-        parts.append("Stack: " + "+".join(dict.fromkeys(stack)))
-
-    if "no api key" in skill_md.lower() or "no api keys" in skill_md.lower() or "no api keys" in s:
+    stack = set(features.get("stack") or [])
+    stack.update(k for k in ("mcp", "solana") if k in s)
+    stack_line = [k for k in STACK_ORDER if k in stack]
+    if stack_line:
+        parts.append("Stack: " + "+".join(stack_line))
+
+    if features.get("no_api_key") or "no api keys" in s:
         parts.append("无需 API key")
 
     # Fallback to summary hints
@@ -452,9 +1071,13 @@ def _truncate_cn(text: str, max_len: int = 200) -> str:
     return text if len(text) <= max_len else text[: max_len - 1] + "…"
 
 
-def enrich_skill_for_report(slug: str) -> Dict[str, Any]:
-    """Fetch inspect + SKILL.md for a slug and return report-friendly fields."""
-    data, err = clawhub_inspect_json(slug)
+def _build_enriched(
+    slug: str,
+    inspect_result: Tuple[Optional[Dict[str, Any]], Optional[str]],
+    file_result: Tuple[Optional[str], Optional[str]],
+) -> Dict[str, Any]:
+    """Combine inspect JSON + SKILL.md results into report-friendly fields."""
+    data, err = inspect_result
     if err or not data:
         return {
             "slug": slug,
@@ -483,7 +1106,7 @@ def enrich_skill_for_report(slug: str) -> Dict[str, Any]:
 
     link = f"https://clawhub.ai/{owner}/{slug}" if owner else ""
 
-    skill_md, md_err = clawhub_inspect_file(slug, "SKILL.md")
+    skill_md, md_err = file_result
     if md_err:
         skill_md = ""
 
@@ -504,162 +1127,636 @@ def enrich_skill_for_report(slug: str) -> Dict[str, Any]:
         "owner": owner,
         "downloads": downloads,
         "stars": stars,
+        "rules": get_rules().fingerprint,
     }
 
 
-def generate_report(new_skills: List[Dict[str, Any]], status: str = "fetch_failed", source: str = "primary", reason: str = "") -> str:
-    """status: success_with_new | success_no_new | fetch_failed"""
+def get_enrich_cache() -> Optional[EnrichCache]:
+    global _ENRICH_CACHE
+    if _ENRICH_CACHE is None:
+        try:
+            _ENRICH_CACHE = EnrichCache(ENRICH_CACHE_FILE, ENRICH_STATS_TTL_S, ENRICH_CACHE_MAX_BYTES)
+        except Exception as e:
+            log(f"Warning: enrichment cache unavailable: {e}")
+    return _ENRICH_CACHE
 
-    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    today = datetime.now().strftime("%Y-%m-%d")
 
-    report_lines = [
-        f"# 📦 ClawHub 日报（Top5）- {today}",
-        "",
-        f"⏰ Generated: {now}",
-        "🌏 Timezone: Asia/Shanghai",
-        f"📡 Source: {source}",
-        f"🏷️ State: {status}",
-        "",
-    ]
+def get_download_series() -> Optional[DownloadSeries]:
+    global _SERIES
+    if _SERIES is None:
+        try:
+            _SERIES = DownloadSeries(SERIES_DB)
+        except Exception as e:
+            log(f"Warning: download series unavailable: {e}")
+    return _SERIES
 
-    if status == "fetch_failed":
-        report_lines.extend(
-            [
-                "## ⚠️ 抓取失败",
-                "",
-                "本次未能拿到可用的 skill 列表（这不等同于‘今日无新增’）。",
-                "",
-                f"**Reason:** `{reason or 'unknown'}`",
-                "",
-                "建议：",
-                "- 稍后重试（避开高峰）",
-                "- 观察是否触发 Rate limit",
-                "- 保持 fallback_skills.json 有上次成功快照",
-            ]
+
+def record_download_samples(samples: Iterable[Tuple[str, int, int]]) -> None:
+    series = get_download_series()
+    if series is None:
+        return
+    try:
+        stored = series.record(samples)
+        METRICS.set("series_samples", stored)
+    except Exception as e:
+        log(f"Warning: Could not record download samples: {e}")
+
+
+def _payload_version(data: Optional[Dict[str, Any]]) -> str:
+    if not isinstance(data, dict):
+        return ""
+    latest = data.get("latestVersion") or (data.get("skill") or {}).get("latestVersion") or {}
+    return str(latest.get("version") or "") if isinstance(latest, dict) else ""
+
+
+def enrich_skills_for_report(
+    slugs: List[str], versions: Optional[Dict[str, str]] = None, deadline_s: Optional[float] = None
+) -> Dict[str, Dict[str, Any]]:
+    """Enrich several slugs concurrently, reusing the on-disk cache.
+
+    A cache hit with fresh stats costs no network call; a hit with stale stats
+    re-fetches only the inspect JSON. Everything else needs both inspect calls,
+    which are submitted up front (in rank order) to one bounded pool;
+    INSPECT_LIMITER keeps the combined rate within budget.
+
+    With `deadline_s`, results are collected in rank order until the deadline;
+    slugs still in flight then are left out of the result and finished later by
+    finish_background_enrichment().
+    """
+    if not slugs:
+        return {}
+    versions = versions or {}
+    cache = get_enrich_cache()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    cached_md: Dict[str, str] = {}
+    to_fetch: List[str] = []
+    for slug in slugs:
+        entry = cache.get(slug, versions[slug]) if cache and versions.get(slug) else None
+        if entry and entry.stats_fresh(ENRICH_STATS_TTL_S):
+            derived = entry.derived
+            if derived.get("rules") != get_rules().fingerprint:
+                # Classification rules changed: re-derive offline from the cached inputs.
+                derived = _build_enriched(slug, (entry.payload, None), (entry.skill_md, None))
+            results[slug] = derived
+        else:
+            if entry:
+                cached_md[slug] = entry.skill_md
+            to_fetch.append(slug)
+    if cache:
+        log(f"Enrichment cache: {len(slugs) - len(to_fetch)} hit(s), {len(cached_md)} stale, {len(to_fetch) - len(cached_md)} miss(es)")
+    if not to_fetch:
+        return results
+
+    deadline = time.monotonic() + deadline_s if deadline_s else None
+    workers = max(1, min(ENRICH_WORKERS, 2 * len(to_fetch)))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="enrich")
+    pending = [
+        (
+            slug,
+            versions.get(slug) or "",
+            pool.submit(clawhub_inspect_json, slug),
+            cached_md[slug] if slug in cached_md else pool.submit(clawhub_inspect_file, slug, "SKILL.md"),
         )
+        for slug in to_fetch
+    ]
+    # Queued calls still run; results not collected below are picked up later.
+    pool.shutdown(wait=False)
+    for item in pending:
+        slug, _, fj, md = item
+        if deadline is not None:
+            futures = [f for f in (fj, md) if isinstance(f, Future)]
+            _, not_done = wait(futures, timeout=max(0.0, deadline - time.monotonic()))
+            if not_done:
+                _DEFERRED_ENRICHMENT.append(item)
+                continue
+        results[slug] = _collect_enrichment(cache, *item)
+    if _FEATURES is not None:
+        _FEATURES.flush()
+    METRICS.set("enrich_deferred", len(slugs) - len(results))
+    return results
+
+
+def _collect_enrichment(cache: Optional[EnrichCache], slug: str, version: str, fj: Future, md: Any) -> Dict[str, Any]:
+    """Build the report fields from finished inspect calls (blocks until they are) and cache them."""
+    inspect_result = fj.result()
+    file_result = md.result() if isinstance(md, Future) else (md, None)
+    enriched = _build_enriched(slug, inspect_result, file_result)
+    data, err = inspect_result
+    version = version or _payload_version(data)
+    if cache and not err and data and version and not file_result[1]:
+        cache.put(slug, version, data, file_result[0] or "", enriched)
+    return enriched
+
+
+def finish_background_enrichment() -> int:
+    """Wait for enrichment deferred past a report deadline; returns how many slugs were cached."""
+    if not _DEFERRED_ENRICHMENT:
+        return 0
+    deferred = list(_DEFERRED_ENRICHMENT)
+    del _DEFERRED_ENRICHMENT[:]
+    cache = get_enrich_cache()
+    with METRICS.span("enrich_background", skills=len(deferred)) as span:
+        done = sum(not _collect_enrichment(cache, *item).get("error") for item in deferred)
+        if _FEATURES is not None:
+            _FEATURES.flush()
+    log(f"Background enrichment finished {done}/{len(deferred)} skill(s) in {span['wall_s']:.1f}s")
+    return done
 
-    elif status == "success_no_new":
-        report_lines.extend(
-            [
-                "## 📝 今日无新增",
-                "",
-                "抓取成功，但当日未发现新增技能。",
-            ]
+
+def enrich_skill_for_report(slug: str) -> Dict[str, Any]:
+    """Fetch inspect + SKILL.md for a slug and return report-friendly fields."""
+    return enrich_skills_for_report([slug])[slug]
+
+
+def build_report_model(
+    new_skills: List[Dict[str, Any]],
+    status: str = FETCH_FAILED,
+    source: str = "primary",
+    reason: str = "",
+    growth: Optional[List[GrowthRow]] = None,
+    changes: Optional[List[Change]] = None,
+) -> DailyReport:
+    """status: success_with_new | success_no_new | fetch_failed
+
+    The only report step that may call ClawHub (Top-N enrichment). `growth` is
+    a precomputed _growth_rows() (computed here if None); `changes` are the
+    non-new changes to known skills from skill_diff.
+    """
+    cards: List[SkillCard] = []
+    if status == SUCCESS_WITH_NEW:
+        top = _top_skills(new_skills)
+        slugs = [skill.get("name") or "" for skill in top]
+        versions = {skill.get("name") or "": skill.get("version") or "" for skill in top}
+        with METRICS.span("enrich", skills=len(slugs)) as span:
+            enriched_by_slug = enrich_skills_for_report(slugs, versions, REPORT_DEADLINE_S)
+        late = len(slugs) - len(enriched_by_slug)
+        log(f"Enriched {len(enriched_by_slug)} skills in {span['wall_s']:.1f}s" + (f" ({late} still running)" if late else ""))
+        record_download_samples(
+            (slug, e.get("downloads") or 0, e.get("stars") or 0)
+            for slug, e in enriched_by_slug.items()
+            if not e.get("error") and (e.get("downloads") or e.get("stars"))
         )
+        for i, (skill, slug) in enumerate(zip(top, slugs), 1):
+            cards.append(_skill_card(i, skill, enriched_by_slug.get(slug)))
+
+    show_extras = status != FETCH_FAILED
+    now = datetime.now()
+    return DailyReport(
+        date=now.strftime("%Y-%m-%d"),
+        generated_at=now.strftime("%Y-%m-%d %H:%M:%S"),
+        timezone="Asia/Shanghai",
+        source=source,
+        status=status,
+        reason=reason,
+        new_count=len(new_skills),
+        skills=cards,
+        changes=_change_groups(changes or []) if show_extras else [],
+        events_file=EVENTS_FILE.name,
+        growth=(_growth_rows() if growth is None else growth) if show_extras else [],
+        growth_days=GROWTH_WINDOW_S / 86400,
+        config=_report_config(),
+    )
 
+
+def _skill_card(rank: int, skill: Dict[str, Any], enriched: Optional[Dict[str, Any]]) -> SkillCard:
+    """`enriched` is None for a slug that missed the report deadline."""
+    slug = skill.get("name") or ""
+    fields = enriched if enriched is not None else {"summary": _truncate_cn(skill.get("summary") or "", 200)}
+    return SkillCard(
+        rank=rank,
+        slug=fields.get("slug") or slug,
+        display=fields.get("display") or slug,
+        link=fields.get("link") or "",
+        summary=fields.get("summary") or "",
+        type_tags=list(fields.get("type_tags") or []),
+        opportunities=list(fields.get("opportunities") or [])[:3],
+        deps=fields.get("deps") or "",
+        owner=fields.get("owner") or "",
+        downloads=int(fields.get("downloads") or skill.get("downloads") or 0),
+        stars=int(fields.get("stars") or skill.get("stars") or 0),
+        pending=enriched is None,
+        raw=_truncate_cn(skill.get("raw") or "", 200),
+    )
+
+
+def generate_report(
+    new_skills: List[Dict[str, Any]],
+    status: str = FETCH_FAILED,
+    source: str = "primary",
+    reason: str = "",
+    growth: Optional[List[GrowthRow]] = None,
+    changes: Optional[List[Change]] = None,
+) -> str:
+    """Build the report model and render it as Telegram Markdown."""
+    model = build_report_model(new_skills, status, source, reason, growth, changes)
+    return render_telegram(model, get_report_template())
+
+
+def get_report_template() -> ItemTemplate:
+    """REPORT_TEMPLATE_FILE compiled (once per file version); the built-in layout if it is missing or broken."""
+    global _TEMPLATE_MISSING_WARNED
+    if not REPORT_TEMPLATE_FILE.exists():
+        if not _TEMPLATE_MISSING_WARNED:
+            log(f"Warning: report template {REPORT_TEMPLATE_FILE} not found, using the built-in one")
+            _TEMPLATE_MISSING_WARNED = True
     else:
-        report_lines.extend(
-            [
-                "## 🆕 今日新增（Top5）",
-                "",
-                f"Found **{len(new_skills)}** new skill(s) today.",
-                "",
+        _TEMPLATE_MISSING_WARNED = False
+    try:
+        return load_item_template(REPORT_TEMPLATE_FILE)
+    except (OSError, ValueError) as e:
+        log(f"Warning: invalid report template {REPORT_TEMPLATE_FILE}, using the built-in one: {e}")
+        return load_item_template(None)
+
+
+def _top_skills(new_skills: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Top-N new skills: by downloads, or by growth score (then downloads) in growth mode."""
+    growth = {}
+    series = get_download_series() if RANK_MODE == "growth" and new_skills else None
+    if series is not None:
+        names = [s.get("name") or "" for s in new_skills]
+        growth = {n: g.score for n, g in series.growth(GROWTH_WINDOW_S, names, GROWTH_ACCEL_WEIGHT).items()}
+    return sorted(
+        new_skills, key=lambda x: (growth.get(x.get("name") or "", 0.0), x.get("downloads", 0)), reverse=True
+    )[:ENRICH_TOP_N]
+
+
+def _change_groups(changes: List[Change]) -> List[ChangeGroup]:
+    """Updates to already-known skills, REPORT_CHANGES_MAX rows per kind."""
+    groups = []
+    for kind, title in CHANGE_TITLES:
+        of_kind = [c for c in changes if c.kind == kind]
+        if of_kind:
+            rows = [
+                ChangeRow(c.name, c.old, _truncate_cn(str(c.new), 80) if kind == SUMMARY_CHANGED else c.new)
+                for c in of_kind[:REPORT_CHANGES_MAX]
             ]
-        )
+            groups.append(ChangeGroup(kind, title, len(of_kind), rows))
+    return groups
 
-        top = sorted(new_skills, key=lambda x: x.get("downloads", 0), reverse=True)[:ENRICH_TOP_N]
-        for i, skill in enumerate(top, 1):
-            slug = skill.get("name") or ""
-            enriched = enrich_skill_for_report(slug)
-
-            type_tags = enriched.get("type_tags") or []
-            type_str = "，".join([f"‘{t}’" for t in type_tags]) if type_tags else "‘uncategorized’"
-
-            # Final one-line style (Telegram-friendly; avoids quote continuation issues)
-            tags = enriched.get("type_tags") or []
-            tag_str = "，".join([f"‘{t}’" for t in tags]) if tags else "‘uncategorized’"
-            opp = enriched.get("opportunities", ["", "", ""])[:3]
-            line = (
-                f"{i}️⃣ [{enriched.get('display','')}]({enriched.get('link','')}) "
-                f"**简介:** {enriched.get('summary','')} "
-                f"**类型:** {tag_str} "
-                f"**机会点:** - {opp[0]} - {opp[1]} - {opp[2]} "
-                f"**依赖:** {enriched.get('deps','')} "
-                f"owner: {enriched.get('owner','')} | downloads: {enriched.get('downloads',0)} | stars: {enriched.get('stars',0)}"
-            )
-            report_lines.append(line)
-
-            time.sleep(INSPECT_SLEEP_S)
-
-    report_lines.extend(
-        [
-            "---",
-            "",
-            "📊 Monitor Configuration:",
-            "- Check frequency: Daily at 8:00 AM",
-            f"- Explore limit: {EXPLORE_LIMIT}",
-            f"- Enrich top N: {ENRICH_TOP_N}",
-            "- Retry strategy: exponential backoff + jitter",
-            "- Single-instance lock: enabled",
-            "- Tracked skills file: `known_skills.json`",
-            "",
-            "_This is an automated report from ClawHub Skill Monitor_",
-        ]
+
+def _growth_rows() -> List[GrowthRow]:
+    """Fastest-growing tracked skills (growth mode only)."""
+    series = get_download_series() if RANK_MODE == "growth" else None
+    if series is None:
+        return []
+    with METRICS.span("rank_growth"):
+        ranked = series.rank(GROWTH_WINDOW_S, ENRICH_TOP_N, accel_weight=GROWTH_ACCEL_WEIGHT)
+    return [GrowthRow(name, g.velocity, g.acceleration, g.downloads, g.stars) for name, g in ranked]
+
+
+def _interval_text(seconds: float) -> str:
+    if seconds >= 3600:
+        return f"{seconds / 3600:.3g}h"
+    return f"{seconds / 60:.3g}min" if seconds >= 60 else f"{seconds:g}s"
+
+
+def _check_frequency_line() -> str:
+    """Cron runs are daily; --watch polls on the adaptive interval."""
+    if _WATCH_BOUNDS is None:
+        return "Check frequency: Daily at 8:00 AM"
+    low, high = _WATCH_BOUNDS
+    return f"Check frequency: adaptive polling every {_interval_text(low)}–{_interval_text(high)} (watch mode)"
+
+
+def _report_config() -> List[str]:
+    return [
+        _check_frequency_line(),
+        (
+            f"Explore: incremental {EXPLORE_START_LIMIT}→{EXPLORE_MAX_LIMIT} (stop after {EXPLORE_KNOWN_RUN} known)"
+            if EXPLORE_INCREMENTAL
+            else f"Explore limit: {EXPLORE_LIMIT}"
+        ),
+        f"Enrich top N: {ENRICH_TOP_N} (inspect budget: {INSPECT_RPS:g} req/s"
+        + (f", report deadline {REPORT_DEADLINE_S:g}s)" if REPORT_DEADLINE_S else ")"),
+        (
+            f"Ranking: growth over {GROWTH_WINDOW_S / 86400:g}d (velocity + {GROWTH_ACCEL_WEIGHT:g}×acceleration)"
+            if RANK_MODE == "growth"
+            else "Ranking: downloads"
+        ),
+        f"Retry strategy: {_retry_strategy_line()}",
+        f"Rate-limit breaker: {get_breaker().status()['state']}",
+        "Single-instance lock: enabled",
+        f"Tracked skills store: `{STATE_DB.name}`",
+    ]
+
+
+def _render_key(
+    new_skills: List[Dict[str, Any]],
+    status: str,
+    source: str,
+    reason: str,
+    growth: List[GrowthRow],
+    changes: Optional[List[Change]],
+    template: ItemTemplate,
+) -> Optional[str]:
+    """Hash of everything the report is built from; None if enrichment must hit the network.
+
+    Enrichment inputs are the cache entries of the Top-N skills; a missing or
+    stale entry means fresh data is due, so the report cannot be reused.
+    """
+    enrich_inputs = []
+    top = _top_skills(new_skills) if status == SUCCESS_WITH_NEW else []
+    cache = get_enrich_cache() if top else None
+    for skill in top:
+        slug, version = skill.get("name") or "", skill.get("version") or ""
+        entry = cache.get(slug, version) if cache and version else None
+        if entry is None or not entry.stats_fresh(ENRICH_STATS_TTL_S):
+            return None
+        enrich_inputs.append([slug, version, entry.stats_at])
+    today = datetime.now().strftime("%Y-%m-%d")
+    new = [[s.get("name"), s.get("version"), s.get("downloads")] for s in new_skills]
+    return content_hash(
+        today,
+        status,
+        source,
+        reason,
+        new,
+        enrich_inputs,
+        get_rules().fingerprint,
+        [astuple(g) for g in growth],
+        changes or [],
+        _report_config(),
+        template.fingerprint,
     )
 
-    return "\n".join(report_lines)
 
+def render_report(
+    stages: StageHashes,
+    new_skills: List[Dict[str, Any]],
+    status: str,
+    source: str,
+    reason: str,
+    changes: Optional[List[Change]] = None,
+) -> bool:
+    """Build the report model and write it (REPORT_MODEL_FILE) and its Telegram
+    rendering (REPORT_FILE), unless the inputs match the last rendered report.
+
+    Returns False when the previous report was kept.
+    """
+    growth = _growth_rows() if status != FETCH_FAILED else []
+    template = get_report_template()
+    key = _render_key(new_skills, status, source, reason, growth, changes, template)
+    if key and REPORT_FILE.exists() and REPORT_MODEL_FILE.exists() and stages.fresh("render", key):
+        log("Report inputs unchanged since the last run; keeping the previous report")
+        METRICS.set("report_reused", 1)
+        return False
+    with METRICS.span("render"):
+        model = build_report_model(new_skills, status=status, source=source, reason=reason, growth=growth, changes=changes)
+        write_report(render_telegram(model, template))
+        atomic_write_text(REPORT_MODEL_FILE, render_json(model))
+    # Keyed after rendering: enrichment has just refreshed the cache entries.
+    key = _render_key(new_skills, status, source, reason, growth, changes, template)
+    if key:
+        stages.commit("render", key)
+    else:
+        stages.forget("render")
+    METRICS.set("report_reused", 0)
+    return True
+
+
+def _retry_strategy_line() -> str:
+    timeouts = get_retry_policy().timeouts("explore")
+    learned = get_retry_policy().hedge_after("explore") is not None
+    hedge = " + p95 hedge" if EXPLORE_HEDGE and learned else ""
+    source = "learned" if learned else "default"
+    return f"{source} timeouts {'/'.join(f'{t:g}' for t in timeouts)}s, backoff + jitter{hedge}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="ClawHub Skill Monitor")
+    parser.add_argument("--watch", action="store_true", help="keep running and poll ClawHub on an adaptive interval")
+    parser.add_argument("--min-interval", type=float, default=WATCH_MIN_INTERVAL_S, help="watch: shortest poll interval (s)")
+    parser.add_argument("--max-interval", type=float, default=WATCH_MAX_INTERVAL_S, help="watch: longest poll interval (s)")
+    args = parser.parse_args(argv)
+    if args.watch:
+        return watch(args.min_interval, args.max_interval)
+    return run_once()
+
+
+def _begin_run() -> None:
+    global METRICS
+    METRICS = RunMetrics()
+    METRICS.on_span = _log_span
+    get_run_log().run_id = METRICS.run_id
+
+
+def _end_run(exit_code: int) -> None:
+    finish_background_enrichment()
+    save_latency_history()
+    write_run_metrics(exit_code)
+    get_run_log().flush()
 
-def main() -> int:
-    WORK_DIR.mkdir(parents=True, exist_ok=True)
 
+def run_once() -> int:
+    _begin_run()
+    exit_code = 1
+    try:
+        exit_code = _run()
+        return exit_code
+    except Exception as e:
+        log(f"ERROR: run aborted: {e!r}")
+        raise
+    finally:
+        _end_run(exit_code)
+
+
+def write_run_metrics(exit_code: int) -> None:
+    try:
+        METRICS.set("breaker_open", 0 if get_breaker().status()["state"] == "closed" else 1)
+        summary = METRICS.finish(exit_code, METRICS_FILE, METRICS_PROM_FILE)
+        stages = ", ".join(f"{s['name']}={s['wall_s']:.2f}s" for s in summary["spans"] if s["parent"] is None and "cpu_s" in s)
+        log(
+            f"Run {summary['run_id']} took {summary['wall_s']:.1f}s ({stages})",
+            duration_s=summary["wall_s"],
+            exit_code=exit_code,
+        )
+    except Exception as e:
+        log(f"Warning: Could not write run metrics: {e}")
+
+
+@contextmanager
+def _single_instance() -> Iterator[bool]:
+    """Yields False when another monitor (cron run or watcher) holds the lock."""
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
     with open(LOCK_FILE, "w", encoding="utf-8") as lockf:
         try:
             fcntl.flock(lockf, fcntl.LOCK_EX | fcntl.LOCK_NB)
         except BlockingIOError:
+            yield False
+            return
+        yield True
+
+
+def _run() -> int:
+    with _single_instance() as locked:
+        if not locked:
             log("Another monitor process is running. Skip this run.")
             return 0
 
         log("=== ClawHub Monitor Started ===")
 
-        output, source, err = fetch_skills_primary()
-        parsed: List[Dict[str, Any]] = []
-
-        if output:
-            parsed = parse_explore_output(output)
-            if parsed:
-                save_fallback_snapshot(parsed)
-                log("Fallback snapshot updated")
-        else:
-            fallback_data, fb_source, fb_err = fetch_skills_fallback()
-            if fallback_data:
-                source = fb_source
-                parsed = normalize_fallback_list(fallback_data)
-                err = "primary failed, fallback used"
-            else:
-                source = f"primary+{fb_source}"
-                err = f"{err}; {fb_err}"
-
-        if not parsed:
-            report = generate_report([], status="fetch_failed", source=source, reason=err)
-            REPORT_FILE.write_text(report, encoding="utf-8")
-            log("Report generated with failure notice")
+        try:
+            with METRICS.span("state_load"):
+                store = open_state_store()
+        except Exception as e:
+            log(f"ERROR: Could not open state store: {e}")
             log("=== Monitor Completed ===")
             return 1
+        log(f"Loaded state store with {store.count()} known skills")
 
-        log(f"Parsed {len(parsed)} skills from source={source}")
-        known_skills = load_known_skills()
-        log(f"Loaded {len(known_skills)} known skills from state")
-
-        new_skills = find_new_skills(parsed, known_skills)
-        log(f"Found {len(new_skills)} new skills")
+        try:
+            exit_code, _ = run_cycle(store)
+        finally:
+            store.close()
+        log("=== Monitor Completed ===")
+        return exit_code
 
-        for skill in parsed:
-            name = skill.get("name")
-            if name:
-                known_skills[name] = skill
 
-        save_known_skills(known_skills)
-        log(f"Updated state with {len(known_skills)} total skills")
+def run_cycle(store: StateStore, watch: bool = False) -> Tuple[int, int]:
+    """Fetch, diff against the store, update it and write the report.
 
-        state = "success_with_new" if new_skills else "success_no_new"
-        report = generate_report(new_skills, status=state, source=source, reason=err or "")
-        REPORT_FILE.write_text(report, encoding="utf-8")
+    Returns (exit_code, new_skill_count). In watch mode a failed fetch does not
+    fall back to the snapshot (it cannot contain anything new), and a report is
+    only written when there are new skills.
+    """
+    stages = StageHashes(store)
+    with METRICS.span("explore"):
+        parsed, source, err = fetch_skills_primary(store)
+
+    listing_key = content_hash(_listing_digest(parsed), store.version()) if parsed else ""
+    unchanged = bool(parsed) and stages.fresh("listing", listing_key)
+    METRICS.set("listing_unchanged", int(unchanged))
+    # An incremental explore only lists the newest skills; an error note means
+    # the listing was cut short.
+    complete = bool(parsed) and not err and not (EXPLORE_INCREMENTAL and store.count())
+    if parsed and not unchanged:
+        with METRICS.span("snapshot"):
+            changed = save_fallback_snapshot(parsed, complete)
+            archive_snapshot(parsed, complete)
+            save_explore_hwm(store, parsed)
+        log("Fallback snapshot updated" if changed else "Fallback snapshot unchanged")
+    elif not parsed and watch:
+        log(f"Poll failed: {err}")
+        return 1, 0
+    elif not parsed:
+        with METRICS.span("fallback"):
+            fallback_data, fb_source, fb_err = fetch_skills_fallback()
+        if fallback_data:
+            source = fb_source
+            parsed = normalize_fallback_list(fallback_data)
+            err = "primary failed, fallback used"
+            listing_key = content_hash(_listing_digest(parsed), store.version())
+            unchanged = stages.fresh("listing", listing_key)
+        else:
+            source = f"primary+{fb_source}"
+            err = f"{err}; {fb_err}"
+
+    METRICS.set("skills_parsed", len(parsed or []))
+    if not parsed:
+        render_report(stages, [], status=FETCH_FAILED, source=source, reason=err)
+        log("Report generated with failure notice")
+        _run_notify_cmd(REPORT_READY_CMD, "report ready")
+        return 1, 0
+
+    log(f"Parsed {len(parsed)} skills from source={source}")
+    if unchanged:
+        # Same listing against the same state: the last run already stored it
+        # and reported anything new, so diff and state save have nothing to do.
+        log("Listing and state unchanged since the last run; skipping diff and state save")
+        new_skills: List[Dict[str, Any]] = []
+        updates: List[Change] = []
+    else:
+        with METRICS.span("diff"):
+            changes = diff_against_state(store, parsed)
+            by_name = {s["name"]: s for s in parsed if s.get("name")}
+            new_skills = [by_name[c.name] for c in changes if c.kind == NEW]
+            updates = [c for c in changes if c.kind != NEW]
+        log(f"Found {len(new_skills)} new skills, {len(updates)} change(s) to known skills")
+        METRICS.set("changes", len(updates))
+        record_events(changes)
+
+        with METRICS.span("state_save"):
+            store.upsert(parsed)
+            store.set_meta(LAST_LISTING_KEY, json.dumps(_last_listing(store, parsed, changes, complete)))
+        stages.commit("listing", content_hash(_listing_digest(parsed), store.version()))
+        log(f"Updated state with {store.count()} total skills")
+        with METRICS.span("series"):
+            # Text listings print downloads only for some skills; 0 there means "not shown".
+            record_download_samples(
+                (s["name"], s.get("downloads") or 0, s.get("stars") or 0)
+                for s in parsed
+                if s.get("name") and (s.get("downloads") or "stars" in s)
+            )
+    METRICS.set("new_skills", len(new_skills))
 
+    if watch and not new_skills:
+        return 0, 0
+    state = SUCCESS_WITH_NEW if new_skills else SUCCESS_NO_NEW
+    if render_report(stages, new_skills, status=state, source=source, reason=err or "", changes=updates):
         log(f"Report saved to: {REPORT_FILE}")
-        log("=== Monitor Completed ===")
-        return 0
+    _run_notify_cmd(WATCH_NOTIFY_CMD if watch else REPORT_READY_CMD, "watch notify" if watch else "report ready")
+    if finish_background_enrichment():
+        # Everything is cached now, so this render makes no network calls.
+        render_report(stages, new_skills, status=state, source=source, reason=err or "", changes=updates)
+        log(f"Report updated with background enrichment: {REPORT_FILE}")
+    return 0, len(new_skills)
+
+
+def _run_notify_cmd(cmd: str, what: str) -> None:
+    if not cmd:
+        return
+    try:
+        p = subprocess.run(cmd, shell=True, cwd=str(WORK_DIR), capture_output=True, text=True, timeout=NOTIFY_CMD_TIMEOUT_S)
+        if p.returncode != 0:
+            log(f"Warning: {what} command exited {p.returncode}: {(p.stderr or p.stdout).strip()[:200]}")
+    except Exception as e:
+        log(f"Warning: {what} command failed: {e}")
+
+
+def watch(min_interval_s: float, max_interval_s: float) -> int:
+    """Poll until SIGTERM/SIGINT with the state store and ClawHub client kept warm."""
+    global _WATCH_BOUNDS
+    stop = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stop.set())
+
+    with _single_instance() as locked:
+        if not locked:
+            log("Another monitor process is running. Not starting watch mode.")
+            return 0
+        try:
+            store = open_state_store()
+        except Exception as e:
+            log(f"ERROR: Could not open state store: {e}")
+            return 1
+        rate = float(store.get_meta(WATCH_RATE_KEY) or 0.0)
+        _WATCH_BOUNDS = (min_interval_s, max_interval_s)
+        poller = AdaptiveInterval(min_interval_s, max_interval_s, WATCH_TARGET_NEW_PER_POLL, rate=rate)
+        log(f"=== ClawHub Monitor watching ({min_interval_s:g}s..{max_interval_s:g}s, {store.count()} known skills) ===")
+        try:
+            while not stop.is_set():
+                reload_rules()
+                _begin_run()
+                exit_code, new = 1, 0
+                try:
+                    exit_code, new = run_cycle(store, watch=True)
+                except Exception as e:
+                    log(f"ERROR: poll aborted: {e!r}")
+                finally:
+                    _end_run(exit_code)
+                poller.observe(new, ok=exit_code == 0)
+                store.set_meta(WATCH_RATE_KEY, f"{poller.rate:.9f}")
+                breaker = get_breaker().status()
+                cooldown = max(0.0, breaker["until"] - time.time()) if breaker["state"] == "open" else 0.0
+                wait_s = poller.wait_for(cooldown)
+                log(f"Next poll in {wait_s:.0f}s (arrival rate {poller.rate * 3600:.2f}/h)", wait_s=wait_s)
+                stop.wait(wait_s)
+        finally:
+            store.close()
+            log("=== ClawHub Monitor watch stopped ===")
+            get_run_log().flush()
+    return 0
 
 
 if __name__ == "__main__":
@@ -1,26 +1,299 @@
 #!/usr/bin/env python3
-"""
-Send ClawHub Monitor Report to Telegram
-Usage: python3 notify.py [report_file]
+"""Send the ClawHub Monitor report to Telegram
+
+Usage: python3 notify.py [report_file] [--dry-run]
+
+- Bot API sendMessage to every chat in TELEGRAM_CHAT_IDS (comma-separated)
+  with TELEGRAM_BOT_TOKEN; without both, the report is printed to stdout for
+  the calling process to handle, as before
+- The report is split below Telegram's 4096-character limit (counted in
+  UTF-16 units, as Telegram does) on line boundaries only, so bold/code/link
+  entities on a line stay whole; a ``` block cut by a split is closed and
+  reopened in the next message
+- All messages go over a small pool of keep-alive HTTPS connections; chats
+  are sent to concurrently (one worker, and so one connection, per chat up to
+  TELEGRAM_POOL_SIZE) and each chat gets its chunks in order
+- 429 responses wait the server's parameters.retry_after (or Retry-After)
+  and retry; a chunk Telegram cannot parse as Markdown is resent as plain text
+- TELEGRAM_API_BASE may be http://… to test against a local stand-in server
 """
 
+import argparse
+import http.client
+import json
+import os
+import queue
+import re
+import socket
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from circuit_breaker import parse_retry_after
 
 REPORT_FILE = Path("/home/administrator/.openclaw/workspace/memory/clawhub-monitor/daily_report.md")
 
-def main():
-    report_path = Path(sys.argv[1]) if len(sys.argv) > 1 else REPORT_FILE
-    
-    if not report_path.exists():
-        print(f"Report not found: {report_path}")
-        sys.exit(1)
-    
-    with open(report_path, "r", encoding="utf-8") as f:
-        content = f.read()
-    
-    # Print report content for the calling process to handle
-    print(content)
+TELEGRAM_API_BASE = os.environ.get("TELEGRAM_API_BASE", "https://api.telegram.org")
+TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN", "")
+TELEGRAM_CHAT_IDS = [c.strip() for c in os.environ.get("TELEGRAM_CHAT_IDS", "").split(",") if c.strip()]
+# Legacy Markdown: *bold*, `code`, ```pre```, [text](url). Empty: plain text.
+TELEGRAM_PARSE_MODE = os.environ.get("TELEGRAM_PARSE_MODE", "Markdown")
+TELEGRAM_MAX_CHARS = 4096
+TELEGRAM_POOL_SIZE = 4
+TELEGRAM_TIMEOUT_S = 30.0
+# 429 handling: at most this many waits per message, each at most this long.
+TELEGRAM_MAX_RETRIES = 3
+TELEGRAM_MAX_RETRY_AFTER_S = 120.0
+FENCE = "```"
+
+
+def _units(text: str) -> int:
+    """Length as Telegram counts it (UTF-16 code units)."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _split_long_line(line: str, limit: int) -> List[str]:
+    """Last resort for one line over the limit: cut at spaces where possible."""
+    parts = []
+    while _units(line) > limit:
+        cut = limit
+        while _units(line[:cut]) > limit:
+            cut -= 1
+        space = line.rfind(" ", 0, cut)
+        cut = space + 1 if space > limit // 2 else cut
+        parts.append(line[:cut].rstrip())
+        line = line[cut:]
+    return parts + [line]
+
+
+def split_message(text: str, limit: int = TELEGRAM_MAX_CHARS) -> List[str]:
+    """Chunks of at most `limit` units, split between lines; open ``` blocks are closed and reopened."""
+    budget = limit - _units("\n" + FENCE)  # room to close a code block
+    chunks: List[str] = []
+    current: List[str] = []
+    size = 0
+    fence = ""  # opening line of the code block we are in, if any
+    for line in text.split("\n"):
+        for piece in _split_long_line(line, budget) if _units(line) > budget else [line]:
+            add = _units(piece) + (1 if current else 0)
+            if current and size + add > budget:
+                chunks.append("\n".join(current + ([FENCE] if fence else [])))
+                current = [fence] if fence else []
+                size = _units(fence)
+                add = _units(piece) + (1 if current else 0)
+            current.append(piece)
+            size += add
+        if line.startswith(FENCE):
+            fence = "" if fence else line
+    if any(ln.strip() for ln in current):
+        chunks.append("\n".join(current))
+    return [c for c in (c.strip("\n") for c in chunks) if c]
+
+
+# Markup the report means (in this order): **bold**, `code`, [text](url).
+MARKUP_RE = re.compile(r"\*\*(?P<bold>[^*\n]+?)\*\*|(?P<code>`[^`\n]+`)|(?P<link>\[[^\]\n]+\]\([^()\s]+\))")
+MARKDOWN_SPECIAL_RE = re.compile(r"([_*`\[])")
+
+
+def _escape_markdown(text: str) -> str:
+    return MARKDOWN_SPECIAL_RE.sub(r"\\\1", text)
+
+
+def to_telegram_markdown(text: str) -> str:
+    """Report Markdown as Telegram's legacy Markdown.
+
+    **bold** becomes *bold*; `code`, [text](url) and ``` blocks are kept; any
+    other '_', '*', '`' or '[' (e.g. in a skill name or summary) is escaped
+    so it is shown literally. '#' headings stay literal.
+    """
+    out: List[str] = []
+    in_fence = False
+    for line in text.split("\n"):
+        if line.startswith(FENCE):
+            in_fence = not in_fence
+            out.append(line)
+            continue
+        if in_fence:
+            out.append(line)
+            continue
+        parts, pos = [], 0
+        for m in MARKUP_RE.finditer(line):
+            parts.append(_escape_markdown(line[pos : m.start()]))
+            parts.append(f"*{m.group('bold')}*" if m.group("bold") is not None else m.group(0))
+            pos = m.end()
+        parts.append(_escape_markdown(line[pos:]))
+        out.append("".join(parts))
+    return "\n".join(out)
+
+
+class TelegramSender:
+    """Bot API client over a pool of keep-alive connections (safe to share between threads)."""
+
+    def __init__(
+        self,
+        token: str,
+        api_base: str = TELEGRAM_API_BASE,
+        pool_size: int = TELEGRAM_POOL_SIZE,
+        timeout: float = TELEGRAM_TIMEOUT_S,
+    ) -> None:
+        parts = urlsplit(api_base)
+        self.scheme = parts.scheme or "https"
+        self.host = parts.hostname or "api.telegram.org"
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.token = token
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.connections_opened = 0
+        self.requests = 0
+        self._count_lock = threading.Lock()
+        self._pool: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(maxsize=pool_size)
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        with self._count_lock:
+            self.connections_opened += 1
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def _release(self, conn: http.client.HTTPConnection) -> None:
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _post(self, method: str, payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any], Optional[str]]:
+        """POST a Bot API method; returns (status, JSON body, Retry-After header). Status 0 is a transport error."""
+        url = f"{self.prefix}/bot{self.token}/{method}"
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        # A pooled connection may have been closed by the server while idle;
+        # retry exactly once on a fresh connection in that case.
+        for attempt in (1, 2):
+            try:
+                conn = self._pool.get_nowait() if attempt == 1 else self._new_connection()
+            except queue.Empty:
+                conn = self._new_connection()
+            reused = conn.sock is not None
+            try:
+                with self._count_lock:
+                    self.requests += 1
+                conn.request("POST", url, body=body, headers=headers)
+                resp = conn.getresponse()
+                raw = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError, http.client.BadStatusLine) as e:
+                conn.close()
+                if reused and attempt == 1:
+                    continue
+                return 0, {"description": f"http error: {e}"}, None
+            except (socket.timeout, OSError, http.client.HTTPException) as e:
+                conn.close()
+                return 0, {"description": f"http error: {e}"}, None
+            if resp.will_close:
+                conn.close()
+            else:
+                self._release(conn)
+            try:
+                data = json.loads(raw.decode("utf-8"))
+            except ValueError:
+                data = {"description": raw.decode("utf-8", "replace").strip()[:200]}
+            return resp.status, data if isinstance(data, dict) else {}, resp.getheader("Retry-After")
+        return 0, {"description": "http error: connection retry exhausted"}, None
+
+    def send_message(self, chat_id: str, text: str, parse_mode: str = TELEGRAM_PARSE_MODE) -> Optional[str]:
+        """Send one message; returns an error string or None."""
+        payload: Dict[str, Any] = {"chat_id": chat_id, "text": text, "disable_web_page_preview": True}
+        if parse_mode:
+            payload["parse_mode"] = parse_mode
+        retries = 0
+        while True:
+            status, data, retry_header = self._post("sendMessage", payload)
+            if status == 200 and data.get("ok"):
+                return None
+            description = str(data.get("description") or f"HTTP {status}")
+            if status == 429 and retries < TELEGRAM_MAX_RETRIES:
+                wait_s = (data.get("parameters") or {}).get("retry_after")
+                if wait_s is None:
+                    wait_s = parse_retry_after(retry_header) or parse_retry_after(description) or 1.0
+                if float(wait_s) <= TELEGRAM_MAX_RETRY_AFTER_S:
+                    retries += 1
+                    time.sleep(float(wait_s))
+                    continue
+            if status == 400 and "parse" in description.lower() and "parse_mode" in payload:
+                # Markdown the Bot API rejects (e.g. a lone '_' in a file name): send as plain text.
+                del payload["parse_mode"]
+                continue
+            return f"{status}: {description}"
+
+    def send_chunks(self, chat_id: str, chunks: Sequence[str], parse_mode: str = TELEGRAM_PARSE_MODE) -> Optional[str]:
+        """Send chunks in order, stopping at the first failure."""
+        for i, chunk in enumerate(chunks, 1):
+            err = self.send_message(chat_id, chunk, parse_mode)
+            if err:
+                return f"chunk {i}/{len(chunks)}: {err}"
+        return None
+
+    def send_report(
+        self, chat_ids: Sequence[str], text: str, parse_mode: str = TELEGRAM_PARSE_MODE
+    ) -> Dict[str, Optional[str]]:
+        """Send `text` to every chat concurrently; returns {chat_id: error or None}."""
+        if parse_mode == "Markdown":
+            text = to_telegram_markdown(text)
+        chunks = split_message(text)
+        if not chat_ids or not chunks:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.pool_size, len(chat_ids)), thread_name_prefix="telegram") as pool:
+            futures = {chat: pool.submit(self.send_chunks, chat, chunks, parse_mode) for chat in chat_ids}
+            return {chat: f.result() for chat, f in futures.items()}
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Send the ClawHub Monitor report to Telegram")
+    parser.add_argument("report", nargs="?", type=Path, default=REPORT_FILE)
+    parser.add_argument("--dry-run", action="store_true", help="print the message chunks instead of sending")
+    args = parser.parse_args(argv)
+
+    if not args.report.exists():
+        print(f"Report not found: {args.report}")
+        return 1
+    content = args.report.read_text(encoding="utf-8")
+
+    if args.dry_run:
+        chunks = split_message(to_telegram_markdown(content) if TELEGRAM_PARSE_MODE == "Markdown" else content)
+        for i, chunk in enumerate(chunks, 1):
+            print(f"----- chunk {i}/{len(chunks)} ({_units(chunk)} units) -----\n{chunk}")
+        return 0
+    if not (TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_IDS):
+        # Not configured: print report content for the calling process to handle
+        print(content)
+        return 0
+
+    sender = TelegramSender(TELEGRAM_BOT_TOKEN)
+    started = time.monotonic()
+    try:
+        results = sender.send_report(TELEGRAM_CHAT_IDS, content)
+    finally:
+        sender.close()
+    failed = {chat: err for chat, err in results.items() if err}
+    for chat, err in failed.items():
+        print(f"Telegram send to {chat} failed: {err}", file=sys.stderr)
+    print(
+        f"Telegram: sent to {len(results) - len(failed)}/{len(results)} chat(s) in {time.monotonic() - started:.1f}s "
+        f"({sender.requests} request(s), {sender.connections_opened} connection(s))"
+    )
+    return 1 if failed else 0
+
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
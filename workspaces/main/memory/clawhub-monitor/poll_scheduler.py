@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Adaptive polling interval for `monitor.py --watch`
+
+- Tracks the new-skill arrival rate as an EWMA of (new skills / elapsed s);
+  the first poll only sets the baseline, since its new skills are the
+  backlog since the last run, not arrivals over one interval (the rate can
+  be seeded from a previous process instead)
+- Next interval aims for about `target_per_poll` new skills per poll, so busy
+  periods are polled often and quiet ones rarely; always within [min_s, max_s]
+- Polls that find nothing stretch the interval by `idle_growth`; failed polls
+  back off by `error_growth`
+- A caller-supplied minimum wait (e.g. a rate-limit cool-down) always wins
+  over the computed interval, even beyond max_s
+"""
+
+import time
+from typing import Optional
+
+
+class AdaptiveInterval:
+    def __init__(
+        self,
+        min_s: float,
+        max_s: float,
+        target_per_poll: float = 1.0,
+        alpha: float = 0.3,
+        idle_growth: float = 1.5,
+        error_growth: float = 2.0,
+        rate: float = 0.0,
+    ) -> None:
+        self.min_s = min_s
+        self.max_s = max_s
+        self.target_per_poll = target_per_poll
+        self.alpha = alpha
+        self.idle_growth = idle_growth
+        self.error_growth = error_growth
+        self.rate = rate  # new skills per second (EWMA)
+        self.interval = min_s
+        self._last_poll: Optional[float] = None
+
+    def _clamp(self, seconds: float) -> float:
+        return max(self.min_s, min(self.max_s, seconds))
+
+    def observe(self, new_skills: int, ok: bool = True, now: Optional[float] = None) -> float:
+        """Feed one poll's outcome; returns the seconds to wait before the next poll."""
+        now = time.time() if now is None else now
+        first = self._last_poll is None
+        elapsed = (now - self._last_poll) if self._last_poll is not None else self.interval
+        self._last_poll = now
+        if not ok:
+            self.interval = self._clamp(self.interval * self.error_growth)
+            return self.interval
+        if not first:
+            observed = new_skills / max(elapsed, 1.0)
+            self.rate = self.alpha * observed + (1 - self.alpha) * self.rate
+        if new_skills:
+            self.interval = self._clamp(self.target_per_poll / self.rate if self.rate > 0 else self.min_s)
+        else:
+            by_rate = self.target_per_poll / self.rate if self.rate > 0 else self.max_s
+            self.interval = self._clamp(min(by_rate, self.interval * self.idle_growth))
+        return self.interval
+
+    def wait_for(self, at_least_s: float = 0.0) -> float:
+        """Seconds until the next poll: the interval, or `at_least_s` if longer (not capped by max_s)."""
+        return max(self.interval, at_least_s)
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Typed daily report model, independent of any output format
+
+- monitor.py builds one DailyReport per run (the only step that calls
+  ClawHub); report_render.py turns it into Telegram Markdown, plain text,
+  JSON or HTML
+- The JSON form is written next to the report (daily_report.json) and loads
+  back with DailyReport.from_dict, so a report can be re-rendered or sent to
+  another channel without fetching anything
+- Plain dataclasses with explicit __slots__ (dataclass(slots=True) needs
+  Python 3.10)
+"""
+
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List
+
+SUCCESS_WITH_NEW = "success_with_new"
+SUCCESS_NO_NEW = "success_no_new"
+FETCH_FAILED = "fetch_failed"
+
+
+@dataclass
+class SkillCard:
+    """One Top-N skill; `pending` cards missed the report deadline and only carry the explore line (`raw`)."""
+
+    __slots__ = (
+        "rank",
+        "slug",
+        "display",
+        "link",
+        "summary",
+        "type_tags",
+        "opportunities",
+        "deps",
+        "owner",
+        "downloads",
+        "stars",
+        "pending",
+        "raw",
+    )
+    rank: int
+    slug: str
+    display: str
+    link: str
+    summary: str
+    type_tags: List[str]
+    opportunities: List[str]
+    deps: str
+    owner: str
+    downloads: int
+    stars: int
+    pending: bool
+    raw: str
+
+
+@dataclass
+class ChangeRow:
+    __slots__ = ("name", "old", "new")
+    name: str
+    old: Any
+    new: Any
+
+
+@dataclass
+class ChangeGroup:
+    """Changes of one kind (skill_diff), at most REPORT_CHANGES_MAX rows out of `total`."""
+
+    __slots__ = ("kind", "title", "total", "rows")
+    kind: str
+    title: str
+    total: int
+    rows: List[ChangeRow]
+
+
+@dataclass
+class GrowthRow:
+    __slots__ = ("name", "velocity", "acceleration", "downloads", "stars")
+    name: str
+    velocity: float
+    acceleration: float
+    downloads: int
+    stars: int
+
+
+@dataclass
+class DailyReport:
+    __slots__ = (
+        "date",
+        "generated_at",
+        "timezone",
+        "source",
+        "status",
+        "reason",
+        "new_count",
+        "skills",
+        "changes",
+        "events_file",
+        "growth",
+        "growth_days",
+        "config",
+    )
+    date: str
+    generated_at: str
+    timezone: str
+    source: str
+    status: str
+    reason: str
+    new_count: int
+    skills: List[SkillCard]
+    changes: List[ChangeGroup]
+    events_file: str
+    growth: List[GrowthRow]
+    growth_days: float
+    config: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DailyReport":
+        fields = dict(data)
+        fields["skills"] = [SkillCard(**s) for s in data.get("skills") or []]
+        fields["changes"] = [
+            ChangeGroup(g["kind"], g["title"], g["total"], [ChangeRow(**r) for r in g.get("rows") or []])
+            for g in data.get("changes") or []
+        ]
+        fields["growth"] = [GrowthRow(**g) for g in data.get("growth") or []]
+        return cls(**fields)
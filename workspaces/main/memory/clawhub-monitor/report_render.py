@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""Render a DailyReport (report_model.py) as Telegram Markdown, plain text, JSON or HTML
+
+- The Top-N skill layout comes from CLAW_HUB_DAILY_TOP5_TEMPLATE.md: the
+  block from the "1️⃣" line up to the "2️⃣" line is compiled once per file
+  version into per-line format strings
+- Template placeholders: {owner} {downloads} {stars} {skill} {简介…}
+  {依赖…}/{deps}, "Skill 名称" for the display name and the
+  https://clawhub.ai/{owner}/{skill} link; numbered placeholders are lists:
+  several on one line ({tag1}｜{tag2}) join inline with the separator between
+  them, one per line ({机会点1}) repeats that line per item. `<br>` marks are
+  dropped (lines already break)
+- Text and HTML are derived from the Telegram Markdown, so every format shows
+  the same template-driven content; JSON is the model itself
+- Rendering never touches ClawHub:
+  python3 report_render.py daily_report.json --format html
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from report_model import FETCH_FAILED, SUCCESS_NO_NEW, DailyReport, SkillCard
+
+# Used when the template file is missing (same item layout as templates/CLAW_HUB_DAILY_TOP5_TEMPLATE.md).
+DEFAULT_TEMPLATE = """## 1️⃣ [Skill 名称](https://clawhub.ai/{owner}/{skill})
+
+```text
+👤 {owner} | 📥 {downloads} | ⭐ {stars}
+🏷️ `{tag1}`｜`{tag2}`｜`{tag3}`
+```
+{简介，<=200字，一段话说明解决什么问题/怎么工作}
+- {机会点1}
+- {机会点2}
+- {机会点3}
+依赖：{依赖}
+
+## 2️⃣ ...
+"""
+
+FIRST_ITEM = "1️⃣"
+SECOND_ITEM = "2️⃣"
+LINK_PLACEHOLDER = "https://clawhub.ai/{owner}/{skill}"
+NAME_PLACEHOLDER = "Skill 名称"
+PLACEHOLDER_RE = re.compile(r"\{([^{}]*)\}")
+NUMBERED_RE = re.compile(r"^(.*?)(\d+)$")
+# Placeholder name (or its leading word) -> SkillCard field.
+FIELDS = {
+    "rank": "rank",
+    "link": "link",
+    "display": "display",
+    "owner": "owner",
+    "downloads": "downloads",
+    "stars": "stars",
+    "skill": "slug",
+    "slug": "slug",
+    "简介": "summary",
+    "summary": "summary",
+    "依赖": "deps",
+    "deps": "deps",
+}
+LIST_FIELDS = {"tag": "type_tags", "机会点": "opportunities", "opportunity": "opportunities"}
+LIST_EMPTY = {"type_tags": "uncategorized", "opportunities": "（暂无）"}
+
+
+def _field_for(placeholder: str) -> Optional[str]:
+    name = re.split(r"[，,<（(\s]", placeholder.strip(), 1)[0]
+    return FIELDS.get(name)
+
+
+def _escape(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+def _format_line(line: str) -> str:
+    """Literal text escaped, known placeholders turned into {field}."""
+    out, pos = [], 0
+    for m in PLACEHOLDER_RE.finditer(line):
+        field = _field_for(m.group(1))
+        if field is None:
+            raise ValueError(f"unknown placeholder {m.group(0)} in report template")
+        out.append(_escape(line[pos : m.start()]) + "{" + field + "}")
+        pos = m.end()
+    return "".join(out) + _escape(line[pos:])
+
+
+class _Line:
+    """One compiled template line: plain, an inline list, or a line repeated per list item."""
+
+    def __init__(self, fmt: str, list_field: str = "", repeat: bool = False, wrap: Tuple[str, str, str] = ("", "", "")):
+        self.fmt = fmt
+        self.list_field = list_field
+        self.repeat = repeat
+        self.pre, self.sep, self.post = wrap
+
+    def render(self, values: Dict[str, object], card: SkillCard) -> List[str]:
+        if not self.list_field:
+            return [self.fmt.format(**values)]
+        items = list(getattr(card, self.list_field) or []) or [LIST_EMPTY[self.list_field]]
+        if self.repeat:
+            return [self.fmt.format(item=item, **values) for item in items]
+        joined = self.sep.join(f"{self.pre}{item}{self.post}" for item in items)
+        return [self.fmt.format(items=joined, **values)]
+
+
+def _compile_line(line: str) -> Optional[_Line]:
+    """None for lines that only continue a list ({机会点2}, …)."""
+    line = line.replace("<br>", "").rstrip()
+    line = line.replace(LINK_PLACEHOLDER, "{link}").replace(NAME_PLACEHOLDER, "{display}").replace(FIRST_ITEM, "{rank}")
+    numbered = []
+    for m in PLACEHOLDER_RE.finditer(line):
+        n = NUMBERED_RE.match(m.group(1).strip())
+        if n and n.group(1) in LIST_FIELDS:
+            numbered.append((m, LIST_FIELDS[n.group(1)], int(n.group(2))))
+    if not numbered:
+        return _Line(_format_line(line))
+    fields = {f for _, f, _ in numbered}
+    if len(fields) > 1:
+        raise ValueError(f"report template line mixes lists: {line!r}")
+    field = fields.pop()
+    if len(numbered) == 1:
+        m, _, n = numbered[0]
+        if n != 1:
+            return None
+        return _Line(_format_line(line[: m.start()]) + "{item}" + _format_line(line[m.end() :]), field, repeat=True)
+    # Inline list: "`{tag1}`｜`{tag2}`" -> item wrap "`…`", separator "｜".
+    first, last = numbered[0][0], numbered[-1][0]
+    pre = re.search(r"(\S*)$", line[: first.start()]).group(1)
+    post = re.match(r"\S*", line[last.end() :]).group(0)
+    between = line[first.end() : numbered[1][0].start()]
+    if not (between.startswith(post) and between.endswith(pre)) or len(between) < len(pre) + len(post):
+        raise ValueError(f"cannot read the list separator in report template line {line!r}")
+    sep = between[len(post) : len(between) - len(pre)]
+    head, tail = line[: first.start() - len(pre)], line[last.end() + len(post) :]
+    return _Line(_format_line(head) + "{items}" + _format_line(tail), field, wrap=(pre, sep, post))
+
+
+class ItemTemplate:
+    def __init__(self, text: str) -> None:
+        lines = text.splitlines()
+        start = next((i for i, ln in enumerate(lines) if FIRST_ITEM in ln), None)
+        if start is None:
+            raise ValueError(f"report template has no {FIRST_ITEM} item")
+        end = next((i for i in range(start + 1, len(lines)) if SECOND_ITEM in lines[i]), len(lines))
+        block = lines[start:end]
+        while block and not block[-1].replace("<br>", "").strip(" >"):
+            block.pop()
+        self.fingerprint = hashlib.sha256("\n".join(block).encode("utf-8")).hexdigest()[:16]
+        self._lines = [c for c in (_compile_line(ln) for ln in block) if c is not None]
+
+    def render(self, card: SkillCard) -> str:
+        values = {f: getattr(card, f) for f in set(FIELDS.values()) if f != "rank"}
+        values["rank"] = f"{card.rank}️⃣"
+        out: List[str] = []
+        for line in self._lines:
+            out.extend(line.render(values, card))
+        return "\n".join(out)
+
+
+_COMPILED: Dict[str, Tuple[Tuple[int, int], ItemTemplate]] = {}
+
+
+def load_item_template(path: Optional[Path]) -> ItemTemplate:
+    """Compiled template for `path`, recompiled only when the file changes; the built-in one if it is missing.
+
+    Raises ValueError for a template that cannot be compiled.
+    """
+    try:
+        st = os.stat(path) if path else None
+    except OSError:
+        st = None
+    if st is None:
+        key, stamp, read = "", (0, 0), lambda: DEFAULT_TEMPLATE
+    else:
+        key, stamp, read = str(path), (st.st_mtime_ns, st.st_size), lambda: Path(path).read_text(encoding="utf-8")
+    cached = _COMPILED.get(key)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, ItemTemplate(read()))
+        _COMPILED[key] = cached
+    return cached[1]
+
+
+def _change_lines(report: DailyReport) -> List[str]:
+    if not report.changes:
+        return []
+    lines = ["", "## 🔄 已知技能变更", ""]
+    for group in report.changes:
+        lines.append(f"**{group.title}**（{group.total}）")
+        for row in group.rows:
+            if group.kind == "version_bump":
+                lines.append(f"- `{row.name}` v{row.old} → v{row.new}")
+            elif group.kind == "summary_changed":
+                lines.append(f"- `{row.name}` {row.new}")
+            elif group.kind == "downloads_delta":
+                lines.append(f"- `{row.name}` downloads {row.old} → {row.new}（{row.new - row.old:+d}）")
+            else:
+                lines.append(f"- `{row.name}`")
+        if group.total > len(group.rows):
+            lines.append(f"- …还有 {group.total - len(group.rows)} 项（见 {report.events_file}）")
+        lines.append("")
+    return lines
+
+
+def _growth_lines(report: DailyReport) -> List[str]:
+    if not report.growth:
+        return []
+    lines = ["", f"## 🚀 增长最快（Top{len(report.growth)}，近 {report.growth_days:g} 天）", ""]
+    for i, g in enumerate(report.growth, 1):
+        lines.append(
+            f"{i}. `{g.name}` +{g.velocity:.1f}/天（加速 {g.acceleration:+.1f}） downloads: {g.downloads} | stars: {g.stars}"
+        )
+    lines.append("")
+    return lines
+
+
+def render_telegram(report: DailyReport, template: Optional[ItemTemplate] = None) -> str:
+    template = template or load_item_template(None)
+    lines = [
+        f"# 📦 ClawHub 日报（Top5）- {report.date}",
+        "",
+        f"⏰ Generated: {report.generated_at}",
+        f"🌏 Timezone: {report.timezone}",
+        f"📡 Source: {report.source}",
+        f"🏷️ State: {report.status}",
+        "",
+    ]
+    if report.status == FETCH_FAILED:
+        lines.extend(
+            [
+                "## ⚠️ 抓取失败",
+                "",
+                "本次未能拿到可用的 skill 列表（这不等同于‘今日无新增’）。",
+                "",
+                f"**Reason:** `{report.reason or 'unknown'}`",
+                "",
+                "建议：",
+                "- 稍后重试（避开高峰）",
+                "- 观察是否触发 Rate limit",
+                "- 保持 fallback_skills.json 有上次成功快照",
+            ]
+        )
+    elif report.status == SUCCESS_NO_NEW:
+        lines.extend(["## 📝 今日无新增", "", "抓取成功，但当日未发现新增技能。"])
+    else:
+        lines.extend(["## 🆕 今日新增（Top5）", "", f"Found **{report.new_count}** new skill(s) today.", ""])
+        for card in report.skills:
+            if card.pending:
+                # Missed the report deadline: what explore listed.
+                lines.append(f"{card.rank}️⃣ {card.raw or card.slug} **详情:** ⏳ 补全中")
+            else:
+                lines.append(template.render(card))
+            lines.append("")
+
+    if report.status != FETCH_FAILED:
+        lines.extend(_change_lines(report))
+        lines.extend(_growth_lines(report))
+
+    lines.extend(["---", "", "📊 Monitor Configuration:"])
+    lines.extend(f"- {c}" for c in report.config)
+    lines.extend(["", "_This is an automated report from ClawHub Skill Monitor_"])
+    return "\n".join(lines)
+
+
+MD_LINK_RE = re.compile(r"\[([^\]]*)\]\(([^)]*)\)")
+MD_BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+MD_CODE_RE = re.compile(r"`([^`]+)`")
+MD_EM_LINE_RE = re.compile(r"^_(.+)_$")
+
+
+def render_text(report: DailyReport, template: Optional[ItemTemplate] = None) -> str:
+    out = []
+    for line in render_telegram(report, template).split("\n"):
+        if line.startswith("```"):
+            continue
+        line = MD_LINK_RE.sub(lambda m: f"{m.group(1)} ({m.group(2)})" if m.group(2) else m.group(1), line)
+        line = MD_CODE_RE.sub(r"\1", MD_BOLD_RE.sub(r"\1", line))
+        line = MD_EM_LINE_RE.sub(r"\1", line.lstrip("#").strip() if line.startswith("#") else line)
+        out.append(line)
+    return "\n".join(out)
+
+
+def render_json(report: DailyReport, template: Optional[ItemTemplate] = None) -> str:
+    return json.dumps(report.to_dict(), ensure_ascii=False, indent=1)
+
+
+def _inline_html(text: str) -> str:
+    text = html.escape(text, quote=False)
+    text = MD_CODE_RE.sub(r"<code>\1</code>", text)
+    text = MD_BOLD_RE.sub(r"<strong>\1</strong>", text)
+    text = MD_LINK_RE.sub(lambda m: f'<a href="{m.group(2)}">{m.group(1)}</a>' if m.group(2) else m.group(1), text)
+    return MD_EM_LINE_RE.sub(r"<em>\1</em>", text)
+
+
+def render_html(report: DailyReport, template: Optional[ItemTemplate] = None) -> str:
+    body: List[str] = []
+    in_list = in_pre = False
+    for line in render_telegram(report, template).split("\n"):
+        if line.startswith("```"):
+            body.append("</pre>" if in_pre else "<pre>")
+            in_pre = not in_pre
+            continue
+        if in_pre:
+            body.append(html.escape(line, quote=False))
+            continue
+        if in_list and not line.startswith("- "):
+            body.append("</ul>")
+            in_list = False
+        heading = re.match(r"^(#{1,3}) (.*)$", line)
+        if heading:
+            level = len(heading.group(1))
+            body.append(f"<h{level}>{_inline_html(heading.group(2))}</h{level}>")
+        elif line.startswith("- "):
+            if not in_list:
+                body.append("<ul>")
+                in_list = True
+            body.append(f"<li>{_inline_html(line[2:])}</li>")
+        elif line == "---":
+            body.append("<hr>")
+        elif line:
+            body.append(f"<p>{_inline_html(line)}</p>")
+    if in_list:
+        body.append("</ul>")
+    title = html.escape(f"ClawHub 日报 {report.date}")
+    return (
+        '<!DOCTYPE html>\n<html lang="zh">\n<head><meta charset="utf-8"><title>'
+        + title
+        + "</title></head>\n<body>\n"
+        + "\n".join(body)
+        + "\n</body>\n</html>\n"
+    )
+
+
+RENDERERS: Dict[str, Callable[[DailyReport, Optional[ItemTemplate]], str]] = {
+    "telegram": render_telegram,
+    "text": render_text,
+    "json": render_json,
+    "html": render_html,
+}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Re-render a saved ClawHub report model")
+    parser.add_argument("model", type=Path, help="daily_report.json written by monitor.py")
+    parser.add_argument("--format", choices=sorted(RENDERERS), default="telegram")
+    parser.add_argument("--template", type=Path, help="CLAW_HUB_DAILY_TOP5_TEMPLATE.md (default: built-in)")
+    args = parser.parse_args(argv)
+    report = DailyReport.from_dict(json.loads(args.model.read_text(encoding="utf-8")))
+    sys.stdout.write(RENDERERS[args.format](report, load_item_template(args.template)) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
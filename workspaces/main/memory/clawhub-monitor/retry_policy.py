@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Latency-aware retry policy for ClawHub calls
+
+- LatencyHistory keeps the last N latencies per operation (explore, inspect,
+  ...) and persists them between runs as compact JSON
+- RetryPolicy derives per-attempt timeouts from the observed p99 (× margin),
+  clamped to [min_timeout_s, max_timeout_s], with the sum of timeouts bounded
+  by budget_s; until enough samples exist it uses the static defaults
+- hedge_after() returns the p95 latency: a first attempt slower than that gets
+  a parallel second attempt, and whichever answers first wins
+"""
+
+import json
+import math
+import random
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from atomic_io import atomic_write_text
+
+
+class LatencyHistory:
+    def __init__(self, path: Path, max_samples: int = 200) -> None:
+        self.path = path
+        self.max_samples = max_samples
+        self.samples: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                self.samples = {k: [float(x) for x in v][-max_samples:] for k, v in data.items()}
+            except (ValueError, AttributeError, TypeError):
+                self.samples = {}
+
+    def record(self, op: str, seconds: float) -> None:
+        with self._lock:
+            values = self.samples.setdefault(op, [])
+            values.append(round(seconds, 3))
+            del values[: -self.max_samples]
+
+    def percentile(self, op: str, q: float, min_samples: int = 1) -> Optional[float]:
+        """Nearest-rank percentile (q in 0..1), or None with too few samples."""
+        with self._lock:
+            values = sorted(self.samples.get(op) or [])
+        if len(values) < min_samples or not values:
+            return None
+        rank = max(0, min(len(values) - 1, math.ceil(q * len(values)) - 1))
+        return values[rank]
+
+    def dumps(self) -> str:
+        with self._lock:
+            return json.dumps(self.samples, separators=(",", ":"))
+
+    def save(self) -> None:
+        atomic_write_text(self.path, self.dumps())
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        history: LatencyHistory,
+        default_timeouts: List[float],
+        margin: float = 1.5,
+        min_timeout_s: float = 10.0,
+        max_timeout_s: float = 240.0,
+        budget_s: float = 300.0,
+        min_samples: int = 5,
+    ) -> None:
+        self.history = history
+        self.default_timeouts = list(default_timeouts)
+        self.margin = margin
+        self.min_timeout_s = min_timeout_s
+        self.max_timeout_s = max_timeout_s
+        self.budget_s = budget_s
+        self.min_samples = min_samples
+
+    def _clamp(self, seconds: float) -> float:
+        return round(max(self.min_timeout_s, min(self.max_timeout_s, seconds)), 1)
+
+    def timeouts(self, op: str) -> List[float]:
+        """Per-attempt timeouts; each retry doubles, all within budget_s."""
+        p99 = self.history.percentile(op, 0.99, self.min_samples)
+        if p99 is None:
+            planned = self.default_timeouts
+        else:
+            first = self._clamp(p99 * self.margin)
+            planned = [first, self._clamp(first * 2), self._clamp(first * 4)]
+        out: List[float] = []
+        for t in planned:
+            if out and sum(out) + t > self.budget_s:
+                break
+            out.append(t)
+        return out
+
+    def timeout(self, op: str, default: float) -> float:
+        """Single-attempt timeout for `op` (inspect calls)."""
+        p99 = self.history.percentile(op, 0.99, self.min_samples)
+        return default if p99 is None else self._clamp(p99 * self.margin)
+
+    def hedge_after(self, op: str) -> Optional[float]:
+        return self.history.percentile(op, 0.95, self.min_samples)
+
+    def backoff(self, op: str, attempt: int) -> float:
+        """Jittered exponential backoff scaled to the typical (p50) latency."""
+        p50 = self.history.percentile(op, 0.5, self.min_samples)
+        base = 1.0 if p50 is None else max(0.5, min(4.0, p50 / 4))
+        return round(base * (2 ** (attempt - 1)) * random.uniform(0.6, 1.4), 2)
@@ -5,26 +5,72 @@
 WORK_DIR="/home/administrator/.openclaw/workspace/memory/clawhub-monitor"
 REPORT_FILE="$WORK_DIR/daily_report.md"
 LOG_FILE="$WORK_DIR/notify.log"
+# notify.log is rotated like monitor.log: 5 MB per file, 5 archives.
+LOG_MAX_BYTES=$((5 * 1024 * 1024))
+LOG_BACKUPS=5
 
 # Change to work directory
 cd "$WORK_DIR" || exit 1
 
+# Telegram settings (TELEGRAM_BOT_TOKEN, TELEGRAM_CHAT_IDS, optional
+# TELEGRAM_API_BASE) come from the environment or telegram.env here.
+if [ -f "$WORK_DIR/telegram.env" ]; then
+    set -a
+    . "$WORK_DIR/telegram.env"
+    set +a
+fi
+
+# --send: called by monitor.py (CLAWHUB_REPORT_READY_CMD) as soon as the
+# report is written, i.e. before it waits for late enrichment calls. It only
+# runs when this run produced the report (not when another monitor held the
+# lock), and leaves REPORT_READY_MARKER behind to say so.
+if [ "$1" = "--send" ]; then
+    [ -n "$REPORT_READY_MARKER" ] && : >"$REPORT_READY_MARKER"
+    if [ -n "$TELEGRAM_BOT_TOKEN" ] && [ -n "$TELEGRAM_CHAT_IDS" ]; then
+        /usr/bin/python3 notify.py "$REPORT_FILE" >>"$LOG_FILE" 2>&1
+        echo "[$(date)] Telegram notify exit code: $?" >>"$LOG_FILE"
+    else
+        echo "[$(date)] TELEGRAM_BOT_TOKEN/TELEGRAM_CHAT_IDS not set; report not sent" >>"$LOG_FILE"
+    fi
+    exit 0
+fi
+
+rotate_log() {
+    local file="$1" size i
+    [ -f "$file" ] || return 0
+    size=$(stat -c %s "$file" 2>/dev/null || echo 0)
+    [ "$size" -ge "$LOG_MAX_BYTES" ] || return 0
+    rm -f "$file.$LOG_BACKUPS"
+    for ((i = LOG_BACKUPS - 1; i >= 1; i--)); do
+        [ -f "$file.$i" ] && mv "$file.$i" "$file.$((i + 1))"
+    done
+    mv "$file" "$file.1"
+}
+
+rotate_log "$LOG_FILE"
+# One handle for the whole run instead of reopening the log for every line.
+exec 3>>"$LOG_FILE"
+
 # Run monitor
-echo "[$(date)] Running monitor..." >> "$LOG_FILE"
-/usr/bin/python3 monitor.py >> "$LOG_FILE" 2>&1
+REPORT_READY_MARKER="$WORK_DIR/.report_ready.$$"
+rm -f "$REPORT_READY_MARKER"
+echo "[$(date)] Running monitor..." >&3
+REPORT_READY_MARKER="$REPORT_READY_MARKER" CLAWHUB_REPORT_READY_CMD="/bin/bash $(printf '%q' "$(readlink -f "$0")") --send" /usr/bin/python3 monitor.py >&3 2>&1
 MONITOR_EXIT=$?
 
-echo "[$(date)] Monitor exit code: $MONITOR_EXIT" >> "$LOG_FILE"
+echo "[$(date)] Monitor exit code: $MONITOR_EXIT" >&3
+
+# Check if this run generated the report (it was sent to Telegram by --send above)
+if [ -f "$REPORT_READY_MARKER" ] && [ -f "$REPORT_FILE" ]; then
+    echo "[$(date)] Report ready: $REPORT_FILE" >&3
 
-# Check if report was generated
-if [ -f "$REPORT_FILE" ]; then
-    # For now, just log that report is ready
-    # When Gateway is fixed, this can send to Telegram
-    echo "[$(date)] Report ready: $REPORT_FILE" >> "$LOG_FILE"
-    
     # Display report summary to stdout (for cron email if configured)
     echo "=== ClawHub Monitor Report ==="
     head -20 "$REPORT_FILE"
+else
+    echo "[$(date)] No report from this run; nothing sent" >&3
 fi
+rm -f "$REPORT_READY_MARKER"
 
-echo "[$(date)] Done" >> "$LOG_FILE"
+echo "[$(date)] Done" >&3
+exec 3>&-
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Structured, buffered run log for monitor.py
+
+- One JSON object per line: ts, level, run_id, stage, msg, plus any extra
+  fields passed by the caller (duration_s, skills, ...)
+- The file handle stays open; records are buffered and written every
+  `buffer_records` records, immediately on warnings/errors, and at exit
+- Size-based rotation with a bounded number of archives (monitor.log.1 ...)
+- A plain "[time] msg" copy goes to stdout (cron mail / notify.log); events
+  logged with console=False are file-only
+"""
+
+import json
+import logging
+import logging.handlers
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+LOGGER_NAME = "clawhub_monitor"
+LEVELS = {"debug": logging.DEBUG, "info": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+
+
+class JsonLineFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "run_id": getattr(record, "run_id", ""),
+            "stage": getattr(record, "stage", None),
+            "msg": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class ConsoleFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        return f"[{datetime.fromtimestamp(record.created):%Y-%m-%d %H:%M:%S}] {record.getMessage()}"
+
+
+def _wants_console(record: logging.LogRecord) -> bool:
+    return getattr(record, "console", True)
+
+
+class RunLog:
+    def __init__(
+        self,
+        path: Path,
+        max_bytes: int,
+        backups: int,
+        buffer_records: int,
+        stage: Optional[Callable[[], Optional[str]]] = None,
+    ) -> None:
+        self.path = path
+        self.run_id = ""
+        self._stage = stage
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = logging.handlers.RotatingFileHandler(
+            str(path), maxBytes=max_bytes, backupCount=backups, encoding="utf-8"
+        )
+        self._file.setFormatter(JsonLineFormatter())
+        self._buffer = logging.handlers.MemoryHandler(
+            buffer_records, flushLevel=logging.WARNING, target=self._file, flushOnClose=True
+        )
+        self._console = logging.StreamHandler(sys.stdout)
+        self._console.setFormatter(ConsoleFormatter())
+        self._console.addFilter(_wants_console)
+        # A dedicated, non-propagating logger: nothing else in the process
+        # (root handlers, library loggers) ends up in monitor.log.
+        self.logger = logging.getLogger(f"{LOGGER_NAME}.{id(self)}")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.addHandler(self._buffer)
+        self.logger.addHandler(self._console)
+
+    def log(self, msg: str, level: str = "info", console: bool = True, **fields: Any) -> None:
+        extra = {
+            "run_id": self.run_id,
+            "stage": self._stage() if self._stage else None,
+            "fields": fields,
+            "console": console,
+        }
+        self.logger.log(LEVELS.get(level, logging.INFO), msg, extra=extra)
+
+    def flush(self) -> None:
+        self._buffer.flush()
+        self._console.flush()
+
+    def close(self) -> None:
+        self.logger.removeHandler(self._buffer)
+        self.logger.removeHandler(self._console)
+        self._buffer.close()
+        self._file.close()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""Per-run timing spans and metrics for monitor.py
+
+- span(name) times a stage: wall time, process CPU time, ok/error, and the
+  enclosing span (per thread) so nested stages can be told apart
+- on_span(record) is called as each span ends (e.g. to log it)
+- add() records pre-aggregated time (e.g. parse time summed over lines)
+- record_call() collects one ClawHub subprocess call with the child's wall
+  time, CPU time and peak RSS (see clawhub_client.CallObserver)
+- finish() writes a JSON summary and a node-exporter textfile (.prom); both
+  are replaced atomically so readers never see half a file
+"""
+
+import os
+import resource
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from atomic_io import atomic_write_json, atomic_write_text
+
+PROM_PREFIX = "clawhub_monitor"
+
+
+class RunMetrics:
+    def __init__(self, run_id: Optional[str] = None) -> None:
+        self.run_id = run_id or f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}"
+        self.started_at = time.time()
+        self._t0 = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self.calls: List[Dict[str, Any]] = []
+        self.values: Dict[str, Union[int, float, str]] = {}
+        self._lock = threading.Lock()
+        self._stack = threading.local()
+        self.on_span: Optional[Callable[[Dict[str, Any]], None]] = None
+
+    def current_stage(self) -> Optional[str]:
+        """Innermost open span on this thread."""
+        stack = self._stack.__dict__.get("names")
+        return stack[-1] if stack else None
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Dict[str, Any]]:
+        """Time a stage; the yielded dict can take extra attributes."""
+        stack = self._stack.__dict__.setdefault("names", [])
+        record: Dict[str, Any] = {"name": name, "parent": stack[-1] if stack else None, **attrs}
+        stack.append(name)
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+        record["start_s"] = round(start_wall - self._t0, 6)
+        record["status"] = "ok"
+        try:
+            yield record
+        except BaseException:
+            record["status"] = "error"
+            raise
+        finally:
+            stack.pop()
+            record["wall_s"] = round(time.perf_counter() - start_wall, 6)
+            record["cpu_s"] = round(time.process_time() - start_cpu, 6)
+            with self._lock:
+                self.spans.append(record)
+            if self.on_span is not None:
+                self.on_span(record)
+
+    def add(self, name: str, wall_s: float, **attrs: Any) -> None:
+        """Record time measured elsewhere (summed over many small steps)."""
+        stack = self._stack.__dict__.get("names") or []
+        with self._lock:
+            self.spans.append(
+                {"name": name, "parent": stack[-1] if stack else None, "wall_s": round(wall_s, 6), "status": "ok", **attrs}
+            )
+
+    def record_call(self, op: str, args: List[str], usage: Dict[str, Any]) -> None:
+        call = {"op": op, "args": args[:3], "at_s": round(time.perf_counter() - self._t0, 6)}
+        call.update(usage)
+        with self._lock:
+            self.calls.append(call)
+
+    def set(self, name: str, value: Union[int, float, str]) -> None:
+        with self._lock:
+            self.values[name] = value
+
+    def summary(self, exit_code: int) -> Dict[str, Any]:
+        own = resource.getrusage(resource.RUSAGE_SELF)
+        children = resource.getrusage(resource.RUSAGE_CHILDREN)
+        with self._lock:
+            spans = list(self.spans)
+            calls = list(self.calls)
+            values = dict(self.values)
+        return {
+            "run_id": self.run_id,
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "exit_code": exit_code,
+            "wall_s": round(time.perf_counter() - self._t0, 6),
+            "cpu_s": round(own.ru_utime + own.ru_stime, 6),
+            "max_rss_kb": own.ru_maxrss,
+            # Reaped children only: the CLI worker counts once it has exited.
+            "children_cpu_s": round(children.ru_utime + children.ru_stime, 6),
+            "children_max_rss_kb": children.ru_maxrss,
+            "values": values,
+            "spans": spans,
+            "calls": calls,
+        }
+
+    def finish(self, exit_code: int, json_path: Path, prom_path: Optional[Path] = None) -> Dict[str, Any]:
+        summary = self.summary(exit_code)
+        atomic_write_json(json_path, summary)
+        if prom_path is not None:
+            atomic_write_text(prom_path, render_prom(summary))
+        return summary
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(round(float(value), 6))
+
+
+def _label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+def render_prom(summary: Dict[str, Any]) -> str:
+    """node-exporter textfile format; stage/op series are summed per label."""
+    lines: List[str] = []
+
+    def metric(name: str, kind: str, help_text: str, samples: List[tuple]) -> None:
+        full = f"{PROM_PREFIX}_{name}"
+        lines.append(f"# HELP {full} {help_text}")
+        lines.append(f"# TYPE {full} {kind}")
+        for labels, value in samples:
+            label_s = ",".join(f'{k}="{_label(v)}"' for k, v in labels)
+            lines.append(f"{full}{{{label_s}}} {_number(value)}" if label_s else f"{full} {_number(value)}")
+
+    metric("last_run_timestamp_seconds", "gauge", "Unix time the last run finished.", [((), round(time.time()))])
+    metric("last_run_exit_code", "gauge", "Exit code of the last run.", [((), summary["exit_code"])])
+    metric("run_duration_seconds", "gauge", "Wall time of the last run.", [((), summary["wall_s"])])
+    metric("run_cpu_seconds", "gauge", "CPU time of the monitor process.", [((), summary["cpu_s"])])
+    metric("run_max_rss_bytes", "gauge", "Peak RSS of the monitor process.", [((), summary["max_rss_kb"] * 1024)])
+    metric(
+        "children_cpu_seconds", "gauge", "CPU time of reaped child processes.", [((), summary["children_cpu_s"])]
+    )
+
+    stage_wall: Dict[str, float] = {}
+    stage_cpu: Dict[str, float] = {}
+    for span in summary["spans"]:
+        stage_wall[span["name"]] = stage_wall.get(span["name"], 0.0) + span["wall_s"]
+        if "cpu_s" in span:
+            stage_cpu[span["name"]] = stage_cpu.get(span["name"], 0.0) + span["cpu_s"]
+    metric(
+        "stage_duration_seconds",
+        "gauge",
+        "Wall time per stage in the last run (nested stages are included in their parent).",
+        [((("stage", k),), round(v, 6)) for k, v in sorted(stage_wall.items())],
+    )
+    metric(
+        "stage_cpu_seconds",
+        "gauge",
+        "Process CPU time per stage in the last run.",
+        [((("stage", k),), round(v, 6)) for k, v in sorted(stage_cpu.items())],
+    )
+
+    per_op: Dict[str, Dict[str, float]] = {}
+    for call in summary["calls"]:
+        agg = per_op.setdefault(call["op"], {"n": 0, "wall": 0.0, "cpu": 0.0, "rss": 0.0, "timeouts": 0})
+        agg["n"] += 1
+        agg["wall"] += (call.get("wall_ms") or 0) / 1000
+        agg["cpu"] += (call.get("cpu_ms") or 0) / 1000
+        agg["rss"] = max(agg["rss"], (call.get("max_rss_kb") or 0) * 1024)
+        agg["timeouts"] += 1 if call.get("timed_out") else 0
+    ops = sorted(per_op.items())
+    metric("subprocess_calls", "gauge", "ClawHub CLI calls per op.", [((("op", k),), v["n"]) for k, v in ops])
+    metric("subprocess_timeouts", "gauge", "ClawHub CLI calls that timed out.", [((("op", k),), v["timeouts"]) for k, v in ops])
+    metric("subprocess_wall_seconds", "gauge", "Summed child wall time per op.", [((("op", k),), round(v["wall"], 3)) for k, v in ops])
+    metric("subprocess_cpu_seconds", "gauge", "Summed child CPU time per op.", [((("op", k),), round(v["cpu"], 3)) for k, v in ops])
+    metric("subprocess_max_rss_bytes", "gauge", "Largest child peak RSS per op.", [((("op", k),), v["rss"]) for k, v in ops])
+
+    numeric = sorted((k, v) for k, v in summary["values"].items() if isinstance(v, (int, float)))
+    for name, value in numeric:
+        metric(name, "gauge", f"{name.replace('_', ' ')} in the last run.", [((), value)])
+    return "\n".join(lines) + "\n"
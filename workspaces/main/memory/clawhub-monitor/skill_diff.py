@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Change detection between the current explore listing and the stored state
+
+- One pass over the listing, against the stored records of the listed names:
+  new, version_bump, summary_changed (via the stored summary hash) and
+  downloads_delta (jumps past an absolute and a relative threshold)
+- removed: explore lists newest first, so a skill from the previous listing
+  that is missing now while an older skill from that listing is still shown
+  has disappeared (not just scrolled past the listing limit)
+- Unknown old values (empty version/hash, 0 downloads from a text listing
+  that does not print them) never count as a change
+- Changes are appended to an events.jsonl stream, one JSON object per line
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from state_store import field_hash
+
+NEW = "new"
+VERSION_BUMP = "version_bump"
+SUMMARY_CHANGED = "summary_changed"
+DOWNLOADS_DELTA = "downloads_delta"
+REMOVED = "removed"
+KINDS = (NEW, VERSION_BUMP, SUMMARY_CHANGED, DOWNLOADS_DELTA, REMOVED)
+
+
+class Change(NamedTuple):
+    kind: str
+    name: str
+    old: Any = None
+    new: Any = None
+
+
+def diff_listing(
+    listing: Sequence[Dict[str, Any]],
+    stored: Dict[str, Dict[str, Any]],
+    previous_names: Sequence[str] = (),
+    downloads_min_delta: int = 100,
+    downloads_min_ratio: float = 0.5,
+) -> List[Change]:
+    """Classify every change in `listing` against `stored` (StateStore.records of the listed names)."""
+    changes: List[Change] = []
+    listed = set()
+    for skill in listing:
+        name = skill.get("name")
+        if not name or name in listed:
+            continue
+        listed.add(name)
+        old = stored.get(name)
+        if old is None:
+            changes.append(Change(NEW, name, None, skill.get("version") or ""))
+            continue
+        version = skill.get("version") or ""
+        if version and old.get("version") and version != old["version"]:
+            changes.append(Change(VERSION_BUMP, name, old["version"], version))
+        summary = skill.get("summary") or ""
+        if summary and old.get("summary_hash") and field_hash(summary) != old["summary_hash"]:
+            changes.append(Change(SUMMARY_CHANGED, name, None, summary))
+        downloads, before = int(skill.get("downloads") or 0), int(old.get("downloads") or 0)
+        if downloads and before:
+            delta = downloads - before
+            if abs(delta) >= max(downloads_min_delta, downloads_min_ratio * before):
+                changes.append(Change(DOWNLOADS_DELTA, name, before, downloads))
+    changes.extend(Change(REMOVED, name) for name in removed_names(previous_names, listed))
+    return changes
+
+
+def removed_names(previous_names: Sequence[str], current: Iterable[str]) -> List[str]:
+    """Names of the previous (newest-first) listing that vanished above its still-listed tail."""
+    current = set(current)
+    oldest_still_listed: Optional[int] = None
+    for i, name in enumerate(previous_names):
+        if name in current:
+            oldest_still_listed = i
+    if oldest_still_listed is None:
+        return []
+    return [n for n in previous_names[:oldest_still_listed] if n not in current]
+
+
+def append_events(path: Path, changes: Iterable[Change], ts: str, run_id: str = "") -> int:
+    lines = [
+        json.dumps(
+            {"ts": ts, "run_id": run_id, "type": c.kind, "name": c.name, "old": c.old, "new": c.new},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        for c in changes
+    ]
+    if lines:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+    return len(lines)
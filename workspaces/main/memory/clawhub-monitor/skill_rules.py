@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""Declarative type-tag and opportunity rules (skill_rules.json), compiled once
+
+- A tag rule lists keywords per field (slug / summary / skill_md, matched as
+  substrings of the lowercased text) and/or regexes (<field>_regex); any hit
+  adds the rule's tags, in rule order
+- All keywords and regexes are compiled into one alternation that is run
+  over slug, summary and SKILL.md joined together: one scan per skill,
+  however many rules there are. Overlapping hits are not lost: the scan stops
+  at every position where anything matches, a longer keyword implies the
+  keywords that are its prefixes, and the other regexes are re-tried there
+- Opportunity rules map a tag set ("when" all present, "unless" none present)
+  to suggestion lines
+- RuleFile reloads the JSON when it changes on disk (watch mode); a broken
+  edit keeps the previous rules
+"""
+
+import bisect
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+FIELDS = ("slug", "summary", "skill_md")
+FIELD_SEP = "\x1f"  # never part of a keyword, so hits cannot span two fields
+
+
+class RuleSet:
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        self.max_tags = int(spec.get("max_tags") or 4)
+        self.tag_rules: List[Dict[str, Any]] = list(spec.get("tag_rules") or [])
+        self.opportunity_rules: List[Dict[str, Any]] = list(spec.get("opportunities") or [])
+        self.default_opportunity = str(spec.get("default_opportunity") or "")
+        self.placeholder = str(spec.get("placeholder") or "")
+        # Identifies the rules that produced cached tags/opportunities.
+        canonical = json.dumps(spec, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+        self.fingerprint = hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+        literal_rules: Dict[Tuple[int, str], Set[int]] = {}
+        regex_rules: Dict[Tuple[int, str], Set[int]] = {}
+        for i, rule in enumerate(self.tag_rules):
+            for f, field in enumerate(FIELDS):
+                for kw in rule.get(field) or []:
+                    literal_rules.setdefault((f, kw.lower()), set()).add(i)
+                for pattern in rule.get(f"{field}_regex") or []:
+                    re.compile(pattern)  # fail at load time, naming the bad pattern
+                    regex_rules.setdefault((f, pattern), set()).add(i)
+        self._literal_rules = literal_rules
+        self._regex_rules = regex_rules
+        self._scan_fields = {f for f, _ in literal_rules} | {f for f, _ in regex_rules}
+
+        # Longest first: at one position the longest keyword wins the
+        # alternation, and every keyword that is its prefix is implied.
+        literals = sorted({kw for _, kw in literal_rules}, key=lambda k: (-len(k), k))
+        regexes = sorted({p for _, p in regex_rules})
+        # Rules hit by each keyword, per field (itself plus implied prefixes).
+        self._literal_hits: Dict[str, List[frozenset]] = {
+            kw: [
+                frozenset().union(*(literal_rules.get((f, k), ()) for k in literals if kw.startswith(k)))
+                for f in range(len(FIELDS))
+            ]
+            for kw in literals
+        }
+        self._regexes = [(p, re.compile(p)) for p in regexes]
+        # One capture group only: the matched text names the keyword, and a
+        # group per alternative makes the scan several times slower.
+        alternatives = [re.escape(kw) for kw in literals] + [f"(?:{p})" for p in regexes]
+        self._scanner = re.compile("(?=(" + "|".join(alternatives) + "))") if alternatives else None
+
+    @classmethod
+    def from_file(cls, path: Path) -> "RuleSet":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def matched_rules(self, slug: str, summary: str, skill_md: str = "") -> Set[int]:
+        """Indices of the tag rules that hit, from a single scan."""
+        if self._scanner is None:
+            return set()
+        values = (slug or "", summary or "", skill_md or "")
+        parts = [values[f] if f in self._scan_fields else "" for f in range(len(FIELDS))]
+        text = FIELD_SEP.join(parts).lower()
+        starts = [0]
+        for part in parts[:-1]:
+            starts.append(starts[-1] + len(part) + 1)
+
+        hit: Set[int] = set()
+        for m in self._scanner.finditer(text):
+            pos = m.start()
+            f = bisect.bisect_right(starts, pos) - 1
+            literal = self._literal_hits.get(m.group(1))
+            if literal is not None:
+                hit |= literal[f]
+            if self._regexes:
+                end = starts[f + 1] - 1 if f + 1 < len(starts) else len(text)
+                for pattern, rx in self._regexes:
+                    rules = self._regex_rules.get((f, pattern))
+                    if rules and not rules <= hit and rx.match(text, pos, end):
+                        hit |= rules
+            if len(hit) == len(self.tag_rules):
+                break
+        return hit
+
+    def type_tags(self, slug: str, summary: str, tags_from_md: List[str], skill_md: str = "") -> List[str]:
+        tags = [t.lower() for t in tags_from_md if t]
+        hit = self.matched_rules(slug, summary, skill_md)
+        for i, rule in enumerate(self.tag_rules):
+            if i in hit:
+                for tag in rule.get("tags") or []:
+                    if tag not in tags:
+                        tags.append(tag)
+        return tags[: self.max_tags]
+
+    def opportunities(self, tags: List[str], count: int = 3) -> List[str]:
+        present = set(tags or [])
+        out: List[str] = []
+        candidates = [
+            line
+            for rule in self.opportunity_rules
+            if all(t in present for t in rule.get("when") or [])
+            and not any(t in present for t in rule.get("unless") or [])
+            for line in rule.get("lines") or []
+        ]
+        for line in candidates + [self.default_opportunity]:
+            if line and line not in out:
+                out.append(line)
+        while len(out) < count:
+            out.append(self.placeholder)
+        return out[:count]
+
+
+class RuleFile:
+    """A RuleSet that follows its JSON file (checked by mtime and size)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.rules = RuleSet({})
+        self.error: Optional[str] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self.reload()
+
+    def reload(self) -> bool:
+        """Recompile if the file changed; True if new rules are in effect."""
+        try:
+            st = os.stat(self.path)
+        except OSError as e:
+            self.error = f"rules file unavailable: {e}"
+            return False
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        try:
+            self.rules = RuleSet.from_file(self.path)
+        except (OSError, ValueError, TypeError, AttributeError, re.error) as e:
+            self.error = f"invalid rules file, keeping the previous rules: {e}"
+            return False
+        self.error = None
+        return True
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""Append-only, delta-compressed history of explore snapshots
+
+- One record per successful parse: a zlib-compressed JSON delta against the
+  previous snapshot (added with their position, changed fields only, removed
+  names), with a full checkpoint every `checkpoint_every` records
+- Fixed header per record (timestamp, kind, length, CRC32), so records can be
+  found by time without decompressing the ones in between
+- A torn tail (crash mid-append) is ignored when reading and cut off before
+  the next append; earlier records are never rewritten
+- The offset of the last checkpoint is kept in a sidecar (<file>.idx), so an
+  append reads only the records since then, however long the history; a
+  missing or stale sidecar falls back to a full scan
+- Partial listings (incremental explore) are merged into the previous
+  snapshot: skills missing from them are not counted as removed
+- snapshot_at(ts) rebuilds any past snapshot; iter_diffs(start, end) yields
+  what appeared, changed and disappeared in between
+
+Usage: python3 snapshot_archive.py show|diffs <snapshots.bin> <from-iso> [<to-iso>]
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+HEADER = struct.Struct("<dBII")  # ts, kind, payload length, crc32
+FULL = 0
+DELTA = 1
+
+Snapshot = Dict[str, Dict[str, Any]]  # name -> record, in listing order
+
+
+class SnapshotDiff(NamedTuple):
+    ts: float
+    added: List[Dict[str, Any]]
+    changed: Dict[str, Dict[str, Any]]  # name -> fields that changed (new values)
+    removed: List[str]
+
+
+def _encode(obj: Any) -> bytes:
+    return zlib.compress(json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+
+
+def _decode(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+
+def _ordered_names(prev: Snapshot, removed: List[str], added: List[List[Any]]) -> List[str]:
+    gone = set(removed)
+    names = [n for n in prev if n not in gone]
+    for index, rec in added:
+        names.insert(index, rec["name"])
+    return names
+
+
+def make_delta(prev: Snapshot, cur: Snapshot) -> Dict[str, Any]:
+    removed = [n for n in prev if n not in cur]
+    added = [[i, rec] for i, (n, rec) in enumerate(cur.items()) if n not in prev]
+    changed: Dict[str, Dict[str, Any]] = {}
+    for name, rec in cur.items():
+        old = prev.get(name)
+        if old is not None and old != rec:
+            changed[name] = {k: rec.get(k) for k in set(rec) | set(old) if rec.get(k) != old.get(k)}
+    delta: Dict[str, Any] = {}
+    if added:
+        delta["added"] = added
+    if changed:
+        delta["changed"] = changed
+    if removed:
+        delta["removed"] = removed
+    # Positions of added skills reproduce the usual "new ones on top" order;
+    # anything else (re-sorting) needs the full name order.
+    if _ordered_names(prev, removed, added) != list(cur):
+        delta["order"] = list(cur)
+    return delta
+
+
+def apply_delta(prev: Snapshot, delta: Dict[str, Any]) -> Snapshot:
+    added = delta.get("added") or []
+    removed = delta.get("removed") or []
+    names = delta.get("order") or _ordered_names(prev, removed, added)
+    new_recs = {rec["name"]: rec for _, rec in added}
+    changed = delta.get("changed") or {}
+    out: Snapshot = {}
+    for name in names:
+        rec = new_recs.get(name) or prev[name]
+        if name in changed:
+            rec = {k: v for k, v in {**rec, **changed[name]}.items() if v is not None}
+        out[name] = rec
+    return out
+
+
+class SnapshotArchive:
+    def __init__(self, path: Path, checkpoint_every: int = 50) -> None:
+        self.path = path
+        self.index_path = path.with_name(path.name + ".idx")
+        self.checkpoint_every = max(1, checkpoint_every)
+
+    def _records(self, offset: int = 0) -> Iterator[Tuple[float, int, int, int]]:
+        """(ts, kind, payload offset, payload length) of each intact record from `offset`.
+
+        Reading stops at the first torn or corrupt record.
+        """
+        if not self.path.exists():
+            return
+        size = self.path.stat().st_size
+        with open(self.path, "rb") as f:
+            while offset + HEADER.size <= size:
+                f.seek(offset)
+                ts, kind, length, crc = HEADER.unpack(f.read(HEADER.size))
+                if offset + HEADER.size + length > size or zlib.crc32(f.read(length)) != crc:
+                    return
+                yield ts, kind, offset + HEADER.size, length
+                offset += HEADER.size + length
+
+    def _replay_records(
+        self, records: List[Tuple[float, int, int, int]]
+    ) -> Iterator[Tuple[float, Snapshot, Optional[Dict[str, Any]]]]:
+        """Yield (ts, snapshot, delta) per record; `records` must start at a checkpoint."""
+        if not records:
+            return
+        snap: Snapshot = {}
+        with open(self.path, "rb") as f:
+            for ts, kind, offset, length in records:
+                f.seek(offset)
+                data = _decode(f.read(length))
+                if kind == FULL:
+                    snap = {rec["name"]: rec for rec in data}
+                    yield ts, snap, None
+                else:
+                    snap = apply_delta(snap, data)
+                    yield ts, snap, data
+
+    def _replay(
+        self, start: Optional[float] = None, until: Optional[float] = None
+    ) -> Iterator[Tuple[float, Snapshot, Optional[Dict[str, Any]]]]:
+        """Yield (ts, snapshot, delta) per record up to `until`, starting at the
+        last checkpoint at or before `start` (the first record if None)."""
+        index = [r for r in self._records() if until is None or r[0] <= until]
+        fulls = [i for i, r in enumerate(index) if r[1] == FULL]
+        if not fulls:
+            return
+        begin = fulls[0]
+        if start is not None:
+            begin = max((i for i in fulls if index[i][0] <= start), default=begin)
+        yield from self._replay_records(index[begin:])
+
+    def snapshot_at(self, ts: Optional[float] = None) -> Optional[List[Dict[str, Any]]]:
+        """The listing as archived at or before `ts` (latest if None)."""
+        last = None
+        for _, snap, _ in self._replay(ts, ts):
+            last = snap
+        return list(last.values()) if last is not None else None
+
+    def _checkpoint_hint(self) -> int:
+        """File offset of the last checkpoint per the sidecar; 0 if unknown."""
+        try:
+            offset = json.loads(self.index_path.read_text(encoding="utf-8"))["checkpoint"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return 0
+        return offset if isinstance(offset, int) and offset > 0 else 0
+
+    def _save_checkpoint_hint(self, offset: int) -> None:
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        try:
+            tmp.write_text(json.dumps({"checkpoint": offset}), encoding="utf-8")
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass  # only a hint: the next append scans the whole file
+
+    def _tail(self) -> Tuple[int, int, Snapshot]:
+        """(records since the last checkpoint, end of intact data, latest snapshot)."""
+        start = self._checkpoint_hint()
+        records = list(self._records(start)) if start else []
+        if not records or records[0][1] != FULL:
+            records = list(self._records())
+        end = (records[-1][2] + records[-1][3]) if records else 0
+        last_full = max((i for i, r in enumerate(records) if r[1] == FULL), default=0)
+        latest: Snapshot = {}
+        for _, snap, _ in self._replay_records(records[last_full:]):
+            latest = snap
+        return max(0, len(records) - 1 - last_full), end, latest
+
+    def append(self, skills: List[Dict[str, Any]], complete: bool = True, ts: Optional[float] = None) -> bool:
+        """Archive one parsed listing; False if it matches the latest snapshot.
+
+        With complete=False the listing is the head of the full one: it is merged
+        into the previous snapshot instead of replacing it.
+        """
+        since, end, prev = self._tail()
+        cur: Snapshot = {s["name"]: s for s in skills if s.get("name")}
+        if not complete:
+            cur.update((n, rec) for n, rec in prev.items() if n not in cur)
+        if prev and cur == prev and list(cur) == list(prev):
+            return False
+        if not prev or since + 1 >= self.checkpoint_every:
+            kind, payload = FULL, _encode(list(cur.values()))
+        else:
+            kind, payload = DELTA, _encode(make_delta(prev, cur))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "ab") as f:
+            if f.tell() != end:
+                f.truncate(end)  # drop a torn tail
+            f.write(HEADER.pack(ts or time.time(), kind, len(payload), zlib.crc32(payload)) + payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if kind == FULL:
+            self._save_checkpoint_hint(end)
+        return True
+
+    def iter_diffs(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[SnapshotDiff]:
+        """Changes between consecutive snapshots archived in (start, end]."""
+        prev: Optional[Snapshot] = None
+        for ts, snap, delta in self._replay(start, end):
+            if prev is not None and (start is None or ts > start):
+                if delta is None:  # checkpoint: diff it against the previous snapshot
+                    delta = make_delta(prev, snap)
+                yield SnapshotDiff(
+                    ts,
+                    [rec for _, rec in delta.get("added") or []],
+                    delta.get("changed") or {},
+                    delta.get("removed") or [],
+                )
+            prev = snap
+
+
+def _parse_ts(text: str) -> float:
+    return datetime.fromisoformat(text).timestamp()
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) not in (4, 5) or argv[1] not in ("show", "diffs"):
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    archive = SnapshotArchive(Path(argv[2]))
+    if argv[1] == "show":
+        snap = archive.snapshot_at(_parse_ts(argv[3]))
+        print(json.dumps(snap, ensure_ascii=False, indent=2))
+        return 0 if snap is not None else 1
+    end = _parse_ts(argv[4]) if len(argv) == 5 else None
+    for diff in archive.iter_diffs(_parse_ts(argv[3]), end):
+        when = datetime.fromtimestamp(diff.ts).isoformat(timespec="seconds")
+        print(f"{when}  +{len(diff.added)} ~{len(diff.changed)} -{len(diff.removed)}")
+        for rec in diff.added:
+            print(f"  + {rec['name']} {rec.get('version', '')}")
+        for name, fields in diff.changed.items():
+            print(f"  ~ {name} {json.dumps(fields, ensure_ascii=False)}")
+        for name in diff.removed:
+            print(f"  - {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Input hashes per pipeline stage, for skipping work whose inputs did not change
+
+- content_hash() is a SHA-256 over canonical JSON (sorted keys, compact), so
+  equal inputs hash equal regardless of dict order
+- Each stage stores the hash of the inputs it last completed with in the state
+  store's meta table ("stage:<name>")
+- fresh(stage, key) tells whether the stage already ran with these inputs and
+  its previous outputs can be reused; commit() is called only after the stage
+  finished, so a crash mid-stage never marks it done
+"""
+
+import hashlib
+import json
+from typing import Any, Optional
+
+from state_store import StateStore
+
+META_PREFIX = "stage:"
+
+
+def content_hash(*parts: Any) -> str:
+    data = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class StageHashes:
+    def __init__(self, store: StateStore) -> None:
+        self.store = store
+
+    def last(self, stage: str) -> Optional[str]:
+        return self.store.get_meta(META_PREFIX + stage)
+
+    def fresh(self, stage: str, key: str) -> bool:
+        return self.last(stage) == key
+
+    def commit(self, stage: str, key: str) -> None:
+        self.store.set_meta(META_PREFIX + stage, key)
+
+    def forget(self, stage: str) -> None:
+        self.store.set_meta(META_PREFIX + stage, "")
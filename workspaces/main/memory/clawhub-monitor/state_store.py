@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""SQLite state store for monitor.py (replaces known_skills.json)
+
+- WAL journal: crash-safe, readers never see a half-written state
+- `name` is the primary key, so "is this skill known?" is an index lookup
+- Only skills seen in the current run are upserted; nothing is rewritten
+- Summaries are kept as a short hash (`summary_hash`), enough to tell a
+  rewritten summary from an unchanged one (see skill_diff.py)
+- `version()` is bumped by every upsert, so "did the state change?" is one
+  meta read (used as a stage input by stage_hashes.py)
+- One-time importer for the legacy known_skills.json
+
+Usage: python3 state_store.py import <known_skills.sqlite3> <known_skills.json>
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS skills (
+    name TEXT PRIMARY KEY,
+    downloads INTEGER NOT NULL DEFAULT 0,
+    version TEXT NOT NULL DEFAULT '',
+    raw TEXT NOT NULL DEFAULT '',
+    summary_hash TEXT NOT NULL DEFAULT '',
+    discovered_at TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Columns added after the first release: (name, definition) for ALTER TABLE.
+MIGRATIONS = [("summary_hash", "TEXT NOT NULL DEFAULT ''")]
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER for IN (...) queries.
+QUERY_CHUNK = 500
+
+
+def field_hash(text: str) -> str:
+    """Short, stable hash of one text field ('' for empty text)."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest() if text else ""
+
+
+class StateStore:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Shared with enrichment/hedging threads; every access holds _lock.
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.RLock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(skills)")}
+        for name, definition in MIGRATIONS:
+            if name not in columns:
+                self._db.execute(f"ALTER TABLE skills ADD COLUMN {name} {definition}")
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM skills").fetchone()[0]
+
+    def known_names(self, names: Iterable[str]) -> Set[str]:
+        """Return the subset of `names` already present in the store."""
+        names = list(dict.fromkeys(n for n in names if n))
+        known: Set[str] = set()
+        for i in range(0, len(names), QUERY_CHUNK):
+            chunk = names[i : i + QUERY_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            with self._lock:
+                known.update(r[0] for r in self._db.execute(f"SELECT name FROM skills WHERE name IN ({marks})", chunk))
+        return known
+
+    def records(self, names: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Stored records for `names` (missing names are left out)."""
+        names = list(dict.fromkeys(n for n in names if n))
+        out: Dict[str, Dict[str, Any]] = {}
+        for i in range(0, len(names), QUERY_CHUNK):
+            chunk = names[i : i + QUERY_CHUNK]
+            marks = ",".join("?" * len(chunk))
+            with self._lock:
+                rows = self._db.execute(
+                    f"SELECT name, downloads, version, raw, summary_hash, discovered_at, last_seen "
+                    f"FROM skills WHERE name IN ({marks})",
+                    chunk,
+                ).fetchall()
+            for row in rows:
+                out[row[0]] = {
+                    "name": row[0],
+                    "downloads": row[1],
+                    "version": row[2],
+                    "raw": row[3],
+                    "summary_hash": row[4],
+                    "discovered_at": row[5],
+                    "last_seen": row[6],
+                }
+        return out
+
+    def upsert(self, skills: Iterable[Dict[str, Any]]) -> int:
+        """Insert or refresh skills; `discovered_at` keeps its first value.
+
+        Records without a `version` or `summary` keep the stored version or
+        summary hash (fallback snapshots and some listings leave them out).
+        """
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                s["name"],
+                int(s.get("downloads") or 0),
+                str(s.get("version") or ""),
+                str(s.get("raw") or ""),
+                field_hash(str(s.get("summary") or "")),
+                str(s.get("discovered_at") or now),
+                now,
+            )
+            for s in skills
+            if s.get("name")
+        ]
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO meta (key, value) VALUES ('version', '1') "
+                "ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+            )
+            self._db.executemany(
+                """
+                INSERT INTO skills (name, downloads, version, raw, summary_hash, discovered_at, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    downloads = excluded.downloads,
+                    version = CASE WHEN excluded.version != '' THEN excluded.version ELSE version END,
+                    raw = excluded.raw,
+                    summary_hash = CASE WHEN excluded.summary_hash != '' THEN excluded.summary_hash ELSE summary_hash END,
+                    last_seen = excluded.last_seen
+                """,
+                rows,
+            )
+        return len(rows)
+
+    def version(self) -> int:
+        return int(self.get_meta("version") or 0)
+
+    def get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key: str, value: str) -> None:
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def import_json(self, json_path: Path) -> int:
+        """Import a legacy known_skills.json once; later calls are no-ops."""
+        if self.get_meta("imported_json") or not json_path.exists():
+            return 0
+        data = json.loads(json_path.read_text(encoding="utf-8"))
+        records: List[Dict[str, Any]] = []
+        if isinstance(data, dict):
+            for name, rec in data.items():
+                rec = dict(rec) if isinstance(rec, dict) else {}
+                rec["name"] = rec.get("name") or name
+                records.append(rec)
+        imported = self.upsert(records)
+        self.set_meta("imported_json", f"{json_path}:{imported}")
+        return imported
+
+    def close(self) -> None:
+        self._db.close()
+
+
+def main(argv: List[str]) -> int:
+    if len(argv) != 4 or argv[1] != "import":
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    store = StateStore(Path(argv[2]))
+    imported = store.import_json(Path(argv[3]))
+    print(f"Imported {imported} skills; store now has {store.count()}")
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main(sys.argv))
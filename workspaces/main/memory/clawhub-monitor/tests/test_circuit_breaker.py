@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""RateLimitBreaker state machine on a fake clock
+
+Run: python3 -m pytest tests (or python3 -m unittest discover tests)
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from circuit_breaker import CLOSED, HALF_OPEN, OPEN, RateLimitBreaker, is_rate_limited, parse_retry_after  # noqa: E402
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class RateLimitBreakerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = Path(tempfile.mkdtemp())
+        self.path = self.dir / "breaker.json"
+        self.clock = FakeClock()
+        patcher = mock.patch("circuit_breaker.time.time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _breaker(self) -> RateLimitBreaker:
+        return RateLimitBreaker(self.path, base_cooldown_s=60, max_cooldown_s=600)
+
+    def test_closed_open_half_open_closed(self) -> None:
+        b = self._breaker()
+        self.assertTrue(b.allow())
+        self.assertEqual(b.record_rate_limit(reason="explore: 429"), 60)
+        self.assertEqual(b.state, OPEN)
+        self.assertTrue(b.blocked())
+        self.assertFalse(b.allow())
+        self.clock.now += 60
+        self.assertFalse(b.blocked())
+        self.assertTrue(b.allow())  # the probe
+        self.assertEqual(b.state, HALF_OPEN)
+        self.assertFalse(b.allow())  # only one probe at a time
+        self.assertTrue(b.blocked())
+        b.record_success()
+        self.assertEqual(b.status(), {"state": CLOSED, "trips": 0, "until": 0.0, "reason": ""})
+        self.assertTrue(b.allow())
+
+    def test_failed_probe_reopens_with_a_longer_cooldown(self) -> None:
+        b = self._breaker()
+        b.record_rate_limit()
+        self.clock.now += 60
+        self.assertTrue(b.allow())
+        self.assertEqual(b.record_rate_limit(), 120)
+        self.clock.now += 120
+        self.assertTrue(b.allow())
+        self.assertEqual(b.record_rate_limit(), 240)
+        for _ in range(3):
+            self.clock.now += 600
+            self.assertTrue(b.allow())
+            cooldown = b.record_rate_limit()
+        self.assertEqual(cooldown, 600)  # capped at max_cooldown_s
+
+    def test_released_probe_lets_the_next_one_through(self) -> None:
+        b = self._breaker()
+        b.record_rate_limit()
+        self.clock.now += 60
+        self.assertTrue(b.allow())
+        b.release()  # timeout: neither success nor rate limit
+        self.assertEqual(b.state, HALF_OPEN)
+        self.assertTrue(b.allow())
+
+    def test_retry_after_overrides_the_backoff(self) -> None:
+        b = self._breaker()
+        self.assertEqual(b.record_rate_limit(retry_after_s=7), 7)
+        self.clock.now += 6.9
+        self.assertFalse(b.allow())
+        self.clock.now += 0.1
+        self.assertTrue(b.allow())
+        self.assertEqual(b.record_rate_limit(retry_after_s=0.01), 1.0)  # at least one second
+
+    def test_concurrent_rate_limits_do_not_stack(self) -> None:
+        b = self._breaker()
+        b.record_rate_limit()
+        self.clock.now += 10
+        self.assertEqual(b.record_rate_limit(), 50)
+        self.assertEqual(b.trips, 1)
+
+    def test_state_and_retry_after_persist_between_runs(self) -> None:
+        self._breaker().record_rate_limit(retry_after_s=300, reason="explore: Too Many Requests")
+        b = self._breaker()
+        self.assertEqual(b.status(), {"state": OPEN, "trips": 1, "until": self.clock.now + 300, "reason": "explore: Too Many Requests"})
+        self.assertTrue(b.blocked())
+        self.clock.now += 300
+        self.assertTrue(b.allow())
+        self.assertEqual(self._breaker().state, HALF_OPEN)  # the probe transition is saved too
+        b.record_success()
+        self.assertEqual(self._breaker().state, CLOSED)
+
+    def test_corrupt_state_file_starts_closed(self) -> None:
+        self.path.write_text("{oops", encoding="utf-8")
+        self.assertEqual(self._breaker().state, CLOSED)
+
+
+class RateLimitTextTest(unittest.TestCase):
+    def test_is_rate_limited(self) -> None:
+        self.assertTrue(is_rate_limited(None, 429))
+        self.assertTrue(is_rate_limited("Error: Rate limit exceeded"))
+        self.assertTrue(is_rate_limited("HTTP 429"))
+        self.assertFalse(is_rate_limited("HTTP 500: internal error"))
+        self.assertFalse(is_rate_limited(None))
+
+    def test_parse_retry_after(self) -> None:
+        self.assertEqual(parse_retry_after("Retry-After: 120"), 120)
+        self.assertEqual(parse_retry_after("rate limited, retry after 30s"), 30)
+        self.assertEqual(parse_retry_after("try again in 2 minutes"), 120)
+        self.assertEqual(parse_retry_after("retry in 1h"), 3600)
+        self.assertEqual(parse_retry_after("retry after 500ms"), 0.5)
+        self.assertIsNone(parse_retry_after("slow down"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""HttpTransport against a local stand-in for the ClawHub HTTP API
+
+Run: python3 -m pytest tests (or python3 -m unittest discover tests)
+"""
+
+import gzip
+import json
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from clawhub_client import ClawHubTimeout, HttpTransport  # noqa: E402
+from monitor import iter_listing  # noqa: E402
+
+SKILLS = [
+    {
+        "slug": f"skill-{i}",
+        "summary": f"Summary {i}",
+        "latestVersion": {"version": f"1.0.{i}"},
+        "stats": {"downloads": 100 - i, "stars": i},
+        "createdAt": 1760000000000 + i,
+    }
+    for i in range(10)
+]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, headers: dict = None) -> None:
+        self.send_response(status)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _json(self, status: int, data, headers: dict = None) -> None:
+        body = json.dumps(data).encode("utf-8")
+        headers = dict(headers or {}, **{"Content-Type": "application/json"})
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self._send(status, body, headers)
+
+    def do_GET(self) -> None:
+        server = self.server
+        parts = urlsplit(self.path)
+        query = parse_qs(parts.query)
+        server.requests.append((parts.path, query, dict(self.headers)))
+        path = parts.path[len("/api/v1"):]
+        if path == "/skills":
+            limit = int(query["limit"][0])
+            self._json(200, {"items": SKILLS[:limit]})
+        elif path == "/skills/rate-limited":
+            self._json(429, {"error": "Rate limit exceeded"}, {"Retry-After": "7"})
+        elif path == "/skills/corrupt":
+            self._send(200, b"\x1f\x8b\x08\x00not really gzip", {"Content-Encoding": "gzip"})
+        elif path == "/skills/slow":
+            time.sleep(1.0)
+            self._json(200, {})
+        elif path.endswith("/file"):
+            slug = path.split("/")[2]
+            self._send(200, f"# {slug}\n{query['path'][0]}\n".encode("utf-8"), {"Content-Type": "text/plain"})
+        elif path.startswith("/skills/"):
+            slug = path.split("/")[2]
+            match = [s for s in SKILLS if s["slug"] == slug]
+            if match:
+                self._json(200, {"skill": match[0], "latestVersion": match[0]["latestVersion"]})
+            else:
+                self._json(404, {"error": "not found"})
+        else:
+            self._json(404, {"error": "not found"})
+
+
+class HttpTransportTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        cls.server.daemon_threads = True
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}/api/v1"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.server.requests.clear()
+        self.transport = HttpTransport(self.base_url, token="secret", pool_size=2)
+
+    def tearDown(self) -> None:
+        self.transport.close()
+
+    def test_explore_returns_items_newest_first(self) -> None:
+        r = self.transport.explore(5, timeout=5)
+        self.assertIsNone(r.error)
+        self.assertEqual(r.status, 200)
+        self.assertEqual([s["slug"] for s in r.data], [f"skill-{i}" for i in range(5)])
+        path, query, headers = self.server.requests[0]
+        self.assertEqual(path, "/api/v1/skills")
+        self.assertEqual(query, {"limit": ["5"], "sort": ["newest"]})
+        self.assertEqual(headers["Authorization"], "Bearer secret")
+        self.assertIn("gzip", headers["Accept-Encoding"])
+
+    def test_explore_stream_items_parse_into_skill_records(self) -> None:
+        stream = self.transport.explore_stream(3, timeout=5)
+        records = list(iter_listing(stream))
+        self.assertIsNone(stream.error)
+        self.assertEqual([r["name"] for r in records], ["skill-0", "skill-1", "skill-2"])
+        self.assertEqual(records[1]["version"], "1.0.1")
+        self.assertEqual(records[1]["downloads"], 99)
+        self.assertEqual(records[1]["stars"], 1)
+        self.assertEqual(records[1]["summary"], "Summary 1")
+
+    def test_inspect_and_inspect_file(self) -> None:
+        r = self.transport.inspect("skill-2", timeout=5)
+        self.assertIsNone(r.error)
+        self.assertEqual(r.data["latestVersion"]["version"], "1.0.2")
+        f = self.transport.inspect_file("skill-2", "SKILL.md", timeout=5)
+        self.assertIsNone(f.error)
+        self.assertEqual(f.data, "# skill-2\nSKILL.md\n")
+        self.assertEqual(self.server.requests[1][1], {"path": ["SKILL.md"]})
+
+    def test_missing_skill_is_an_error_response(self) -> None:
+        r = self.transport.inspect("nope", timeout=5)
+        self.assertIsNone(r.data)
+        self.assertEqual(r.status, 404)
+        self.assertTrue(r.error.startswith("HTTP 404"))
+
+    def test_connections_are_kept_alive(self) -> None:
+        for _ in range(3):
+            self.assertIsNone(self.transport.explore(2, timeout=5).error)
+        self.assertIsNone(self.transport.inspect("skill-0", timeout=5).error)
+        self.assertEqual(self.transport.connections_opened, 1)
+
+    def test_rate_limit_carries_retry_after(self) -> None:
+        r = self.transport.inspect("rate-limited", timeout=5)
+        self.assertEqual(r.status, 429)
+        self.assertEqual(r.retry_after, 7.0)
+        self.assertIn("Rate limit", r.error)
+
+    def test_corrupt_gzip_body_is_a_transport_error(self) -> None:
+        r = self.transport.inspect("corrupt", timeout=5)
+        self.assertIsNone(r.data)
+        self.assertTrue(r.error.startswith("http error"))
+        # The transport stays usable afterwards.
+        self.assertIsNone(self.transport.inspect("skill-1", timeout=5).error)
+
+    def test_timeout_raises_clawhub_timeout(self) -> None:
+        with self.assertRaises(ClawHubTimeout):
+            self.transport.inspect("slow", timeout=0.2)
+        stream = self.transport.explore_stream(2, timeout=5)
+        self.assertEqual(len(list(stream)), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""notify.py against a local stand-in for the Telegram Bot API
+
+Run: python3 -m pytest tests (or python3 -m unittest discover tests)
+"""
+
+import json
+import sys
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from notify import TelegramSender, split_message, to_telegram_markdown  # noqa: E402
+
+
+class BotApiHandler(BaseHTTPRequestHandler):
+    """sendMessage stand-in. Chat "limited" gets one 429 first; chat "strict"
+    rejects any message sent with a parse_mode."""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])).decode("utf-8"))
+        with server.lock:
+            server.received.append((self.path, payload, time.monotonic()))
+            first_for_chat = sum(1 for _, p, _ in server.received if p["chat_id"] == payload["chat_id"]) == 1
+        chat = payload["chat_id"]
+        if chat == "limited" and first_for_chat:
+            status, body = 429, {"ok": False, "error_code": 429, "description": "Too Many Requests: retry after 1", "parameters": {"retry_after": 1}}
+        elif chat == "strict" and "parse_mode" in payload:
+            status, body = 400, {"ok": False, "error_code": 400, "description": "Bad Request: can't parse entities: Can't find end of the entity starting at byte offset 3"}
+        elif chat == "broken":
+            status, body = 400, {"ok": False, "error_code": 400, "description": "Bad Request: chat not found"}
+        else:
+            status, body = 200, {"ok": True, "result": {"message_id": len(server.received)}}
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def _report(lines: int) -> str:
+    body = [f"**{i}** skill_{i} v1.0.{i} — summary line with some padding text to fill the message" for i in range(lines)]
+    return "# 📦 ClawHub 日报\n\n" + "\n".join(body[: lines // 2]) + "\n```text\n" + "\n".join(body[lines // 2 :]) + "\n```\n"
+
+
+class SplitMessageTest(unittest.TestCase):
+    def test_chunks_fit_and_keep_every_line(self) -> None:
+        text = _report(200)
+        chunks = split_message(text, limit=1000)
+        self.assertGreater(len(chunks), 5)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk.encode("utf-16-le")) // 2, 1000)
+            # Code blocks are balanced in every chunk.
+            self.assertEqual(sum(1 for ln in chunk.split("\n") if ln.startswith("```")) % 2, 0)
+        joined = [ln for c in chunks for ln in c.split("\n") if not ln.startswith("```")]
+        self.assertEqual(joined, [ln for ln in text.strip("\n").split("\n") if not ln.startswith("```")])
+
+    def test_limit_counts_utf16_units(self) -> None:
+        text = "\n".join(["📦" * 30] * 10)  # 60 units per line, 30 characters
+        for chunk in split_message(text, limit=200):
+            self.assertLessEqual(len(chunk.encode("utf-16-le")) // 2, 200)
+
+
+class TelegramMarkdownTest(unittest.TestCase):
+    def test_report_markup_kept_and_stray_specials_escaped(self) -> None:
+        text = "**New** my_skill *x* [y]\n- `skill_a` [link_text](https://clawhub.ai/o/s_1)\n```text\n👤 o_w\n```"
+        self.assertEqual(
+            to_telegram_markdown(text),
+            "*New* my\\_skill \\*x\\* \\[y]\n- `skill_a` [link_text](https://clawhub.ai/o/s_1)\n```text\n👤 o_w\n```",
+        )
+
+
+class TelegramSenderTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), BotApiHandler)
+        cls.server.daemon_threads = True
+        cls.server.lock = threading.Lock()
+        cls.server.received = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.api_base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self) -> None:
+        self.server.received.clear()
+        self.sender = TelegramSender("TOKEN", api_base=self.api_base, pool_size=2)
+
+    def tearDown(self) -> None:
+        self.sender.close()
+
+    def _texts(self, chat: str) -> list:
+        return [p["text"] for _, p, _ in self.server.received if p["chat_id"] == chat]
+
+    def test_report_is_chunked_in_order_per_chat(self) -> None:
+        text = _report(300)
+        results = self.sender.send_report(["a", "b"], text)
+        self.assertEqual(results, {"a": None, "b": None})
+        expected = split_message(to_telegram_markdown(text))
+        self.assertGreater(len(expected), 1)
+        self.assertEqual(self._texts("a"), expected)
+        self.assertEqual(self._texts("b"), expected)
+        path, payload, _ = self.server.received[0]
+        self.assertEqual(path, "/botTOKEN/sendMessage")
+        self.assertEqual(payload["parse_mode"], "Markdown")
+        # At most one keep-alive connection per chat worker, reused for every chunk.
+        self.assertLessEqual(self.sender.connections_opened, 2)
+
+    def test_429_waits_retry_after_then_resends(self) -> None:
+        self.assertIsNone(self.sender.send_message("limited", "hello"))
+        sent = [(p["text"], t) for _, p, t in self.server.received]
+        self.assertEqual([text for text, _ in sent], ["hello", "hello"])
+        self.assertGreaterEqual(sent[1][1] - sent[0][1], 1.0)
+
+    def test_parse_error_is_resent_as_plain_text(self) -> None:
+        self.assertIsNone(self.sender.send_message("strict", "*broken"))
+        payloads = [p for _, p, _ in self.server.received]
+        self.assertEqual(len(payloads), 2)
+        self.assertEqual(payloads[0]["parse_mode"], "Markdown")
+        self.assertNotIn("parse_mode", payloads[1])
+        self.assertEqual(payloads[1]["text"], "*broken")
+
+    def test_other_errors_stop_the_chat(self) -> None:
+        results = self.sender.send_report(["broken", "a"], _report(300))
+        self.assertTrue(results["broken"].startswith("chunk 1/"))
+        self.assertIn("chat not found", results["broken"])
+        self.assertIsNone(results["a"])
+        self.assertEqual(len(self._texts("broken")), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
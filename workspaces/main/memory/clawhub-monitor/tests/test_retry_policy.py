@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""LatencyHistory/RetryPolicy on synthetic latency histories
+
+Run: python3 -m pytest tests (or python3 -m unittest discover tests)
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from retry_policy import LatencyHistory, RetryPolicy  # noqa: E402
+
+
+class LatencyHistoryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_nearest_rank_percentiles(self) -> None:
+        history = LatencyHistory(self.dir / "lat.json")
+        for s in range(100, 0, -1):  # 1..100 s, recorded out of order
+            history.record("explore", s)
+        self.assertEqual(history.percentile("explore", 0.5), 50)
+        self.assertEqual(history.percentile("explore", 0.95), 95)
+        self.assertEqual(history.percentile("explore", 0.99), 99)
+        self.assertEqual(history.percentile("explore", 1.0), 100)
+        self.assertIsNone(history.percentile("inspect", 0.5))
+        self.assertIsNone(history.percentile("explore", 0.5, min_samples=101))
+
+    def test_keeps_the_newest_samples_and_round_trips(self) -> None:
+        path = self.dir / "lat.json"
+        history = LatencyHistory(path, max_samples=3)
+        for s in (1, 2, 3, 4, 5.12345):
+            history.record("explore", s)
+        self.assertEqual(history.samples["explore"], [3, 4, 5.123])
+        history.save()
+        self.assertEqual(LatencyHistory(path, max_samples=2).samples, {"explore": [4, 5.123]})
+
+    def test_corrupt_file_starts_empty(self) -> None:
+        path = self.dir / "lat.json"
+        path.write_text("[not a dict", encoding="utf-8")
+        self.assertEqual(LatencyHistory(path).samples, {})
+
+
+class RetryPolicyTest(unittest.TestCase):
+    def _policy(self, samples, **kwargs) -> RetryPolicy:
+        history = LatencyHistory(Path(tempfile.mkdtemp()) / "lat.json")
+        for s in samples:
+            history.record("explore", s)
+        return RetryPolicy(history, [20, 40, 80], **kwargs)
+
+    def test_defaults_until_enough_samples(self) -> None:
+        policy = self._policy([3, 4, 5, 6], min_samples=5)
+        self.assertEqual(policy.timeouts("explore"), [20, 40, 80])
+        self.assertIsNone(policy.hedge_after("explore"))
+        self.assertEqual(policy.timeout("explore", 33), 33)
+
+    def test_timeouts_follow_p99_with_margin_and_doubling(self) -> None:
+        policy = self._policy([10] * 98 + [12, 30], margin=1.5, budget_s=1000)
+        # p99 of 100 samples is the 99th value: 12 s.
+        self.assertEqual(policy.timeouts("explore"), [18.0, 36.0, 72.0])
+        self.assertEqual(policy.timeout("explore", 99), 18.0)
+
+    def test_timeouts_are_clamped(self) -> None:
+        fast = self._policy([0.5] * 10, min_timeout_s=10, max_timeout_s=240, budget_s=1000)
+        self.assertEqual(fast.timeouts("explore"), [10, 20, 40])
+        slow = self._policy([200] * 10, min_timeout_s=10, max_timeout_s=240, budget_s=1000)
+        self.assertEqual(slow.timeouts("explore"), [240, 240, 240])
+
+    def test_budget_drops_attempts_but_keeps_the_first(self) -> None:
+        policy = self._policy([40] * 10, margin=1.5, budget_s=200)
+        self.assertEqual(policy.timeouts("explore"), [60.0, 120.0])
+        tight = self._policy([100] * 10, margin=1.5, budget_s=100)
+        self.assertEqual(tight.timeouts("explore"), [150.0])
+
+    def test_hedge_after_is_p95(self) -> None:
+        policy = self._policy(list(range(1, 21)))
+        self.assertEqual(policy.hedge_after("explore"), 19)
+
+    def test_backoff_scales_with_p50_and_attempt(self) -> None:
+        with mock.patch("retry_policy.random.uniform", return_value=1.0):
+            self.assertEqual(self._policy([]).backoff("explore", 1), 1.0)
+            policy = self._policy([8] * 10)  # p50 / 4 = 2 s
+            self.assertEqual([policy.backoff("explore", a) for a in (1, 2, 3)], [2.0, 4.0, 8.0])
+            self.assertEqual(self._policy([100] * 10).backoff("explore", 1), 4.0)
+        with mock.patch("retry_policy.random.uniform", return_value=0.6):
+            self.assertEqual(self._policy([8] * 10).backoff("explore", 2), 2.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""SnapshotArchive: replay, diffs and crash recovery
+
+Run: python3 -m pytest tests (or python3 -m unittest discover tests)
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from snapshot_archive import FULL, SnapshotArchive  # noqa: E402
+
+
+def _listing(poll: int):
+    """Newest first: one new skill per poll, downloads of the rest grow."""
+    return [{"name": f"skill-{j}", "downloads": j * poll, "version": "1.0.0"} for j in range(poll + 1, -1, -1)]
+
+
+class SnapshotArchiveTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dir = Path(tempfile.mkdtemp())
+        self.archive = SnapshotArchive(self.dir / "snapshots.bin", checkpoint_every=3)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def _fill(self, polls: int = 7) -> None:
+        for i in range(polls):
+            self.assertTrue(self.archive.append(_listing(i), ts=100 + i))
+
+    def test_iter_diffs_spans_checkpoints(self) -> None:
+        self._fill()
+        self.assertEqual([r[1] for r in self.archive._records()].count(FULL), 3)
+        diffs = list(self.archive.iter_diffs())
+        self.assertEqual([d.ts for d in diffs], [101, 102, 103, 104, 105, 106])
+        for i, d in enumerate(diffs, 1):
+            self.assertEqual([r["name"] for r in d.added], [f"skill-{i + 1}"])
+            self.assertEqual(d.removed, [])
+            self.assertEqual(d.changed, {f"skill-{j}": {"downloads": j * i} for j in range(1, i + 1)})
+        self.assertEqual(list(self.archive.iter_diffs(100, 106)), diffs)
+        # (102, 104] starts after one checkpoint and crosses the next one (103).
+        self.assertEqual(list(self.archive.iter_diffs(102, 104)), diffs[2:4])
+        self.assertEqual(list(self.archive.iter_diffs(106)), [])
+
+    def test_snapshot_at_round_trips_across_checkpoints(self) -> None:
+        self._fill()
+        for i in range(7):
+            self.assertEqual(self.archive.snapshot_at(100 + i), _listing(i))
+            self.assertEqual(self.archive.snapshot_at(100.5 + i), _listing(i))
+        self.assertIsNone(self.archive.snapshot_at(99))
+        self.assertEqual(self.archive.snapshot_at(), _listing(6))
+
+    def test_unchanged_listing_is_not_appended(self) -> None:
+        self.assertTrue(self.archive.append(_listing(0), ts=100))
+        self.assertFalse(self.archive.append(_listing(0), ts=101))
+        self.assertEqual(len(list(self.archive._records())), 1)
+
+    def test_reordering_is_kept_through_order(self) -> None:
+        first = [{"name": n, "downloads": 1} for n in ("a", "b", "c", "d")]
+        resorted = [{"name": n, "downloads": 1} for n in ("c", "new", "a", "d")]
+        self.archive.append(first, ts=100)
+        self.archive.append(resorted, ts=101)
+        self.assertEqual(self.archive.snapshot_at(101), resorted)
+        (diff,) = self.archive.iter_diffs()
+        self.assertEqual(diff.added, [{"name": "new", "downloads": 1}])
+        self.assertEqual(diff.removed, ["b"])
+        self.assertEqual(diff.changed, {})
+
+    def test_removed_field_round_trips(self) -> None:
+        self.archive.append([{"name": "a", "summary": "old", "downloads": 1}], ts=100)
+        self.archive.append([{"name": "a", "downloads": 2}], ts=101)
+        self.assertEqual(self.archive.snapshot_at(101), [{"name": "a", "downloads": 2}])
+
+    def test_partial_listing_is_merged_into_the_previous_snapshot(self) -> None:
+        self.archive.append(_listing(3), ts=100)
+        head = _listing(4)[:2]  # the new skill and one known one, updated
+        self.assertTrue(self.archive.append(head, complete=False, ts=101))
+        merged = self.archive.snapshot_at()
+        self.assertEqual(merged[:2], head)
+        self.assertEqual([r["name"] for r in merged], [r["name"] for r in _listing(4)])
+        (diff,) = self.archive.iter_diffs()
+        self.assertEqual([r["name"] for r in diff.added], ["skill-5"])
+        self.assertEqual(diff.removed, [])
+
+    def test_torn_tail_is_ignored_then_cut_off(self) -> None:
+        self._fill(4)
+        size = self.archive.path.stat().st_size
+        with open(self.archive.path, "ab") as f:
+            f.write(b"\x00\x01torn record")
+        self.assertEqual(self.archive.snapshot_at(), _listing(3))
+        self.assertTrue(self.archive.append(_listing(4), ts=104))
+        self.assertEqual(self.archive.snapshot_at(), _listing(4))
+        self.assertEqual([d.ts for d in self.archive.iter_diffs()], [101, 102, 103, 104])
+        self.assertGreater(self.archive.path.stat().st_size, size)
+
+    def test_stale_checkpoint_sidecar_falls_back_to_a_full_scan(self) -> None:
+        self._fill(5)
+        for hint in ('{"checkpoint": 7}', "not json"):
+            self.archive.index_path.write_text(hint, encoding="utf-8")
+            since, _, latest = self.archive._tail()
+            self.assertEqual((since, list(latest.values())), (1, _listing(4)))
+        self.archive.index_path.unlink()
+        self.assertTrue(self.archive.append(_listing(5), ts=105))
+        self.assertEqual(list(self.archive.iter_diffs(104)), list(self.archive.iter_diffs())[-1:])
+        self.assertEqual(self.archive.snapshot_at(), _listing(5))
+
+
+if __name__ == "__main__":
+    unittest.main()